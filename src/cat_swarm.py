@@ -14,20 +14,340 @@
 
 
 import numpy as np
-from numpy.random import Generator, MT19937, shuffle
+from numpy.random import Generator, MT19937, PCG64, PCG64DXSM, Philox, SFC64, SeedSequence, shuffle
+import bisect
+import math
 import sys
+import time
 np.seterr(all='raise')
 
+# bit generators that can be selected with the 'bit_generator' argument.
+# MT19937 is the default to match earlier versions. PCG64 and Philox are faster
+BIT_GENERATORS = {'MT19937': MT19937,
+                  'PCG64': PCG64,
+                  'PCG64DXSM': PCG64DXSM,
+                  'Philox': Philox,
+                  'SFC64': SFC64}
+
+def make_seed_sequence(seed=None):
+    # seed can be None (new entropy from the OS), an int or list of ints,
+    # or a SeedSequence (such as a child from spawn_seeds)
+    if isinstance(seed, SeedSequence):
+        return seed
+    return SeedSequence(seed)
+
+def spawn_seeds(seed, n):
+    # independent, non-overlapping child seeds. Use one per swarm, island,
+    # or worker so that parallel runs can be reproduced from a single seed
+    return make_seed_sequence(seed).spawn(int(n))
+
+def make_generator(seed=None, bit_generator='MT19937'):
+    if not(bit_generator in BIT_GENERATORS):
+        raise ValueError("unrecognized bit_generator '" + str(bit_generator) + \
+                         "'. Options are: " + ", ".join(BIT_GENERATORS.keys()))
+    return Generator(BIT_GENERATORS[bit_generator](make_seed_sequence(seed)))
+
+def restore_generator(state):
+    # rebuild a Generator from an exported bit_generator.state dict
+    rng = Generator(BIT_GENERATORS[state['bit_generator']]())
+    rng.bit_generator.state = state
+    return rng
+
+def sample_dimensions(rng, n, k):
+    # k distinct integers from range(n), with k draws (Floyd's algorithm).
+    # rng.choice(n, k, replace=False) is O(n), which dominates when n >> k
+    chosen = []
+    seen = set()
+    for j in range(n - k, n):
+        t = int(rng.integers(0, j + 1))
+        if t in seen:
+            t = j
+        seen.add(t)
+        chosen.append(t)
+    return np.array(chosen, dtype=int)
+
+# OBJECTIVE AND CONSTRAINT FUNCTION PROTOCOLS
+# scalar (original) protocol:
+#   func_F(X: (D,), NO_OF_OUTS) -> (F: (NO_OF_OUTS,), noErrors: bool)
+#   constr_F(X: (D,)) -> bool
+# batch protocol. the function sets the attribute 'is_batch = True':
+#   func_F(X: (n, D), NO_OF_OUTS) -> (F: (n, NO_OF_OUTS), noErrors: (n,) bool)
+#   constr_F(X: (n, D)) -> (n,) bool
+# batch functions that also take a single (D,) point and return the scalar
+# form set 'accepts_point = True'. Otherwise single points are passed as a 
+# batch of 1.
+# the swarm accepts either, and uses the batch form to evaluate groups of 
+# points (such as a seeking memory pool) in a single call
+#
+# multi-fidelity protocol. the function sets the attribute 'multi_fidelity = True',
+# and takes a third argument:
+#   func_F(X, NO_OF_OUTS, fidelity) -> same as above
+#   fidelity: 0 = low (a cheap approximation, ex: a coarse mesh), 1 = full
+# it can set 'fidelity_costs = (low, full)', the relative cost of a call at
+# each fidelity. Either form (scalar or batch) can be multi-fidelity
+#
+# incremental protocol. for objectives that can update their value when only a
+# few inputs change (ex: separable or additive terms). the function sets the 
+# attribute 'incremental = True' and has two function attributes:
+#   func_F.context(X: (D,), NO_OF_OUTS) -> (F: (NO_OF_OUTS,), noError: bool, context)
+#       a full evaluation, and whatever is needed to update it (ex: component terms)
+#   func_F.delta(context, dims: (k,) int, values: (k,), NO_OF_OUTS) -> (F, noError)
+#       the value at X with X[dims] = values, where X is the position the context 
+#       came from (the change is values - X[dims]). the context must not be changed
+# the swarm keeps the context of each cat's position, and evaluates its seeking
+# candidates (which differ from it in CDC inputs) with delta()
+
+def is_batch_function(func):
+    return bool(getattr(func, 'is_batch', False))
+
+def as_batch_objective(func):
+    # batch version of an objective function. scalar functions are called 
+    # once per row
+    if is_batch_function(func):
+        return func
+    def batch_objective(X, NO_OF_OUTS=1, *args):
+        X = np.atleast_2d(X)
+        F = np.zeros((len(X), NO_OF_OUTS))
+        noErrors = np.zeros(len(X), dtype=bool)
+        for i in range(len(X)):
+            newFVals, noError = func(X[i], NO_OF_OUTS, *args)
+            if noError == True:
+                F[i] = np.hstack(newFVals)
+                noErrors[i] = True
+        return F, noErrors
+    batch_objective.is_batch = True
+    return batch_objective
+
+def as_point_objective(func):
+    # single point version of an objective function. batch functions are
+    # called with a batch of 1
+    if (not is_batch_function(func)) or getattr(func, 'accepts_point', False):
+        return func
+    def point_objective(X, NO_OF_OUTS=1, *args):
+        F, noErrors = func(np.reshape(X, (1, -1)), NO_OF_OUTS, *args)
+        return np.asarray(F)[0], bool(np.asarray(noErrors)[0])
+    return point_objective
+
+def is_multi_fidelity_function(func):
+    return bool(getattr(func, 'multi_fidelity', False))
+
+def is_incremental_function(func):
+    return bool(getattr(func, 'incremental', False))
+
+def as_batch_constraint(func):
+    if is_batch_function(func):
+        return func
+    def batch_constraint(X):
+        X = np.atleast_2d(X)
+        return np.array([bool(func(x)) for x in X], dtype=bool)
+    batch_constraint.is_batch = True
+    return batch_constraint
+
+def as_point_constraint(func):
+    if (not is_batch_function(func)) or getattr(func, 'accepts_point', False):
+        return func
+    def point_constraint(X):
+        return bool(np.asarray(func(np.reshape(X, (1, -1))))[0])
+    return point_constraint
+
+# CONSTRAINT VIOLATION PROTOCOL (optional)
+# instead of True/False, a violation function returns how far a point is 
+# from meeting each constraint. 0 (or less) where a constraint is met.
+#   constr_violation(X: (D,)) -> (NO_OF_CONSTRAINTS,) float
+# batch protocol, with 'is_batch = True':
+#   constr_violation(X: (n, D)) -> (n, NO_OF_CONSTRAINTS) float
+# a point meets the constraints if every violation is <= 0
+
+def as_batch_violation(func):
+    if is_batch_function(func):
+        return func
+    def batch_violation(X):
+        X = np.atleast_2d(X)
+        return np.array([np.reshape(func(x), -1) for x in X], dtype=float)
+    batch_violation.is_batch = True
+    return batch_violation
+
+def as_point_violation(func):
+    if (not is_batch_function(func)) or getattr(func, 'accepts_point', False):
+        return func
+    def point_violation(X):
+        return np.asarray(func(np.reshape(X, (1, -1))), dtype=float)[0]
+    return point_violation
+
+def constraint_from_violation(func):
+    # boolean constraint function from a violation function.
+    # used when only a violation function is given
+    point_violation = as_point_violation(func)
+    batch_violation = as_batch_violation(func)
+    def constraint(X):
+        if np.ndim(X) > 1:
+            return np.all(np.reshape(batch_violation(X), (len(X), -1)) <= 0, axis=1)
+        return bool(np.all(np.asarray(point_violation(X), dtype=float) <= 0))
+    constraint.is_batch = True
+    constraint.accepts_point = True
+    return constraint
+
+
+class swarm_config:
+    # lightweight container for the cat swarm tuning parameters (the values 
+    # that were previously passed in a one-row opt_df dataframe).
+    # the values are converted and validated once, when the config is built.
+    # 
+    # swarm_config(NO_OF_PARTICLES=8, WEIGHTS=[2], BOUNDARY=1, VLIM=1.5,
+    #              MR=0.02, SMP=5, SRD=0.45, CDC=2, SPC=True)
+    PARAMS = ('NO_OF_PARTICLES', 'WEIGHTS', 'BOUNDARY', 'VLIM', 
+              'MR', 'SMP', 'SRD', 'CDC', 'SPC')
+    __slots__ = PARAMS
+
+    def __init__(self, NO_OF_PARTICLES, WEIGHTS, BOUNDARY, VLIM, MR, SMP, SRD, CDC, SPC):
+        self.NO_OF_PARTICLES = int(NO_OF_PARTICLES)
+        self.WEIGHTS = np.array(WEIGHTS, dtype=float)
+        self.BOUNDARY = int(BOUNDARY)
+        self.VLIM = np.array(VLIM, dtype=float) # only used for setup
+        self.MR = float(MR)
+        self.SMP = int(SMP)
+        self.SRD = float(SRD)
+        self.CDC = int(CDC)
+        self.SPC = bool(SPC)
+        self.validate()
+
+    def validate(self):
+        errors = []
+        if self.NO_OF_PARTICLES < 1:
+            errors.append("NO_OF_PARTICLES must be at least 1")
+        if not(self.BOUNDARY in (1, 2, 3, 4)):
+            errors.append("BOUNDARY must be 1 (random), 2 (reflecting), 3 (absorbing), or 4 (invisible)")
+        if not(0 <= self.MR <= 1):
+            errors.append("MR must be between 0 and 1")
+        if self.SMP < 1:
+            errors.append("SMP must be at least 1")
+        if self.SRD < 0:
+            errors.append("SRD must not be negative")
+        if self.CDC < 1:
+            errors.append("CDC must be at least 1")
+        if len(errors) > 0:
+            raise ValueError("invalid cat swarm parameters: " + "; ".join(errors))
+
+    @classmethod
+    def from_params(cls, params):
+        # params can be:
+        #   a swarm_config (returned as-is)
+        #   a dict of values: {'NO_OF_PARTICLES': 8, 'WEIGHTS': [2], ...}
+        #   a dict of one-item lists: {'NO_OF_PARTICLES': [8], 'WEIGHTS': [[2]], ...}
+        #   a one-row pandas DataFrame (the original opt_df format)
+        if isinstance(params, cls):
+            return params
+
+        missing = [p for p in cls.PARAMS if not(p in params)]
+        if len(missing) > 0:
+            raise ValueError("missing cat swarm parameters: " + ", ".join(missing))
+
+        if hasattr(params, 'columns'): # dataframe. take the first row
+            values = {p: list(params[p])[0] for p in cls.PARAMS}
+        elif all(isinstance(params[p], (list, tuple)) and len(params[p]) == 1 for p in cls.PARAMS):
+            # dict of one-item lists
+            values = {p: params[p][0] for p in cls.PARAMS}
+        else:
+            values = {p: params[p] for p in cls.PARAMS}
+        return cls(**values)
+
+    def to_dict(self):
+        return {p: getattr(self, p) for p in self.PARAMS}
+
+
+class optimize_result:
+    # returned by swarm.optimize()
+    # Gb: (D,) best position. F_Gb: (NO_OF_OUTS,) its Flist. best_eval: L2 norm of F_Gb
+    # iterations: swarm.iter at the end of the run. evaluations: objective function
+    #   evaluations (positions and seeking candidates) in this call
+    # stop_reason: 'converged', 'maxit', 'max_evals', 'callback', or 'inactive' (no active cats)
+    __slots__ = ('Gb', 'F_Gb', 'best_eval', 'iterations', 'evaluations', 'generations',
+                 'converged', 'stop_reason', 'elapsed')
+
+    def __init__(self, **values):
+        for key in self.__slots__:
+            setattr(self, key, values[key])
+
+    def __repr__(self):
+        return "optimize_result(" + ", ".join(key + "=" + repr(getattr(self, key)) 
+                                              for key in self.__slots__) + ")"
+
+
 class swarm:
+    # max number of times a duplicate seeking mutation is redrawn
+    MUTATION_REDRAWS = 10
+    # seeking memory pools of problems with at least this many input variables
+    # are sparse. each candidate is kept as the dimensions it changes and
+    # their new values, and is only expanded when it is handed out
+    SPARSE_POOL_DIMENSIONS = 1000
+    # number of positions drawn per batch constraint call in random_bound
+    RESAMPLE_BLOCK = 16
+    # what to do with a position that does not meet the constraints
+    # 'resample' : draw random positions until one is valid (original behavior)
+    # 'project'  : clip to the bounds and step toward the constraints using the
+    #              violation amounts. needs constr_violation
+    # 'penalty'  : keep the position and add penalty_weight*(total violation) 
+    #              to its Flist. needs constr_violation
+    # 'bisect'   : bisect the line from the cat's last position (Mlast) to the 
+    #              invalid position, and keep the valid point closest to it
+    # 'project' and 'bisect' resample if the repair does not find a valid point
+    CONSTRAINT_HANDLING = ('resample', 'project', 'penalty', 'bisect')
+    # max steps when projecting or bisecting a position 
+    REPAIR_STEPS = 20
+    # what to do with a cat that leaves the search (BOUNDARY = 4, invisible)
+    # None     : it stays inactive (original behavior)
+    # 'elite'  : it is placed within SRD of one of the RESPAWN_ELITES best 
+    #            personal bests. resampled if that position is not valid
+    # 'random' : it is placed at a random valid position
+    RESPAWN = (None, 'elite', 'random')
+    RESPAWN_ELITES = 3
+    # largest lattice index. whole numbers up to 2**53 are exact as floats
+    LATTICE_INDEX_LIMIT = 2.0**53
+    # adaptive parameters (adaptive=True). updated at the end of each generation
+    # from how often each mode improved a personal best (F_Pb):
+    #   MR  : moved toward the share of improvements per evaluation made by tracing
+    #   SMP : +1 if seeking makes more improvements per evaluation than tracing, else -1
+    #   SRD : 1/5 success rule on seeking moves. grows if more than 1/5 of the
+    #         moves improve F_Pb, and shrinks otherwise. CDC follows the same rule
+    ADAPT_RATE = 0.2          # how far MR moves toward its target each generation
+    ADAPT_MEMORY = 0.5        # weight of older generations in the success counts
+    ADAPT_SUCCESS_TARGET = 0.2
+    ADAPT_SRD_UP = 1.22
+    ADAPT_SRD_DOWN = 0.82
+    ADAPT_SMP_MIN = 2
+    # cat states. each evaluation that is handed out has a ticket, and the 
+    # results can come back in any order. a cat has at most one stage (its 
+    # position, or its seeking memory pool) out at a time
+    CAT_EVALUATE = 0    # the cat's position needs to be evaluated
+    CAT_WAITING = 1     # the position evaluation has been handed out
+    CAT_EVALUATED = 2   # the position result is in. ready to move (or start seeking)
+    CAT_SEEKING = 3     # seeking candidates have been handed out
+    CAT_SELECT = 4      # all of the seeking candidate results are in. ready to select
+    CAT_PROMOTE = 5     # screened candidates that could be a new global best are 
+                        # being evaluated again at full fidelity
+    # fidelity of an evaluation (see the multi-fidelity protocol)
+    LOW_FIDELITY = 0
+    FULL_FIDELITY = 1
+
     # arguments should take the form: 
     # swarm([[float, float, ...]], [[float, float, ...]], [[float, ...]], float, int,
     # func, func,
-    # dataFrame,
+    # dict/swarm_config/dataFrame,
     # class obj, 
     # bool, [int, int, ...], 
-    # int) 
+    # int,
+    # int/SeedSequence, str,
+    # func, str, float,
+    # bool, float/[float, float, ...],
+    # bool,
+    # array/dict/evaluation_store, evaluation_store,
+    # bool, [float, float],
+    # bool,
+    # [[int, ...], ...],
+    # str) 
     #  
-    # opt_df contains class-specific tuning parameters
+    # opt_df contains class-specific tuning parameters. 
+    # it can be a swarm_config, a dict, or a one-row dataframe (see swarm_config.from_params)
     # NO_OF_PARTICLES: int
     # weights: [[float, float, float]]
     # boundary: int. 1 = random, 2 = reflecting, 3 = absorbing,   4 = invisible
@@ -37,13 +357,57 @@ class swarm:
     # CDC: int
     # SPC: bool
     #
+    # constr_violation: optional function that returns the amount each constraint
+    #   is violated by (see the CONSTRAINT VIOLATION PROTOCOL). If it is given,
+    #   constr_func can be None
+    # constraint_handling: str. see CONSTRAINT_HANDLING
+    # penalty_weight: float. used with constraint_handling='penalty'
+    # lattice: bool. snap-to-grid mode. every new position is snapped to the
+    #   nearest lattice point (see snap_position). positions stay float in M
+    # lattice_step: float, or a list with one float per input variable. The
+    #   distance between lattice points. Use 1 for integer variables. Defaults
+    #   to 10**-decimal_limit. Setting lattice_step turns on lattice mode
+    # adaptive: bool. adapt MR, SMP, SRD, and CDC during the run (see ADAPT_*)
+    # warm_start: optional seed population. (n, D) positions, an export_swarm()
+    #   snapshot (its personal bests are used), or an evaluation_store (its best
+    #   positions for these targets are used, and its values are reused).
+    #   the seeded cats are placed first. the rest are random.
+    #   snapshot personal bests are not evaluated again: they seed Pb, F_Pb, and
+    #   the global best, if the snapshot has the same targets and threshold
+    #   settings. plain positions have no values, so they are evaluated once.
+    #   pass evaluation_store(positions, values) to supply their values
+    # evaluation_store: optional evaluation_store. every evaluation is added to it,
+    #   and positions that are already in it are not evaluated again
+    # screening: bool. evaluate seeking candidates at low fidelity, and only the
+    #   best candidate of a pool that could be a new global best at full fidelity.
+    #   the cats' positions are always evaluated at full fidelity. needs a
+    #   multi-fidelity objective function. None: on if obj_func is multi-fidelity
+    # fidelity_costs: [low, full]. relative cost of an evaluation at each fidelity.
+    #   defaults to obj_func.fidelity_costs, or [1, 1]
+    # incremental: bool. evaluate seeking candidates with obj_func.delta(), from 
+    #   the context of the cat's position. needs an incremental objective function.
+    #   None: on if obj_func is incremental
+    # output_dependencies: optional. for each output, the input variables it depends
+    #   on (OUTPUT_DEPENDENCIES in configs_F.py). Each output is cached by the values
+    #   of its inputs, and positions whose outputs are all cached are not evaluated
+    # respawn: what happens to cats that leave the search with the invisible 
+    #   boundary. see RESPAWN
 
     def __init__(self,  lbound, ubound, targets,E_TOL, maxit,
                  obj_func, constr_func, 
                  opt_df,
                  parent=None, 
                  evaluate_threshold=False, obj_threshold=None,
-                 decimal_limit = 4): 
+                 decimal_limit = 4,
+                 seed=None, bit_generator='MT19937',
+                 constr_violation=None, constraint_handling='resample', penalty_weight=1000.0,
+                 lattice=False, lattice_step=None,
+                 adaptive=False,
+                 warm_start=None, evaluation_store=None,
+                 screening=None, fidelity_costs=None,
+                 incremental=None,
+                 output_dependencies=None,
+                 respawn=None): 
         
         # Optional parent class func call to write out values that trigger constraint issues
         self.parent = parent 
@@ -70,17 +434,55 @@ class swarm:
                 self.evaluate_threshold = evaluate_threshold #bool
                 self.obj_threshold = np.array(obj_threshold).reshape(-1, 1) #np.array
 
+        self.build_threshold_index_sets()
 
         #unpack the opt_df standardized vals
-        NO_OF_PARTICLES = int(opt_df['NO_OF_PARTICLES'][0])
-        weights = np.array(opt_df['WEIGHTS'][0])
-        boundary = int(opt_df['BOUNDARY'][0])
-        vlimit = np.array(opt_df['VLIM'][0]) # only used for setup
-        MR = float(opt_df['MR'][0])
-        SMP = int(opt_df['SMP'][0])
-        SRD = float(opt_df['SRD'][0])
-        CDC = int(opt_df['CDC'][0])
-        SPC = bool(opt_df['SPC'][0])
+        # values are converted and checked once by swarm_config
+        self.config = swarm_config.from_params(opt_df)
+        NO_OF_PARTICLES = self.config.NO_OF_PARTICLES
+        weights = self.config.WEIGHTS
+        boundary = self.config.BOUNDARY
+        vlimit = self.config.VLIM # only used for setup
+        MR = self.config.MR
+        SMP = self.config.SMP
+        SRD = self.config.SRD
+        CDC = self.config.CDC
+        SPC = self.config.SPC
+
+        # constraint handling. checked before anything is set up
+        if not(constraint_handling in self.CONSTRAINT_HANDLING):
+            raise ValueError("unrecognized constraint_handling '" + str(constraint_handling) + \
+                             "'. Options are: " + ", ".join(self.CONSTRAINT_HANDLING))
+        if (constraint_handling in ('project', 'penalty')) and (constr_violation is None):
+            raise ValueError("constraint_handling '" + constraint_handling + \
+                             "' needs a constr_violation function")
+        if constr_func is None:
+            if constr_violation is None:
+                raise ValueError("constr_func or constr_violation must be given")
+            constr_func = constraint_from_violation(constr_violation)
+        if not(respawn in self.RESPAWN):
+            raise ValueError("unrecognized respawn '" + str(respawn) + \
+                             "'. Options are: None, " + ", ".join(self.RESPAWN[1:]))
+
+        # incremental evaluation of seeking candidates
+        if incremental is None:
+            incremental = is_incremental_function(obj_func)
+        if incremental and not(is_incremental_function(obj_func) and \
+                               callable(getattr(obj_func, 'context', None)) and \
+                               callable(getattr(obj_func, 'delta', None))):
+            raise ValueError("incremental needs an objective function with context() and delta()")
+
+        # multi-fidelity screening
+        multi_fidelity = is_multi_fidelity_function(obj_func)
+        if screening is None:
+            screening = multi_fidelity
+        if screening and not multi_fidelity:
+            raise ValueError("screening needs a multi-fidelity objective function")
+        if fidelity_costs is None:
+            fidelity_costs = getattr(obj_func, 'fidelity_costs', (1.0, 1.0))
+        fidelity_costs = np.array(fidelity_costs, dtype=float).reshape(-1)
+        if (len(fidelity_costs) != 2) or np.any(fidelity_costs <= 0):
+            raise ValueError("fidelity_costs must be 2 values greater than 0")
 
 
         heightl = np.shape(lbound)[0]
@@ -91,7 +493,31 @@ class swarm:
         lbound = np.array(lbound[0])
         ubound = np.array(ubound[0])
 
-        self.rng = Generator(MT19937())
+        # per-output component cache
+        if output_dependencies is not None:
+            if len(output_dependencies) != len(targets):
+                raise ValueError("output_dependencies needs one list of inputs for each of the " + \
+                                 str(len(targets)) + " outputs")
+            output_dependencies = [np.array(deps, dtype=int).reshape(-1) for deps in output_dependencies]
+            for deps in output_dependencies:
+                if np.any(deps < 0) or np.any(deps >= len(lbound)):
+                    raise ValueError("output_dependencies must be input variable indices from 0 to " + \
+                                     str(len(lbound)-1))
+
+        # random number streams. 
+        # self.rng is used for the population (initialization, cat modes).
+        # each cat has its own stream in self.cat_rngs for seeking, tracing,
+        # and bound handling. A cat's draws do not depend on how many draws the
+        # other cats have made. Runs through step()/call_objective(), optimize(),
+        # a batch objective, or eval_service.as_objective() match the serial run.
+        # ask()/tell() runs do not, because the global best that the cats move
+        # toward changes in the order the results arrive.
+        self.seed_sequence = make_seed_sequence(seed)
+        self.seed_entropy = self.seed_sequence.entropy # pass as 'seed' to repeat an unseeded run
+        self.bit_generator = bit_generator
+        swarm_seed, cat_seed = self.seed_sequence.spawn(2)
+        self.rng = make_generator(swarm_seed, bit_generator)
+        self.cat_rngs = [make_generator(s, bit_generator) for s in cat_seed.spawn(NO_OF_PARTICLES)]
 
         if ((heightl > 1) and (widthl > 1)) \
            or ((heightu > 1) and (widthu > 1)) \
@@ -117,9 +543,15 @@ class swarm:
             self.ubound = ubound
             variation = ubound-lbound
 
+            # position lattice. positions are multiples of 1/lattice_scale.
+            # without lattice mode the lattice is only used for position keys, 
+            # and positions are rounded to number_decimals as before
+            self.lattice = bool(lattice) or (lattice_step is not None)
+            self.setup_lattice(lattice_step)
+
             #randomly initialize the positions and velocities of the cats
             # position
-            self.M = np.round(np.array(np.multiply(self.rng.random((1,np.max([heightl, widthl]))), variation)+lbound), self.number_decimals)   
+            self.M = self.snap_position(np.array(np.multiply(self.rng.random((1,np.max([heightl, widthl]))), variation)+lbound), clip=True)   
 
             # velocity
             self.V  = np.round(np.array(np.multiply(self.rng.random((1,np.max([heightl,widthl]))), vlimit)), self.number_decimals)   
@@ -127,7 +559,7 @@ class swarm:
 
             for i in range(2,int(NO_OF_PARTICLES)+1):
                 
-                M = np.round(np.array(np.multiply(self.rng.random((1,np.max([heightl, widthl]))), variation)+lbound), self.number_decimals)    
+                M = self.snap_position(np.array(np.multiply(self.rng.random((1,np.max([heightl, widthl]))), variation)+lbound), clip=True)    
 
                 V = np.round(np.array(np.multiply(self.rng.random((1,np.max([heightl,widthl]))), vlimit)), self.number_decimals)   
 
@@ -171,6 +603,8 @@ class swarm:
 
             '''
             self.M                      : An array of current particle (cat) locations.
+            self.lattice                : True if positions are snapped to lattice points (snap-to-grid mode).
+            self.lattice_scale          : Lattice points per unit in each dimension (1/lattice_step).
             self.V                      : An array of current particle (cat) velocities.
             self.cat_mode               : An array of if cats are in tracing (0) or seeking (1) mode
             self.MR                     : Mixture ratio (MR). Small value for tracing population
@@ -180,92 +614,733 @@ class swarm:
             self.SPC                    : self-position consideration. boolean.
             self.output_size            : An integer value for the output size of obj func
             self.Active                 : An array indicating the activity status of each particle. (e.g., in bounds)
+            self.active_particles       : Indices of the active particles. Kept with Active, so inactive particles are skipped.
+            self.respawn                : What happens to particles that leave the search (see RESPAWN).
+            self.respawns               : Number of times a particle was respawned.
             self.Gb                     : Global best position, initialized with a large value.
             self.F_Gb                   : Fitness value corresponding to the global best position.
+            self.F_Gb_norm              : L2 norm of F_Gb. Kept with F_Gb so it is not recomputed.
             self.Pb                     : Personal best position for each particle.
             self.F_Pb                   : Fitness value corresponding to the personal best position for each particle.
+            self.F_Pb_norm              : L2 norm of each row of F_Pb.
+            self.elite                  : (F_Pb_norm, particle) for every particle with a personal best, sorted best first.
             self.weights                : Weights for the optimization process. FLOAT
             self.targets                : Target values for the optimization process.
             self.maxit                  : Maximum number of iterations.
             self.E_TOL                  : Error tolerance.
-            self.obj_func               : Objective function to be optimized.      
-            self.constr_func            : Constraint function.  
+            self.obj_func               : Objective function to be optimized. Single point calls.
+            self.constr_func            : Constraint function. Single point calls.
+            self.obj_func_batch         : Objective function for (n, D) batches of points.
+            self.constr_func_batch      : Constraint function for (n, D) batches of points.
+            self.obj_is_batch           : True if the objective function implements the batch protocol.
+            self.multi_fidelity         : True if the objective function implements the multi-fidelity protocol.
+            self.screening              : True if seeking candidates are evaluated at low fidelity first.
+            self.fidelity_costs         : Relative cost of an evaluation at each fidelity [low, full].
+            self.fidelity_evals         : Objective function evaluations at each fidelity [low, full].
+            self.promotions             : Screened candidates that were evaluated again at full fidelity.
+            self.obj_is_incremental     : True if seeking candidates are evaluated with the objective function's delta().
+            self.incremental_evals      : Seeking candidates evaluated with the objective function's delta().
+            self.cat_context            : Incremental context of each particle's position. None if there is none.
+            self.constr_is_batch        : True if the constraint function implements the batch protocol.
+            self.constr_violation       : Optional constraint violation function. Single point calls. None if not used.
+            self.constr_violation_batch : Constraint violation function for (n, D) batches of points.
+            self.constraint_handling    : How positions that do not meet the constraints are handled.
+            self.penalty_weight         : Weight of the total violation added to Flist with 'penalty' handling.
             self.iter                   : Current iteration count.
-            self.current_particle       : Index of the current particle being evaluated.
+            self.evaluations            : Objective function evaluations, including seeking candidates.
+            self.reused                 : Evaluations whose values were known, and were not evaluated again.
+            self.evaluation_store       : Optional evaluation_store that every evaluation is added to.
+            self.known                  : Known objective function values {position_key: Fvals}.
+            self.output_dependencies    : Input variables each output depends on. None if not used.
+            self.components             : Known values of each output, by the values of its inputs [{key: F}].
+            self.component_reused       : Evaluations whose outputs were all in the component cache.
+            self.current_particle       : Index of the current particle being evaluated. Used by step() and call_objective().
+            self.generation             : Number of moves finished by every active particle.
             self.number_of_particles    : Total number of particles. 
             self.allow_update           : Flag indicating whether to allow updates.
             self.boundary               : Boundary conditions for the optimization problem.
             self.Flist                  : List to store fitness values.
             self.Fvals                  : List to store fitness values.
-            self.Mlast                  : Last location of particle
+            self.Mlast                  : Last location of each particle, saved before it moves
+            self.adaptive               : True if MR, SMP, SRD, and CDC are adapted during the run.
+            self.last_move_mode         : Mode (0 tracing, 1 seeking) of each particle's last move. -1 before the first move.
+            self.mode_evals             : Objective function calls spent by each mode [tracing, seeking]. Decays each generation.
+            self.mode_moves             : Moves made in each mode. Decays each generation.
+            self.mode_successes         : Moves in each mode that improved F_Pb. Decays each generation.
+            self.cat_state              : State of each particle (see CAT_*).
+            self.cat_cycles             : Number of moves each particle has finished. 
+            self.cat_Flist              : Flist of each particle's last position result. None if it failed.
+            self.pools                  : Seeking memory pool of each particle. None if it is not seeking.
+            self.tickets                : Evaluations that have been handed out. {ticket: (particle, candidate, fidelity)}
+            self.next_ticket            : Next ticket number.
+            self.ask_cursor             : Cat that the next ask(max_jobs) starts from, so the cats take turns.
             self.delta_t                : static time modulation. retained for comparison to original repo. and swarm export
             '''
             self.output_size = len(targets)
             self.Active = np.ones((NO_OF_PARTICLES))                        
+            self.active_particles = np.arange(NO_OF_PARTICLES)
+            self.respawn = respawn
+            self.respawns = 0
             self.Gb = sys.maxsize*np.ones((1,np.max([heightl, widthl])))   
             self.F_Gb = sys.maxsize*np.ones((1,self.output_size))                
+            self.F_Gb_norm = np.linalg.norm(self.F_Gb)
             self.Pb = sys.maxsize*np.ones(np.shape(self.M))                 
             self.F_Pb = sys.maxsize*np.ones((NO_OF_PARTICLES,self.output_size))  
+            self.rebuild_elite()
             self.weights = weights                    
             self.targets = np.array(targets).reshape(-1, 1)                       
             self.maxit = maxit                                             
             self.E_TOL = E_TOL                                              
-            self.obj_func = obj_func                                             
-            self.constr_func = constr_func                                   
+            self.obj_func = as_point_objective(obj_func)             # single point calls
+            self.constr_func = as_point_constraint(constr_func)        
+            self.obj_func_batch = as_batch_objective(obj_func)        # batch calls
+            self.constr_func_batch = as_batch_constraint(constr_func)
+            self.obj_is_batch = is_batch_function(obj_func)
+            self.multi_fidelity = multi_fidelity
+            self.screening = bool(screening)
+            self.fidelity_costs = fidelity_costs
+            self.fidelity_evals = np.zeros(2, dtype=int)
+            self.promotions = 0
+            self.obj_is_incremental = bool(incremental)
+            self.obj_func_context = getattr(obj_func, 'context', None)
+            self.obj_func_delta = getattr(obj_func, 'delta', None)
+            self.incremental_evals = 0
+            self.constr_is_batch = is_batch_function(constr_func)
+            self.constr_violation = None
+            self.constr_violation_batch = None
+            if constr_violation is not None:
+                self.constr_violation = as_point_violation(constr_violation)
+                self.constr_violation_batch = as_batch_violation(constr_violation)
+            self.constraint_handling = constraint_handling
+            self.penalty_weight = float(penalty_weight)
             self.iter = 0                                                   
+            self.evaluations = 0
             self.current_particle = 0                                       
+            self.generation = 0                                             
             self.number_of_particles = NO_OF_PARTICLES                      
             self.allow_update = 0                                           
             self.boundary = boundary                                       
             self.Flist = []                                                 
             self.Fvals = []                                                 
-            self.Mlast = 1*self.ubound        
-
-            self.createCandidateSet = True
-            self.candidateCtr = 0             
-            self.candidate_positions = []
-            self.candidate_probability = []      
-            self.fitness_values = []
-            self.doneCandidateIteration = True     
-            self.evaluateCandidate = False 
+            self.Mlast = 1*self.M        
+            self.adaptive = bool(adaptive)
+            self.SMP_max = 2*self.SMP
+            self.last_move_mode = -1*np.ones(NO_OF_PARTICLES, dtype=int)
+            self.mode_evals = np.zeros(2)
+            self.mode_moves = np.zeros(2)
+            self.mode_successes = np.zeros(2)
+
+            # evaluation tickets and per-cat state. see ask() and tell()
+            self.cat_state = self.CAT_EVALUATE*np.ones(NO_OF_PARTICLES, dtype=int)
+            self.cat_cycles = np.zeros(NO_OF_PARTICLES, dtype=int)
+            self.cat_Flist = [None]*NO_OF_PARTICLES
+            self.cat_context = [None]*NO_OF_PARTICLES
+            self.pools = [None]*NO_OF_PARTICLES
+            self.tickets = {}
+            self.next_ticket = 0
+            self.ask_cursor = 0
+
+            # known objective function values, by position key. see evaluation_store
+            self.evaluation_store = evaluation_store
+            self.known = {}
+            self.reused = 0
+            # known values of each output, by its inputs. see output_dependencies
+            self.output_dependencies = output_dependencies
+            self.components = None
+            if output_dependencies is not None:
+                self.components = [{} for deps in output_dependencies]
+            self.component_reused = 0
+            if evaluation_store is not None:
+                self.add_known(evaluation_store)
+            if warm_start is not None:
+                self.warm_start(warm_start)
                                         
             self.debug_message_printout("swarm successfully initialized")
             
     def call_objective(self, allow_update):
-        if self.Active[self.current_particle]:
-
-            if self.evaluateCandidate == False:
-                # Normal objective function call for particle
-                # call the objective function. 
-                # If there's an issue with the function execution, 'noError' returns False
-                newFVals, noError = self.obj_func(self.M[self.current_particle], self.output_size)
-                if noError == True:
-                    self.Fvals = np.array(newFVals).reshape(-1, 1)
-                    if allow_update:
-                        # EVALUATE OBJECTIVE FUNCTION - TARGET OR THRESHOLD
-                        self.Flist = self.objective_function_evaluation(self.Fvals, self.targets)# abs(self.targets - self.Fvals)
-                        self.iter = self.iter + 1
-                        self.allow_update = 1
-                    else:
-                        self.allow_update = 0
+        # serial evaluation of the current particle: its position, or the next 
+        # seeking candidate (all of the remaining candidates with a batch objective).
+        # the results are received here, and used by the next call to step()
+        particle = self.current_particle
+        if self.Active[particle]:
+            batch = (self.cat_state[particle] == self.CAT_SEEKING) and self.obj_is_batch
+            incremental = (self.cat_state[particle] == self.CAT_SEEKING) and \
+                          (self.cat_context[particle] is not None)
+            if batch or incremental: # incremental candidates are all evaluated in ask_particle
+                jobs = self.ask_particle(particle, None, allow_update)
             else:
-                # evaluating a candidate position
-                # call the objective function. 
-                # If there's an issue with the function execution, 'noError' returns False
+                jobs = self.ask_particle(particle, 1, allow_update)
+            if len(jobs) < 1:
+                return True # nothing to evaluate until step() is called (or the values were known)
 
+            # call the objective function. 
+            # If there's an issue with the function execution, 'noError' returns False
+            if batch:
                 # Seeking
                 # Step 3: calculate fitness values of all candidates
                 # with additional error checking  
-
-                newFVals, noError = self.obj_func(self.candidate_positions[self.candidateCtr], self.output_size)
-                if noError == True:
-                    self.fitness_values[self.candidateCtr] = 1.0*np.hstack(newFVals)
+                X = np.array([x for ticket, x in jobs])
+                fidelity = self.fidelity_of(jobs[0][0]) # a pool is evaluated at one fidelity
+                newFVals, noErrors = self.obj_func_batch(X, self.output_size, *self.fidelity_args(fidelity))
+                newFVals = np.reshape(np.asarray(newFVals, dtype=float), (len(jobs), self.output_size))
+                noErrors = np.reshape(np.asarray(noErrors, dtype=bool), -1)
+                self.receive_candidates(particle, [ticket for ticket, x in jobs], newFVals, noErrors)
+                noError = bool(np.all(noErrors))
+            else:
+                ticket, X = jobs[0]
+                context = None
+                if self.obj_is_incremental and (self.tickets[ticket][1] < 0): # the cat's position
+                    newFVals, noError, context = self.obj_func_context(X, self.output_size)
                 else:
-                    pass # leave as sys.maxsize
-
+                    newFVals, noError = self.obj_func(X, self.output_size, 
+                                                      *self.fidelity_args(self.fidelity_of(ticket)))
+                self.receive(ticket, newFVals, noError, allow_update, context=context)
 
             return noError# return is for error reporting purposes only
 
+    def ask(self, max_jobs=None):
+        # hand out every evaluation that can start now. Returns a list of 
+        # (ticket, X) pairs, where X is a (D,) position. 
+        # each cat hands out its position, or all of its unique seeking candidates.
+        # the results are given back with tell(), in any order
+        # with screening, fidelity_of(ticket) is the fidelity to evaluate X at.
+        # evaluations with known values (see evaluation_store) are not handed out.
+        # the cats that only needed known values move on right away
+        # max_jobs: optional limit on the evaluations handed out. the cats take
+        #   turns: the next call starts after the last cat that was given a job
+        jobs = []
+        active = self.active_particles
+        first = int(np.searchsorted(active, self.ask_cursor)) # first active cat at or after the cursor
+        last_served = None
+        for particle in np.roll(active, -first):
+            served = len(jobs)
+            while True:
+                limit = None
+                if max_jobs is not None:
+                    limit = max_jobs - len(jobs)
+                    if limit < 1:
+                        break
+                jobs.extend(self.ask_particle(particle, limit))
+                if (self.cat_state[particle] == self.CAT_PROMOTE) and \
+                   (self.pools[particle]['promote_sent'] < len(self.pools[particle]['promote'])):
+                    continue # the pool was finished with known values
+                if not(self.cat_state[particle] in (self.CAT_EVALUATED, self.CAT_SELECT)) \
+                   or self.complete():
+                    break
+                self.process(particle)
+            if len(jobs) > served:
+                last_served = particle
+            if (max_jobs is not None) and (len(jobs) >= max_jobs):
+                break
+        if (max_jobs is not None) and (len(jobs) >= max_jobs) and (last_served is not None):
+            self.ask_cursor = (int(last_served) + 1) % self.number_of_particles
+        return jobs
+
+    def ask_particle(self, particle, max_jobs=None, allow_update=True):
+        # evaluations for one particle. see ask()
+        # evaluations with known values are received here, and are not returned
+        jobs = []
+        if not self.Active[particle]:
+            return jobs
+        if self.cat_state[particle] == self.CAT_EVALUATE:
+            jobs.append((self.new_ticket(particle, -1), 1*self.M[particle]))
+            self.cat_state[particle] = self.CAT_WAITING
+        elif self.cat_state[particle] == self.CAT_SEEKING:
+            pool = self.pools[particle]
+            stop = len(pool['unique'])
+            if max_jobs is not None:
+                stop = min(stop, pool['sent'] + max_jobs)
+            fidelity = self.LOW_FIDELITY if self.screening else self.FULL_FIDELITY
+            for candidate in range(pool['sent'], stop):
+                X = self.pool_positions(pool, pool['unique'][candidate])
+                jobs.append((self.new_ticket(particle, candidate, fidelity), X))
+            pool['sent'] = stop
+            if self.cat_context[particle] is not None:
+                return self.evaluate_incremental(particle, jobs, allow_update)
+        elif self.cat_state[particle] == self.CAT_PROMOTE:
+            pool = self.pools[particle]
+            stop = len(pool['promote'])
+            if max_jobs is not None:
+                stop = min(stop, pool['promote_sent'] + max_jobs)
+            for candidate in pool['promote'][pool['promote_sent']:stop]:
+                X = self.pool_positions(pool, pool['unique'][candidate])
+                jobs.append((self.new_ticket(particle, candidate, self.FULL_FIDELITY), X))
+            pool['promote_sent'] = stop
+        if (len(self.known) > 0) or (self.components is not None):
+            jobs = self.reuse_known(jobs, allow_update)
+        return jobs
+
+    def reuse_known(self, jobs, allow_update=True):
+        # receive the jobs that have known values. returns the rest.
+        # known values are full fidelity, and are used for low fidelity jobs too
+        remaining = []
+        for ticket, X in jobs:
+            F = None
+            if len(self.known) > 0:
+                F = self.known.get(self.position_key(X))
+            if (F is None) and (self.components is not None):
+                F = self.cached_components(X)
+                if F is not None:
+                    self.component_reused = self.component_reused + 1
+            if F is None:
+                remaining.append((ticket, X))
+            else:
+                self.receive(ticket, F, True, allow_update, reused=True)
+        return remaining
+
+    def evaluate_incremental(self, particle, jobs, allow_update=True):
+        # evaluate seeking candidates with the objective function's delta(), from
+        # the context of the cat's position. the candidates are received here
+        context = self.cat_context[particle]
+        pool = self.pools[particle]
+        base = self.M[particle]
+        for ticket, X in jobs:
+            if pool['positions'] is None: # sparse. only these dimensions can change
+                dims = pool['dims'][pool['unique'][self.tickets[ticket][1]]]
+            else:
+                dims = np.flatnonzero(X != base)
+            changed = (X[dims] != base[dims])
+            dims = dims[changed]
+            F, noError = self.obj_func_delta(context, dims, X[dims], self.output_size)
+            self.receive(ticket, F, noError, allow_update, incremental=True)
+        return []
+
+    def new_ticket(self, particle, candidate, fidelity=1):
+        # candidate: index into the pool's unique candidates. -1 for the cat's position
+        ticket = self.next_ticket
+        self.next_ticket = self.next_ticket + 1
+        self.tickets[ticket] = (particle, candidate, fidelity)
+        return ticket
+
+    def fidelity_of(self, ticket):
+        # fidelity a handed out evaluation should be made at (see the multi-fidelity protocol)
+        return self.tickets[ticket][2]
+
+    def fidelity_args(self, fidelity):
+        # extra objective function arguments for an evaluation at this fidelity
+        if self.multi_fidelity:
+            return (fidelity,)
+        return ()
+
+    def evaluation_cost(self):
+        # total cost of the objective function calls, in fidelity_costs units
+        return float(np.dot(self.fidelity_evals, self.fidelity_costs))
+
+    def tell(self, ticket, F, noError=True, context=None):
+        # give back the result of an evaluation from ask(). F: (NO_OF_OUTS,).
+        # the cat moves as soon as the results it is waiting for are in.
+        # context: optional incremental context for a cat's position (see the 
+        #   incremental protocol). its seeking candidates are then evaluated with delta()
+        # returns False if the ticket is unknown, or its result was already given
+        if not(ticket in self.tickets):
+            return False
+        particle = self.receive(ticket, F, noError, context=context)
+        self.process(particle)
+        return True
+
+    def receive(self, ticket, F, noError, allow_update=True, reused=False, incremental=False, context=None):
+        # store the result for a ticket. Returns the particle the ticket belongs to.
+        # reused: the value came from an evaluation store, not the objective function
+        # incremental: the value came from the objective function's delta()
+        # context: incremental context of a cat's position
+        particle, candidate, fidelity = self.tickets.pop(ticket)
+        if reused:
+            self.reused = self.reused + 1
+            fidelity = self.FULL_FIDELITY # known values are full fidelity
+        elif incremental:
+            self.incremental_evals = self.incremental_evals + 1
+            fidelity = self.FULL_FIDELITY
+            if (noError == True) and self.remembering():
+                pool = self.pools[particle]
+                self.remember(self.pool_positions(pool, pool['unique'][candidate]), F)
+        else:
+            self.evaluations = self.evaluations + 1
+            self.fidelity_evals[fidelity] = self.fidelity_evals[fidelity] + 1
+            # only full fidelity values are stored
+            if (noError == True) and self.remembering() and (fidelity == self.FULL_FIDELITY):
+                if candidate < 0:
+                    self.remember(self.M[particle], F)
+                else:
+                    pool = self.pools[particle]
+                    self.remember(self.pool_positions(pool, pool['unique'][candidate]), F)
+        cost = self.fidelity_costs[fidelity]/self.fidelity_costs[self.FULL_FIDELITY]
+        if candidate < 0:
+            # Normal objective function call for particle
+            if not reused:
+                self.count_evaluations(self.last_move_mode[particle], cost)
+            self.cat_state[particle] = self.CAT_EVALUATED
+            self.cat_context[particle] = context if (noError == True) else None
+            if noError == True:
+                self.Fvals = np.array(F).reshape(-1, 1)
+                if allow_update:
+                    # EVALUATE OBJECTIVE FUNCTION - TARGET OR THRESHOLD
+                    self.Flist = self.objective_function_evaluation(self.Fvals, self.targets)# abs(self.targets - self.Fvals)
+                    if self.constraint_handling == 'penalty':
+                        self.Flist = self.Flist + self.penalty_weight*self.total_violation(self.M[particle])
+                    self.cat_Flist[particle] = self.Flist
+                    self.iter = self.iter + 1
+                    self.allow_update = 1
+                else: # evaluate this position again
+                    self.cat_state[particle] = self.CAT_EVALUATE
+                    self.allow_update = 0
+            else: # the cat still moves, but its result is not used
+                self.cat_Flist[particle] = None
+        else:
+            # evaluating a candidate position
+            # only unique candidates are evaluated. the fitness is copied
+            # to all duplicates of the candidate in the pool
+            if not(reused or incremental):
+                self.count_evaluations(1, cost)
+            pool = self.pools[particle]
+            promoted = (self.cat_state[particle] == self.CAT_PROMOTE)
+            if noError == True:
+                copies = (pool['inverse'] == candidate)
+                pool['fitness'][copies] = self.candidate_fitness(pool, copies, np.hstack(F))
+                if self.screening:
+                    Flist = self.candidate_Flist(pool, candidate, F)
+                    pool['norms'][candidate] = np.linalg.norm(Flist)
+                    pool['exact'][candidate] = (fidelity == self.FULL_FIDELITY)
+                    if promoted:
+                        self.check_global_candidate(Flist, self.pool_positions(pool, pool['unique'][candidate]))
+            else:
+                pass # leave as sys.maxsize
+            if promoted:
+                pool['promote_received'] = pool['promote_received'] + 1
+                if pool['promote_received'] >= len(pool['promote']):
+                    self.cat_state[particle] = self.CAT_SELECT
+            else:
+                pool['received'] = pool['received'] + 1
+                if pool['received'] >= len(pool['unique']):
+                    self.pool_complete(particle)
+        return particle
+
+    def receive_candidates(self, particle, tickets, F, noErrors):
+        # store the results for several of a particle's seeking candidates at once.
+        # F: (n, NO_OF_OUTS), noErrors: (n,)
+        jobs = [self.tickets.pop(ticket) for ticket in tickets]
+        candidates = np.array([candidate for p, candidate, f in jobs], dtype=int)
+        fidelity = jobs[0][2]
+        self.evaluations = self.evaluations + len(tickets)
+        self.fidelity_evals[fidelity] = self.fidelity_evals[fidelity] + len(tickets)
+        self.count_evaluations(1, len(tickets)*self.fidelity_costs[fidelity]/self.fidelity_costs[self.FULL_FIDELITY])
+        pool = self.pools[particle]
+        if self.remembering() and (fidelity == self.FULL_FIDELITY):
+            X = self.pool_positions(pool, pool['unique'][candidates])
+            for i in np.flatnonzero(noErrors):
+                self.remember(X[i], F[i])
+        # the row of F for every candidate in the pool. -1 if it is not in this batch
+        batch_idx = -np.ones(len(pool['unique']), dtype=int)
+        batch_idx[candidates] = np.arange(len(candidates))
+        batch_idx = batch_idx[pool['inverse']]
+        pool_idx = np.flatnonzero(batch_idx >= 0)
+        batch_idx = batch_idx[pool_idx]
+        ok = noErrors[batch_idx] # failed evaluations stay as sys.maxsize
+        pool['fitness'][pool_idx[ok]] = self.candidate_fitness(pool, pool_idx[ok], F[batch_idx[ok]])
+        if self.screening:
+            for i in np.flatnonzero(noErrors):
+                pool['norms'][candidates[i]] = np.linalg.norm(self.candidate_Flist(pool, candidates[i], F[i]))
+                pool['exact'][candidates[i]] = (fidelity == self.FULL_FIDELITY)
+        pool['received'] = pool['received'] + len(tickets)
+        if pool['received'] >= len(pool['unique']):
+            self.pool_complete(particle)
+
+    def pool_complete(self, particle):
+        # all of the seeking candidates are in. With screening, the best screened
+        # candidate is evaluated again at full fidelity if it could be a new 
+        # global best. Otherwise the cat is ready to select
+        self.cat_state[particle] = self.CAT_SELECT
+        if not self.screening:
+            return
+        pool = self.pools[particle]
+        norms = np.where(pool['exact'], np.inf, pool['norms'])
+        best = int(np.argmin(norms))
+        if norms[best] < self.F_Gb_norm:
+            pool['promote'] = [best]
+            self.promotions = self.promotions + 1
+            self.cat_state[particle] = self.CAT_PROMOTE
+
+    def candidate_fitness(self, pool, rows, F):
+        # values stored in pool['fitness'] for evaluated candidates (rows into the pool).
+        # F: the outputs, one row per candidate or a single (NO_OF_OUTS,) row for all of them.
+        # candidates are ranked by the norm of their fitness. with 'penalty' handling
+        # this is the Flist plus the penalty (like a cat's position), so the penalty
+        # always makes a candidate worse. otherwise it is the outputs
+        F = np.broadcast_to(np.asarray(F, dtype=float), (len(pool['penalty'][rows]), self.output_size))
+        if self.constraint_handling != 'penalty':
+            return 1.0*F
+        return self.objective_function_evaluation(F, self.targets) + pool['penalty'][rows].reshape(-1, 1)
+
+    def candidate_Flist(self, pool, candidate, F):
+        # Flist of a seeking candidate, the same way it is computed for a cat's position
+        Flist = self.objective_function_evaluation(np.array(F).reshape(-1, 1), self.targets)
+        if self.constraint_handling == 'penalty':
+            Flist = Flist + pool['penalty'][pool['unique'][candidate]]
+        return Flist
+
+    def remembering(self):
+        # True if evaluations are kept (evaluation store or component cache)
+        return (self.evaluation_store is not None) or (self.components is not None)
+
+    def remember(self, X, F):
+        # add a full fidelity evaluation to the evaluation store and the known 
+        # values, and to the component cache
+        F = np.array(F, dtype=float).reshape(-1)
+        if self.evaluation_store is not None:
+            self.evaluation_store.add(X, F)
+            self.known[self.position_key(X)] = F
+        if self.components is not None:
+            self.remember_components(X, F)
+
+    def add_known(self, store):
+        # index the values in an evaluation_store by position key
+        positions, values = store.arrays()
+        for i in range(len(positions)):
+            self.known[self.position_key(positions[i])] = values[i]
+            if self.components is not None:
+                self.remember_components(positions[i], values[i])
+
+    def component_key(self, X, output):
+        # exact, hashable key for the inputs an output depends on. see position_key
+        deps = self.output_dependencies[output]
+        return np.rint(np.asarray(X, dtype=float)[deps]*self.lattice_scale[deps]).astype(np.int64).tobytes()
+
+    def remember_components(self, X, F):
+        for i in range(len(self.components)):
+            self.components[i][self.component_key(X, i)] = F[i]
+
+    def cached_components(self, X):
+        # the outputs at X from the component cache. None if any of them is not cached
+        F = np.zeros(len(self.components))
+        for i in range(len(self.components)):
+            value = self.components[i].get(self.component_key(X, i))
+            if value is None:
+                return None
+            F[i] = value
+        return F
+
+    def warm_start_positions(self, source):
+        # positions to seed the swarm with, best first when the source is ranked.
+        # source: (n, D) positions, an export_swarm() snapshot (its personal bests),
+        #   or an evaluation_store (ranked by Flist with this swarm's targets)
+        # returns (positions (n, D), Flist (n, NO_OF_OUTS) or None). Flist is only
+        #   returned for snapshots scored the same way as this swarm. rows that 
+        #   move when they are snapped to this swarm's resolution are unset (sys.maxsize)
+        num_dims = len(self.lbound)
+        Flist = None
+        if hasattr(source, 'arrays'): # evaluation_store
+            positions, values = source.arrays()
+            if len(positions) < 1:
+                return np.zeros((0, num_dims)), None
+            order = np.argsort(np.linalg.norm(self.objective_function_evaluation(values, self.targets), 
+                                              axis=1), kind='stable')
+            positions = positions[order]
+        elif hasattr(source, 'keys') and ('Pb' in source): # swarm export
+            Pb = np.atleast_2d(np.array(source['Pb'][0], dtype=float))
+            F_Pb = np.atleast_2d(np.array(source['F_Pb'][0], dtype=float))
+            norms = np.array([np.linalg.norm(F) for F in F_Pb])
+            unset = np.linalg.norm(sys.maxsize*np.ones(np.shape(F_Pb)[1]))
+            order = np.argsort(norms, kind='stable')
+            order = order[norms[order] < unset]
+            positions = Pb[order]
+            if self.same_scoring(source) and (np.shape(F_Pb)[1] == self.output_size):
+                Flist = F_Pb[order]
+        else:
+            positions = np.atleast_2d(np.array(source, dtype=float))
+        if np.shape(positions)[1] != num_dims:
+            raise ValueError("warm_start positions must have " + str(num_dims) + " columns")
+
+        # drop positions that are the same at this position resolution
+        snapped = self.snap_position(positions, clip=True)
+        seen = set()
+        keep = []
+        for i in range(len(snapped)):
+            key = self.position_key(snapped[i])
+            if not(key in seen):
+                seen.add(key)
+                keep.append(i)
+        if Flist is not None:
+            # a value is only for the position it was evaluated at
+            moved = np.any(snapped != positions, axis=1)
+            Flist = np.where(moved.reshape(-1, 1), float(sys.maxsize), Flist)[keep]
+        return snapped[keep], Flist
+
+    def same_scoring(self, snapshot):
+        # True if an export_swarm() snapshot computes Flist the same way as this 
+        # swarm (targets and threshold settings). the constraint handling is not
+        # exported, and is assumed to be the same
+        try:
+            targets = np.array(snapshot['targets'][0], dtype=float).reshape(-1, 1)
+            evaluate_threshold = bool(snapshot['evaluate_threshold'][0])
+            obj_threshold = np.array(snapshot['obj_threshold'][0])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return False
+        if (np.shape(targets) != np.shape(self.targets)) or np.any(targets != self.targets):
+            return False
+        if evaluate_threshold != bool(self.evaluate_threshold):
+            return False
+        if evaluate_threshold:
+            return np.array_equal(obj_threshold, np.array(self.obj_threshold))
+        return True
+
+    def warm_start(self, source):
+        # place seeded cats first. the rest keep their random positions.
+        # seeded cats with a known Flist (snapshot personal bests) start with it
+        # as their personal best, and are not evaluated again. their first step 
+        # is a move
+        positions, Flist = self.warm_start_positions(source)
+        positions = positions[:self.number_of_particles]
+        n = len(positions)
+        self.M[:n] = positions
+        self.Mlast[:n] = positions
+        if hasattr(source, 'arrays'): # the values are known
+            self.add_known(source)
+        if Flist is not None:
+            unset = np.linalg.norm(sys.maxsize*np.ones(self.output_size))
+            for particle in range(n):
+                norm = np.linalg.norm(Flist[particle])
+                if norm >= unset:
+                    continue
+                self.Pb[particle] = positions[particle]
+                self.F_Pb[particle] = Flist[particle]
+                self.cat_Flist[particle] = Flist[particle].reshape(-1, 1)
+                self.cat_state[particle] = self.CAT_EVALUATED
+                if norm < self.F_Gb_norm: # same shapes as check_global_local
+                    self.F_Gb = np.array([self.cat_Flist[particle]])
+                    self.F_Gb_norm = norm
+                    self.Gb = np.array(positions[particle])
+            self.rebuild_elite()
+        return n
+
+    def process(self, particle):
+        # move a particle whose results are in. 
+        # Returns True if the particle finished a move
+        finished = False
+        if self.cat_state[particle] == self.CAT_EVALUATED:
+            # save global best
+            if self.cat_Flist[particle] is not None:
+                self.check_global_local(self.cat_Flist[particle], particle)
+            # split cats into tracing and seeking
+                # this combines the update_velocity and update_point in the pso_python repos
+            if self.cat_mode[particle] == 0: #tracing
+                self.Mlast[particle] = 1*self.M[particle]
+                self.tracing_mode(particle)
+                self.last_move_mode[particle] = 0
+                self.mode_moves[0] = self.mode_moves[0] + 1
+                finished = True
+            else: # seeking. create the candidate pool
+                self.seeking_mode_create_candidates(particle)
+                self.cat_state[particle] = self.CAT_SEEKING
+        elif self.cat_state[particle] == self.CAT_SELECT:
+            # all of the candidates are in
+            self.Mlast[particle] = 1*self.M[particle]
+            self.seeking_mode_best_position(particle)
+            self.last_move_mode[particle] = 1
+            self.mode_moves[1] = self.mode_moves[1] + 1
+            finished = True
+        else:
+            return False
+
+        self.handle_bounds(particle)
+        if not self.Active[particle]:
+            finished = True # out of the search. its candidates are dropped
+
+        if finished:
+            self.pools[particle] = None
+            self.cat_context[particle] = None
+            self.cat_state[particle] = self.CAT_EVALUATE
+            self.cat_cycles[particle] = self.cat_cycles[particle] + 1
+            # the generation can only end when one of the last cats finishes
+            # (or leaves the search)
+            if (self.cat_cycles[particle] == self.generation + 1) or not self.Active[particle]:
+                self.update_generation()
+        return finished
+
+    def update_generation(self):
+        # a generation ends when every active particle has finished another move
+        active = self.Active > 0
+        if not np.any(active):
+            return
+        generation = int(np.min(self.cat_cycles[active]))
+        if generation > self.generation:
+            self.generation = generation
+            if self.adaptive:
+                self.adapt_parameters()
+
+    def count_evaluations(self, mode, count):
+        # objective function calls spent by each mode. evaluations of the 
+        # initial positions (mode -1) are not counted
+        if mode >= 0:
+            self.mode_evals[mode] = self.mode_evals[mode] + count
+
+    def build_threshold_index_sets(self):
+        # precompute which outputs are evaluated as TARGET, LESS THAN OR EQUAL,
+        # and GREATER THAN OR EQUAL so objective_function_evaluation can use masks
+        # instead of checking every output
+        # 0 = TARGET, 1 = LESS THAN OR EQUAL, 2 = GREATER THAN OR EQUAL
+        self.threshold_lt_idx = np.array([], dtype=int)
+        self.threshold_gt_idx = np.array([], dtype=int)
+        if self.evaluate_threshold == False:
+            return
+
+        o_thres = np.array(self.obj_threshold).reshape(-1).astype(int) #force type as err check
+        if np.any((o_thres < 0) | (o_thres > 2)):
+            self.debug_message_printout("ERROR: unrecognized threshold value. Evaluating as TARGET")
+        # everything that is not LT or GT (including unrecognized values) is a TARGET
+        self.threshold_lt_idx = np.flatnonzero(o_thres == 1)
+        self.threshold_gt_idx = np.flatnonzero(o_thres == 2)
+
+    def setup_lattice(self, lattice_step=None):
+        # lattice_step: None (10**-number_decimals), a float, or one float per input variable
+        num_dims = len(self.lbound)
+        if lattice_step is None:
+            lattice_step = 10.0**(-self.number_decimals)
+        step = np.broadcast_to(np.asarray(lattice_step, dtype=float), (num_dims,))
+        if np.any(step <= 0):
+            raise ValueError("lattice_step must be greater than 0")
+        scale = 1.0/step
+        # keep whole number scales exact. 1/1e-4 -> 10000
+        self.lattice_scale = np.where(np.abs(scale - np.rint(scale)) < 1e-9*scale, np.rint(scale), scale)
+
+        # lattice index range inside the bounds
+        self.lattice_lb = np.ceil(self.lbound*self.lattice_scale - 1e-9)
+        self.lattice_ub = np.floor(self.ubound*self.lattice_scale + 1e-9)
+        if self.lattice:
+            if np.any(self.lattice_lb > self.lattice_ub):
+                raise ValueError("lattice_step is too large. There is no lattice point between the bounds " + \
+                                 "for input variable(s) " + str(np.flatnonzero(self.lattice_lb > self.lattice_ub)))
+            if np.any(np.maximum(np.abs(self.lattice_lb), np.abs(self.lattice_ub)) >= self.LATTICE_INDEX_LIMIT):
+                raise ValueError("lattice_step is too small. The lattice points between the bounds " + \
+                                 "are not exact as floats")
+
+    def lattice_index(self, X):
+        # nearest lattice point index (int64) for positions X (D,) or (n, D).
+        # the lattice is 10**-number_decimals without lattice mode, unless 
+        # lattice_step was given. positions far outside the bounds (tracing 
+        # past a boundary) are clipped to +-self.LATTICE_INDEX_LIMIT before the cast
+        idx = np.rint(np.asarray(X, dtype=float)*self.lattice_scale)
+        idx = np.clip(idx, -self.LATTICE_INDEX_LIMIT, self.LATTICE_INDEX_LIMIT)
+        return idx.astype(np.int64)
+
+    def snap_position(self, X, clip=False):
+        # round positions to the position resolution.
+        # lattice mode: the nearest lattice point. otherwise: number_decimals decimals.
+        # clip=True also keeps the positions inside the bounds
+        if self.lattice:
+            # float lattice index. the bounds handlers see positions outside the bounds as they are
+            idx = np.rint(np.asarray(X, dtype=float)*self.lattice_scale)
+            if clip:
+                idx = np.clip(idx, self.lattice_lb, self.lattice_ub)
+            return idx/self.lattice_scale
+        X = np.round(X, self.number_decimals)
+        if clip:
+            X = np.clip(X, self.lbound, self.ubound)
+        return X
+
+    def position_key(self, X):
+        # exact, hashable key for a position (D,). positions that snap to the
+        # same lattice point have the same key
+        return self.lattice_index(np.reshape(X, -1)).tobytes()
+
     def objective_function_evaluation(self, Fvals, targets):
         #pass in the Fvals & targets so that it's easier to track bugs
 
@@ -278,6 +1353,8 @@ class swarm:
         #  Setting the 'distance' to epsilon, the convergence value check can
         # also remain the same format. 
 
+        # Fvals can be a single evaluation with the same shape as targets (OUT_VARS, 1),
+        # or a batch of evaluations (n, OUT_VARS). The returned Flist has the same shape.
 
         # testing different values of epsilon
         epsilon = np.finfo(float).eps #smallest system constant
@@ -286,53 +1363,35 @@ class swarm:
         #epsilon = 10**-18
         #epsilon = 0  # causes issues with imag. numbers
 
-        Flist = np.zeros(len(Fvals))
-
-
-        if self.evaluate_threshold == True: #THRESHOLD
-            ctr = 0
-            for i in targets:
-                o_thres = int(self.obj_threshold[ctr]) #force type as err check
-                t = targets[ctr]
-                fv = Fvals[ctr]
-
-                if o_thres == 0: #TARGET. default
-                    # sets Flist[ctr] as abs distance of  Fvals[ctr] from target
-                    Flist[ctr] = abs(t - fv)
-
-                elif o_thres == 1: #LESS THAN OR EQUAL 
-                    # checks if the Fvals[ctr] is LESS THAN OR EQUAL to target
-                    # if yes, then distance is 0 (considered 'on target)
-                    # if no, then Flist is abs distance of  Fvals[ctr] from target
-                    if fv <= t:
-                        Flist[ctr] = epsilon
-                    else:
-                        Flist[ctr] = abs(t - fv)
-
-                elif o_thres == 2: #GREATER THAN OR EQUAL
-                    # checks if the Fvals[ctr] is GREATER THAN OR EQUAL to target
-                    # if yes, then distance is 0 (considered 'on target)
-                    # if no, then Flist is abs distance of  Fvals[ctr] from target
-                    if fv >= t:
-                        Flist[ctr] = epsilon
-                    else:
-                        Flist[ctr] = abs(t - fv)
+        Fvals = np.asarray(Fvals, dtype=float)
+        targets = np.asarray(targets, dtype=float)
+        single_eval = (np.shape(Fvals) == np.shape(targets))
 
-                else: #o_thres == 0. #TARGET. default
-                    self.parent.debug_message_printout("ERROR: unrecognized threshold value. Evaluating as TARGET")
-                    Flist[ctr] = abs(t - fv)
+        # work with rows of evaluations: (n, OUT_VARS)
+        F = Fvals.reshape(-1, targets.size)
+        t = targets.reshape(1, -1)
 
-                ctr = ctr + 1
-
-        else: #TARGET as default
-            # arrays are already the same dimensions. 
-            # no need to loop and compare to anything
-            Flist = abs(targets - Fvals)
+        # TARGET: abs distance of Fvals from target. This is also the
+        # distance for thresholds that are NOT met
+        Flist = np.abs(t - F)
 
+        if self.evaluate_threshold == True: #THRESHOLD
+            # LESS THAN OR EQUAL 
+            # if Fvals is LESS THAN OR EQUAL to target, the distance is epsilon (considered 'on target')
+            lt = self.threshold_lt_idx
+            if len(lt) > 0:
+                Flist[:, lt] = np.where(F[:, lt] <= t[:, lt], epsilon, Flist[:, lt])
+            # GREATER THAN OR EQUAL
+            # if Fvals is GREATER THAN OR EQUAL to target, the distance is epsilon (considered 'on target')
+            gt = self.threshold_gt_idx
+            if len(gt) > 0:
+                Flist[:, gt] = np.where(F[:, gt] >= t[:, gt], epsilon, Flist[:, gt])
+
+        if single_eval:
+            Flist = Flist.reshape(np.shape(targets))
         return Flist
         
 
-
     def seeking_mode_create_candidates(self, particle):
         # this is the "resting" function for the cat swarm
         # SMP : seeking memory pool. Num copies of cats made 
@@ -340,34 +1399,164 @@ class swarm:
         # CDC : counts of dimension to change. mutation.
         # SPC : self-position consideration. boolean.
         
+        # the pool is kept per cat in self.pools[particle], so several cats can
+        # have candidates out at the same time
         # Step 1: generate candidate positions
         current_position = self.M[particle]
                 
         if self.SPC == True: # current cat included in pool (added later)
-            self.candidate_positions = np.tile(current_position, (self.SMP-1, 1))
+            num_copies = self.SMP-1
         else: # current cat not included. make SMP copies
-            self.candidate_positions  = np.tile(current_position, (self.SMP, 1))
+            num_copies = self.SMP
+        candidate_positions = np.tile(current_position, (num_copies, 1))
 
         # Step 2: modify each candidate position
             # new_position = (1+(random sign)*SRD)*current_position
+        # a mutation is the set of (dimension, sign) pairs applied to the copy.
+        # mutations already in the pool are redrawn (a few times at most) so that
+        # each copy is a new point whenever the mutation space is large enough.
+        # with small D (1D, 2D problems) there are only a few distinct mutations
+        rng = self.cat_rngs[particle]
         num_dimensions = len(current_position)
-        for i in range(len(self.candidate_positions)):
-            dims_to_change = self.rng.choice(num_dimensions, self.CDC, replace=False)
-            for j in dims_to_change:
-                modification = (self.rng.choice([-1, 1])) * self.SRD
-                self.candidate_positions [i][j] += modification
+        num_changed = min(self.CDC, num_dimensions)
+        num_mutations = math.comb(num_dimensions, num_changed)*(2**num_changed)
+        # the change in each dimension. in lattice mode, at least one lattice step
+        # so that integer variables can move
+        seeking_range = np.full(num_dimensions, self.SRD)
+        if self.lattice:
+            seeking_range = np.maximum(1, np.rint(self.SRD*self.lattice_scale))/self.lattice_scale
+        if num_dimensions >= self.SPARSE_POOL_DIMENSIONS:
+            self.seeking_mode_create_sparse_candidates(particle, num_copies, num_changed,
+                                                       num_mutations, seeking_range)
+            return
+        drawn_mutations = set()
+        for i in range(num_copies):
+            for attempt in range(self.MUTATION_REDRAWS+1):
+                dims_to_change = rng.choice(num_dimensions, num_changed, replace=False)
+                signs = rng.choice([-1, 1], num_changed)
+                mutation = tuple(sorted(zip(dims_to_change.tolist(), signs.tolist())))
+                if (mutation not in drawn_mutations) or (len(drawn_mutations) >= num_mutations):
+                    break
+            drawn_mutations.add(mutation)
+            candidate_positions[i, dims_to_change] += signs*seeking_range[dims_to_change]
 
         if self.SPC== True: # add current cat into the pool
-            self.candidate_positions  = np.vstack((self.candidate_positions, current_position))
-
-
-        self.fitness_values =  np.ones((self.SMP,self.output_size))*sys.maxsize
-        self.idx = 0
+            candidate_positions  = np.vstack((candidate_positions, current_position))
+
+        # Step 2b: collapse duplicate candidates. 
+        # only the unique candidates are evaluated. the result is copied back
+        # to every duplicate before the best position is selected
+        # unique : index of the first copy of each unique candidate
+        # inverse : for each candidate, the index into unique
+        # in lattice mode the candidates are compared by lattice index (exact)
+        rows = candidate_positions
+        if self.lattice:
+            candidate_positions = self.snap_position(candidate_positions)
+            rows = self.lattice_index(candidate_positions)
+        unique_rows, first_idx, inverse = np.unique(rows, axis=0,
+                                                    return_index=True, return_inverse=True)
+        order = np.argsort(first_idx) # keep the pool order for evaluation
+        rank = np.empty(len(order), dtype=int)
+        rank[order] = np.arange(len(order))
+
+        self.pools[particle] = self.new_pool(candidate_positions, first_idx[order], 
+                                             rank[np.reshape(inverse, -1)])
 
         # Step 3: calculate fitness values of all candidates
         # with additional error checking  
         # 
-        # HAPPENS IN OBJECTIVE FUNCTION CALL     
+        # HAPPENS IN OBJECTIVE FUNCTION CALL (or tell())
+
+    def seeking_mode_create_sparse_candidates(self, particle, num_copies, num_changed, 
+                                              num_mutations, seeking_range):
+        # seeking_mode_create_candidates for problems with many input variables.
+        # the dimensions to change are drawn in O(CDC) (see sample_dimensions), 
+        # and each candidate is kept as (dims, values) on top of the cat's position.
+        # duplicates are found from the changed values, without dense copies
+        rng = self.cat_rngs[particle]
+        base = 1*self.M[particle]
+        if self.lattice:
+            base = self.snap_position(base)
+        num_dimensions = len(base)
+        num_candidates = num_copies + int(self.SPC == True)
+        dims = np.zeros((num_candidates, num_changed), dtype=int)
+        values = np.zeros((num_candidates, num_changed))
+        drawn_mutations = set()
+        for i in range(num_copies):
+            for attempt in range(self.MUTATION_REDRAWS+1):
+                dims_to_change = sample_dimensions(rng, num_dimensions, num_changed)
+                signs = 2*rng.integers(0, 2, num_changed) - 1
+                mutation = tuple(sorted(zip(dims_to_change.tolist(), signs.tolist())))
+                if (mutation not in drawn_mutations) or (len(drawn_mutations) >= num_mutations):
+                    break
+            drawn_mutations.add(mutation)
+            dims[i] = dims_to_change
+            values[i] = base[dims_to_change] + signs*seeking_range[dims_to_change]
+        if self.SPC == True: # the current cat. nothing is changed
+            dims[-1] = np.arange(num_changed)
+            values[-1] = base[:num_changed]
+        if self.lattice:
+            scale = self.lattice_scale[dims]
+            values = np.rint(values*scale)/scale
+
+        # collapse duplicate candidates. two candidates are the same position
+        # if they change the same dimensions to the same values
+        keys = {}
+        unique = []
+        inverse = np.zeros(num_candidates, dtype=int)
+        for i in range(num_candidates):
+            changed = (values[i] != base[dims[i]])
+            key = tuple(sorted(zip(dims[i][changed].tolist(), values[i][changed].tolist())))
+            if not(key in keys):
+                keys[key] = len(unique)
+                unique.append(i)
+            inverse[i] = keys[key]
+
+        self.pools[particle] = self.new_pool(None, np.array(unique, dtype=int), inverse,
+                                             base=base, dims=dims, values=values)
+
+    def new_pool(self, positions, unique, inverse, base=None, dims=None, values=None):
+        # seeking memory pool. positions: (n, D) candidates, or None for a sparse
+        # pool, where candidate i is base with base[dims[i]] = values[i]
+        # unique : index of the first copy of each unique candidate
+        # inverse : for each candidate, the index into unique
+        # sent, received: number of unique candidates handed out, and with results in
+        # norms, exact: Flist norm of each unique candidate, and if it is a full 
+        #   fidelity value (screening only)
+        # promote: unique candidates that are evaluated again at full fidelity
+        pool = {'positions': positions,
+                'unique': unique,
+                'inverse': inverse,
+                'penalty': None,
+                'fitness': np.ones((len(inverse), self.output_size))*sys.maxsize,
+                'sent': 0,
+                'received': 0,
+                'norms': np.full(len(unique), np.inf),
+                'exact': np.zeros(len(unique), dtype=bool),
+                'promote': [],
+                'promote_sent': 0,
+                'promote_received': 0}
+        if positions is None:
+            pool.update({'base': base, 'dims': dims, 'values': values})
+
+        # penalty for candidates that do not meet the constraints. 
+        # added to the Flist of each candidate when it is evaluated (see candidate_fitness)
+        pool['penalty'] = np.zeros(len(inverse))
+        if self.constraint_handling == 'penalty':
+            pool['penalty'] = self.penalty_weight*self.total_violation(
+                self.pool_positions(pool, np.arange(len(inverse))))
+        return pool
+
+    def pool_positions(self, pool, rows):
+        # dense positions of pool candidates. rows: an index (-> (D,)), or an array of indices (-> (n, D))
+        if pool['positions'] is not None:
+            return 1*pool['positions'][rows]
+        idx = np.reshape(rows, -1)
+        X = np.tile(pool['base'], (len(idx), 1))
+        X[np.arange(len(idx)).reshape(-1, 1), pool['dims'][idx]] = pool['values'][idx]
+        if np.ndim(rows) < 1:
+            return X[0]
+        return X
 
 
     def seeking_mode_best_position(self, particle):
@@ -376,32 +1565,31 @@ class swarm:
             #candidate point by equation (1), otherwise set all the selecting probability
             #of each candidate point to be 1. (2007, computational intelligence based on the behavior of cats)
 
+        pool = self.pools[particle]
         # Compute the L2 norm of each row
-        l2_norms = np.linalg.norm(self.fitness_values, axis=1)
+        l2_norms = np.linalg.norm(pool['fitness'], axis=1)
         # Check if all L2 norms are the same
         all_norms_same = np.all(l2_norms == l2_norms[0])
 
-
-        self.candidate_probability = np.ones(len(self.fitness_values))/len(self.fitness_values)
+        candidate_probability = np.ones(len(pool['fitness']))/len(pool['fitness'])
         if all_norms_same == False: #calculate probability
-            idx = 0
+            FSmin = np.min(l2_norms)
+            FSmax = np.max(l2_norms)
+            FSb =  FSmax# max bc minimization problem
             # prob = {abs(fitness_cat-fitness_max)}/{fitness_max - fitness_min}
-            for c in self.candidate_positions :
-                FS_cat = l2_norms[idx]
-                FSmin = np.min(l2_norms)
-                FSmax = np.max(l2_norms)
-                FSb =  FSmax# max bc minimization problem
-                self.candidate_probability [idx] = abs(FS_cat-FSb)/abs(FSmax-FSmin)
-                idx = idx + 1
+            candidate_probability = np.abs(l2_norms-FSb)/abs(FSmax-FSmin)
         
         # normalize the probability so it adds to 1
-        self.candidate_probability  = self.candidate_probability / np.sum(self.candidate_probability )
-        # Randomly select new position
-        candidate_idx = np.arange(0, len(self.candidate_probability ), 1)
-
-        new_position = self.rng.choice(candidate_idx, 1, p=self.candidate_probability)
-
-        self.M[particle] = self.candidate_positions[new_position]
+        candidate_probability  = candidate_probability / np.sum(candidate_probability )
+        # Randomly select new position. roulette wheel selection: the first 
+        # candidate whose cumulative probability is above a uniform draw.
+        # this is the same draw and search as rng.choice(n, 1, p=candidate_probability), 
+        # without its per-call checks
+        cdf = np.cumsum(candidate_probability)
+        cdf /= cdf[-1]
+        new_position = np.searchsorted(cdf, self.cat_rngs[particle].random(1), side='right')
+
+        self.M[particle] = self.pool_positions(pool, new_position)
             
 
     def tracing_mode(self, particle):
@@ -410,66 +1598,196 @@ class swarm:
         # new velocity
         # new_V = old_V + random(0 to 1)*weights*(position of cat with best fitness - position of this cat )
         old_V = self.V[particle]
-        new_V = np.add(old_V, self.rng.random()*np.hstack(self.weights)*np.subtract(np.hstack(self.Gb), self.M[particle]))
+        new_V = np.add(old_V, self.cat_rngs[particle].random()*np.hstack(self.weights)*np.subtract(np.reshape(self.Gb, -1), self.M[particle]))
 
         self.V[particle] = np.round(new_V, self.number_decimals) # multiply so not just a mem. address copy
         # new location
         # new_M = old_M + new_V
-        self.M[particle] = np.round(self.M[particle]+new_V)
+        self.M[particle] = self.snap_position(self.M[particle]+new_V)
 
     
     def check_bounds(self, particle):
-        update = 0
-        for i in range(0,(np.shape(self.M)[1])):
-            if (self.lbound[i] > self.M[particle,i]) \
-               or (self.ubound[i] < self.M[particle,i]):
-                update = i+1        
-        return update
+        # 1 + the last dimension that is out of bounds. 0 if the particle is in bounds
+        out = np.flatnonzero((self.lbound > self.M[particle]) | (self.ubound < self.M[particle]))
+        if len(out) > 0:
+            return int(out[-1]) + 1
+        return 0
+
+    def meets_constraints(self, X):
+        # with 'penalty' handling, positions that do not meet the constraints
+        # are kept (and penalized), so only the bounds are enforced
+        if self.constraint_handling == 'penalty':
+            return True
+        return self.constr_func(X)
+
+    def point_is_valid(self, X):
+        in_bounds = np.all((X >= self.lbound) & (X <= self.ubound))
+        return bool(in_bounds and self.meets_constraints(X))
+
+    def total_violation(self, X):
+        # sum of the constraint violations for a point (D,) or a batch of points (n, D)
+        if np.ndim(X) > 1:
+            V = np.reshape(np.asarray(self.constr_violation_batch(X), dtype=float), (len(X), -1))
+            return np.sum(np.maximum(V, 0), axis=1)
+        V = np.asarray(self.constr_violation(X), dtype=float)
+        return float(np.sum(np.maximum(V, 0)))
+
+    def project_position(self, X):
+        # step toward the constraints along the gradient of the total violation.
+        # the gradient is a forward difference with the position resolution as
+        # the step size. all D+1 points are checked in one batch call.
+        # each step would reach the constraint if it were linear, and is at 
+        # least one unit of the position resolution 
+        h = 1.0/self.lattice_scale
+        X = self.snap_position(X, clip=True)
+        for i in range(self.REPAIR_STEPS):
+            points = np.vstack([X, X + np.diag(h)])
+            v = self.total_violation(points)
+            if v[0] <= 0:
+                break
+            grad = (v[1:] - v[0])/h
+            grad_norm = np.linalg.norm(grad)
+            if grad_norm == 0: # no direction to move in
+                break
+            step = max(v[0]/grad_norm, np.min(h))
+            X = self.snap_position(X - step*grad/grad_norm, clip=True)
+        return X
+
+    def bisect_position(self, good, bad):
+        # the valid point closest to 'bad' on the line from 'good' to 'bad'.
+        # 'bad' is returned if 'good' is not a valid position
+        good = self.snap_position(good)
+        if not self.point_is_valid(good):
+            return bad
+        for i in range(self.REPAIR_STEPS):
+            mid = self.snap_position((good + bad)/2)
+            if np.array_equal(mid, good) or np.array_equal(mid, bad):
+                break
+            if self.point_is_valid(mid):
+                good = mid
+            else:
+                bad = mid
+        return good
+
+    def repair_constraints(self, particle):
+        # move a position that is out of bounds or does not meet the constraints
+        # to a valid position, with the constraint_handling method.
+        # returns False if a valid position was not found
+        if self.constraint_handling == 'bisect':
+            X = self.bisect_position(self.Mlast[particle], self.M[particle])
+        elif self.constraint_handling == 'project':
+            X = self.project_position(self.M[particle])
+        else: # penalty. only the bounds need to be met
+            X = self.snap_position(self.M[particle], clip=True)
+
+        if not self.point_is_valid(X):
+            return False
+        self.M[particle] = X
+        return True
 
     def random_bound(self, particle):
         # If particle is out of bounds, bring the particle back in bounds
         # The first condition checks if constraints are met, 
         # and the second determins if the values are to large (positive or negitive)
         # and may cause a buffer overflow with large exponents (a bug that was found experimentally)
-        update = self.check_bounds(particle) or not self.constr_func(self.M[particle])
+        update = self.check_bounds(particle) or not self.meets_constraints(self.M[particle])
         if update > 0:
+            if (self.constraint_handling != 'resample') and self.repair_constraints(particle):
+                return
+            self.resample_position(particle)
+
+    def resample_position(self, particle):
+        # draw random positions until one is in bounds and meets the constraints
+        variation = self.ubound - self.lbound
+        if self.constr_is_batch:
+            # batch constraint. draw the resample positions in blocks
+            # and check a whole block with one constraint call.
+            # the cat's stream is used the same way as with a scalar constraint 
+            # (one draw per position, and only up to the first valid one), so
+            # both forms of a constraint give the same run
+            if (self.check_bounds(particle) == 0) and self.constr_func(self.M[particle]):
+                return
+            rng = self.cat_rngs[particle]
+            found = False
+            while found == False:
+                state = rng.bit_generator.state
+                candidates = self.snap_position(
+                    rng.random((self.RESAMPLE_BLOCK, 1)) * variation + self.lbound, clip=True)
+                valid = np.all((candidates >= self.lbound) & (candidates <= self.ubound), axis=1) \
+                        & np.reshape(self.constr_func_batch(candidates), -1)
+                if np.any(valid):
+                    first = int(np.argmax(valid))
+                    if first < self.RESAMPLE_BLOCK - 1:
+                        # put back the draws after the valid position
+                        rng.bit_generator.state = state
+                        rng.random(first + 1)
+                    self.M[particle] = candidates[first]
+                    found = True
+        else:
             while (self.check_bounds(particle) > 0) or (self.constr_func(self.M[particle]) == False):
-                variation = self.ubound - self.lbound
-                self.M[particle] = np.round(
+                self.M[particle] = self.snap_position(
                     np.squeeze(
-                        self.rng.random() *
+                        self.cat_rngs[particle].random() *
                         np.multiply(np.ones((1, np.shape(self.M)[1])), variation) +
                         self.lbound
-                    ), self.number_decimals)
+                    ), clip=True)
 
 
             
     def reflecting_bound(self, particle):        
         update = self.check_bounds(particle)
-        constr = self.constr_func(self.M[particle])
+        constr = self.meets_constraints(self.M[particle])
         if (update > 0) and constr:
-            self.M[particle] = 1*self.Mlast
-            NewV = np.multiply(-1,self.V[update-1,particle])
-            self.V[update-1,particle] = NewV
+            self.M[particle] = 1*self.Mlast[particle]
+            NewV = np.multiply(-1,self.V[particle,update-1])
+            self.V[particle,update-1] = NewV
         if not constr:
             self.random_bound(particle)
 
     def absorbing_bound(self, particle):
         update = self.check_bounds(particle)
-        constr = self.constr_func(self.M[particle])
+        constr = self.meets_constraints(self.M[particle])
         if (update > 0) and constr:
-            self.M[particle] = 1*self.Mlast
+            self.M[particle] = 1*self.Mlast[particle]
             self.V[particle,update-1] = 0
         if not constr:
             self.random_bound(particle)
 
     def invisible_bound(self, particle):
-        update = self.check_bounds(particle) or not self.constr_func(self.M[particle]) 
+        update = self.check_bounds(particle) or not self.meets_constraints(self.M[particle]) 
         if update > 0:
-            self.Active[particle] = 0  
+            if self.respawn is None:
+                self.Active[particle] = 0  
+                self.active_particles = np.flatnonzero(self.Active)
+            else:
+                self.respawn_particle(particle)
         else:
             pass          
 
+    def respawn_particle(self, particle):
+        # put a cat that left the search back in (see RESPAWN). it keeps its 
+        # personal best, and starts again with no velocity
+        self.respawns = self.respawns + 1
+        rng = self.cat_rngs[particle]
+        placed = False
+        if (self.respawn == 'elite') and (len(self.elite) > 0):
+            positions, F, particles = self.get_elite(self.RESPAWN_ELITES)
+            base = positions[rng.integers(len(positions))]
+            self.M[particle] = self.snap_position(base + rng.uniform(-self.SRD, self.SRD, len(base)))
+            placed = (self.check_bounds(particle) == 0) and self.meets_constraints(self.M[particle])
+        if not placed:
+            self.resample_position(particle)
+        self.V[particle] = 0
+
+    def next_active(self, particle):
+        # the next active particle after particle, wrapping around. 
+        # (particle + 1) % N if no particle is active
+        active = self.active_particles
+        if len(active) < 1:
+            return (particle + 1) % self.number_of_particles
+        i = int(np.searchsorted(active, particle, side='right'))
+        return int(active[i % len(active)])
+
     def handle_bounds(self, particle):
         if self.boundary == 1:
             self.random_bound(particle)
@@ -484,16 +1802,97 @@ class swarm:
 
     def check_global_local(self, Flist, particle):
 
-        if np.linalg.norm(Flist) < np.linalg.norm(self.F_Gb):
+        norm = np.linalg.norm(Flist)
+        if norm < self.F_Gb_norm:
             self.F_Gb = np.array([Flist])
+            self.F_Gb_norm = norm
             self.Gb = np.array(self.M[particle])
         
-        if np.linalg.norm(Flist) < np.linalg.norm(self.F_Pb[particle]):
+        if norm < self.F_Pb_norm[particle]:
+            self.update_elite(particle, norm)
             self.F_Pb[particle] = np.squeeze(Flist)
+            self.F_Pb_norm[particle] = norm
             self.Pb[particle] = self.M[particle]
+            mode = self.last_move_mode[particle]
+            if mode >= 0:
+                self.mode_successes[mode] = self.mode_successes[mode] + 1
     
+    def check_global_candidate(self, Flist, X):
+        # global best check for a position that is not a cat's (a promoted seeking candidate)
+        norm = np.linalg.norm(Flist)
+        if norm < self.F_Gb_norm:
+            self.F_Gb = np.array([Flist])
+            self.F_Gb_norm = norm
+            self.Gb = np.array(X)
+
+    def rebuild_elite(self):
+        # norms of the personal bests, and the elite index. the norms are computed
+        # one row at a time, the same way check_global_local computes them
+        self.F_Pb_norm = np.array([np.linalg.norm(F) for F in self.F_Pb])
+        unset = np.linalg.norm(sys.maxsize*np.ones(self.output_size))
+        self.elite = sorted((float(self.F_Pb_norm[i]), i) for i in range(len(self.F_Pb)) 
+                            if self.F_Pb_norm[i] < unset)
+
+    def update_elite(self, particle, norm):
+        # move a particle in the elite index when its personal best improves
+        old = (float(self.F_Pb_norm[particle]), particle)
+        i = bisect.bisect_left(self.elite, old)
+        if (i < len(self.elite)) and (self.elite[i] == old):
+            del self.elite[i]
+        bisect.insort(self.elite, (float(norm), particle))
+
+    def get_elite(self, k=1):
+        # the k best personal bests. Returns (positions (k, D), F_Pb (k, NO_OF_OUTS), 
+        # particles (k,)), best first. fewer than k are returned if fewer 
+        # particles have been evaluated
+        particles = np.array([particle for norm, particle in self.elite[:max(int(k), 0)]], dtype=int)
+        return 1*self.Pb[particles], 1*self.F_Pb[particles], particles
+
+    def adapt_parameters(self):
+        # runs at the end of a generation. cats that are part way through seeking
+        # finish with the pool they have. new values are used from their next move.
+        # improvements per evaluation for each mode. the prior (0.5 in 1) keeps
+        # trying a mode that has not been used recently
+        rates = (self.mode_successes + 0.5)/(self.mode_evals + 1.0)
+
+        # MR: share of the population in tracing mode
+        target_MR = rates[0]/np.sum(rates)
+        self.MR = float(np.clip(self.MR + self.ADAPT_RATE*(target_MR - self.MR), 0, 1))
+
+        # SMP: evaluations per seeking move
+        if (self.mode_evals[0] > 0) and (self.mode_evals[1] > 0):
+            if rates[1] > rates[0]:
+                self.SMP = min(self.SMP + 1, self.SMP_max)
+            else:
+                self.SMP = max(self.SMP - 1, self.ADAPT_SMP_MIN)
+
+        # SRD and CDC: 1/5 success rule on seeking moves
+        if self.mode_moves[1] > 0:
+            num_dimensions = np.shape(self.M)[1]
+            if self.mode_successes[1]/self.mode_moves[1] > self.ADAPT_SUCCESS_TARGET:
+                self.SRD = self.SRD*self.ADAPT_SRD_UP
+                self.CDC = min(self.CDC + 1, num_dimensions)
+            else:
+                self.SRD = self.SRD*self.ADAPT_SRD_DOWN
+                self.CDC = max(self.CDC - 1, 1)
+            # between one unit of the position resolution and the size of the bounds
+            self.SRD = float(np.clip(self.SRD, np.min(1.0/self.lattice_scale), 
+                                     np.max(self.ubound - self.lbound)))
+
+        # move cats between modes to match MR
+        num_tracing = int(np.round(self.MR*self.number_of_particles))
+        tracing = self.rng.choice(self.number_of_particles, num_tracing, replace=False)
+        self.cat_mode[:] = 1
+        self.cat_mode[tracing] = 0
+
+        # older generations count less. counts that have decayed to almost
+        # nothing are dropped, so they do not underflow
+        self.mode_evals = np.where(self.mode_evals > 1e-9, self.mode_evals, 0.0)*self.ADAPT_MEMORY
+        self.mode_moves = np.where(self.mode_moves > 1e-9, self.mode_moves, 0.0)*self.ADAPT_MEMORY
+        self.mode_successes = np.where(self.mode_successes > 1e-9, self.mode_successes, 0.0)*self.ADAPT_MEMORY
+
     def converged(self):
-        convergence = np.linalg.norm(self.F_Gb) < self.E_TOL
+        convergence = self.F_Gb_norm < self.E_TOL
         return convergence
     
     def maxed(self):
@@ -504,6 +1903,73 @@ class swarm:
         done = self.converged() or self.maxed()
         return done
     
+    def optimize(self, max_evals=None, callback=None, callback_every=1, progress=None):
+        # run until complete(), without a driver loop. 
+        # gives the same results as calling step() and call_objective() until complete().
+        # max_evals: optional limit on objective function evaluations in this call
+        #   (positions and seeking candidates). the run can be continued by calling again
+        # callback: optional callback(swarm), called every callback_every iterations.
+        #   the run stops if it returns True
+        # progress: optional progress.progress_monitor. its callback is called 
+        #   every k evaluations or t seconds, and the run stops if it returns True.
+        #   the monitor is detached when optimize() returns
+        # returns an optimize_result
+        start = time.perf_counter()
+        start_evals = self.evaluations
+        eval_limit = None if max_evals is None else start_evals + int(max_evals)
+        callback_every = max(int(callback_every), 1)
+        next_callback = self.iter + callback_every
+        Active = self.Active
+        process = self.process
+        call_objective = self.call_objective
+        if progress is not None:
+            progress.attach(self)
+            if eval_limit is not None:
+                progress.eval_limit = eval_limit
+
+        stop_reason = None
+        try:
+            while stop_reason is None:
+                if self.F_Gb_norm < self.E_TOL:
+                    stop_reason = 'converged'
+                elif self.iter >= self.maxit:
+                    stop_reason = 'maxit'
+                elif (eval_limit is not None) and (self.evaluations >= eval_limit):
+                    stop_reason = 'max_evals'
+                else:
+                    # same as step(True)
+                    particle = self.current_particle
+                    if Active[particle]:
+                        if process(particle):
+                            self.current_particle = self.next_active(particle)
+                        call_objective(True)
+                    elif len(self.active_particles) > 0:
+                        self.current_particle = self.next_active(particle)
+                        call_objective(True)
+                    else:
+                        stop_reason = 'inactive'
+
+                    if (callback is not None) and (self.iter >= next_callback):
+                        next_callback = self.iter + callback_every
+                        if callback(self) == True:
+                            stop_reason = 'callback'
+                    if (progress is not None) and (progress.update(self) == True):
+                        stop_reason = 'callback'
+        finally:
+            # restore the objective function calls the monitor wrapped
+            if progress is not None:
+                progress.detach(self)
+
+        return optimize_result(Gb=np.reshape(self.Gb, -1).copy(),
+                               F_Gb=np.reshape(self.F_Gb, -1).copy(),
+                               best_eval=float(self.F_Gb_norm),
+                               iterations=self.iter,
+                               evaluations=self.evaluations - start_evals,
+                               generations=self.generation,
+                               converged=bool(self.converged()),
+                               stop_reason=stop_reason,
+                               elapsed=time.perf_counter() - start)
+
     def step(self, suppress_output):
         if not suppress_output:
             msg = "\n-----------------------------\n" + \
@@ -522,56 +1988,22 @@ class swarm:
                 "-----------------------------"
             self.debug_message_printout(msg)
             
-        if self.allow_update: # The first time step is called, this is false
-            if self.Active[self.current_particle]:
-                # save global best
-                self.check_global_local(self.Flist,self.current_particle)
-                # split cats into tracing and seeking
-                    # this combines the update_velocity and update_point in the pso_python repos
-                if self.cat_mode[self.current_particle] == 0: #tracing
-                    self.tracing_mode(self.current_particle)
-
-                    # remove this after debug
-                    #self.doneCandidateIteration == True
-                else: # seeking
-                    #create the candidate pool if it doesnt exist
-                    if self.createCandidateSet == True:
-                        self.candidateCtr = -1 #incremented to idx 0 in next if statement
-                        self.seeking_mode_create_candidates(self.current_particle)
-                        self.createCandidateSet = False
-                        self.evaluateCandidate = True
-                    else:
-                        pass # don't create, just iterate in next steps
-                    
-                    if self.candidateCtr < (len(self.candidate_positions)-1):
-                        # iterate through the list of the candidates.
-                        # can't call the objective function FROM this class, 
-                        # so use a bool to toggle what is being evaluated
-                        self.candidateCtr = self.candidateCtr + 1
-                        self.doneCandidateIteration = False #redundant, remove in cleanup
-
-                    else:
-                        #hit the end of the candidate list. 
-                        self.evaluateCandidate = False #for objective func toggle
-                        self.seeking_mode_best_position(self.current_particle)
-                        self.doneCandidateIteration = True
-                        # create a new list next time a particle is in seeking mode
-                        self.createCandidateSet = True
-
-
-                self.handle_bounds(self.current_particle)
-
-            if self.doneCandidateIteration == True:
-                self.current_particle = self.current_particle + 1
-            if self.current_particle == self.number_of_particles:
-                self.current_particle = 0
-
-            if self.complete() and not suppress_output:
-                msg =  "\nPoints: \n" + str(self.Gb) + "\n" + \
-                    "Iterations: \n" + str(self.iter) + "\n" + \
-                    "Flist: \n" + str(self.F_Gb) + "\n" + \
-                    "Norm Flist: \n" + str(np.linalg.norm(self.F_Gb)) + "\n"
-                self.debug_message_printout(msg)
+        # move the current particle once its results are in (the first time
+        # step is called, nothing has been evaluated yet). the next particle is 
+        # evaluated once the current one has finished its move
+        particle = self.current_particle
+        finished = True
+        if self.Active[particle]:
+            finished = self.process(particle)
+        if finished: # inactive particles are skipped
+            self.current_particle = self.next_active(particle)
+
+        if self.complete() and not suppress_output:
+            msg =  "\nPoints: \n" + str(self.Gb) + "\n" + \
+                "Iterations: \n" + str(self.iter) + "\n" + \
+                "Flist: \n" + str(self.F_Gb) + "\n" + \
+                "Norm Flist: \n" + str(np.linalg.norm(self.F_Gb)) + "\n"
+            self.debug_message_printout(msg)
 
     def export_swarm(self):
         #These do NOT export.
@@ -583,6 +2015,14 @@ class swarm:
         # self.useSurrogateModel = # this NEEDS to match every time. Should be part of the init() 
         # self.number_decimals = # this can be changed. IT might be interesting to change between runs
         # self.boundary = boundary     # int. can be chaged, but needs a default
+        # self.constr_violation, self.constraint_handling, self.penalty_weight # set at init, like boundary
+        # self.lattice, self.lattice_scale # set at init
+        # self.evaluation_store, self.known # passed at init, like obj_func
+        # self.output_dependencies, self.components # set at init. the cache is rebuilt as the run goes
+        # self.respawn # set at init, like boundary. active_particles is rebuilt from Active
+        # self.multi_fidelity, self.screening, self.fidelity_costs # set at init, like boundary
+        # self.cat_context # objects from the objective function. After an import, the
+        #   pools that are out are evaluated in full
         # These export:
 
 
@@ -599,7 +2039,16 @@ class swarm:
             'maxit': [self.maxit],                                       
             'E_TOL': [self.E_TOL],                                            
             'iter': [self.iter],
+            'evaluations': [self.evaluations],
+            'reused': [self.reused],
+            'fidelity_evals': [self.fidelity_evals],
+            'promotions': [self.promotions],
+            'incremental_evals': [self.incremental_evals],
+            'component_reused': [self.component_reused],
+            'respawns': [self.respawns],
             'current_particle': [self.current_particle],    
+            'ask_cursor': [self.ask_cursor],
+            'generation': [self.generation],
             'allow_update': [self.allow_update],
             # optimizer specfic
             'MR': [self.MR],
@@ -608,14 +2057,24 @@ class swarm:
             'CDC': [self.CDC],
             'SPC': [self.SPC],
             'cat_mode': [self.cat_mode], 
-            'create_candidate_set': [self.createCandidateSet],
-            'candidate_ctr': [self.candidateCtr],          
-            'candidate_positions': [self.candidate_positions],
-            'candidate_probabiity': [self.candidate_probability],     
-            'fitness_values': [self.fitness_values],
-            'done_candidate_iter': [self.doneCandidateIteration],    
-            'eval_candidate': [self.evaluateCandidate],
+            # per-cat state and the evaluations that are out
+            'cat_state': [self.cat_state],
+            'cat_cycles': [self.cat_cycles],
+            'cat_Flist': [list(self.cat_Flist)],
+            'pools': [[None if pool is None else dict(pool) for pool in self.pools]],
+            'tickets': [dict(self.tickets)],
+            'next_ticket': [self.next_ticket],
             'number_of_particles': [self.number_of_particles], 
+            'SMP_max': [self.SMP_max],
+            'last_move_mode': [self.last_move_mode],
+            'mode_evals': [self.mode_evals],
+            'mode_moves': [self.mode_moves],
+            'mode_successes': [self.mode_successes],
+            # random number streams
+            'seed_entropy': [self.seed_entropy],
+            'bit_generator': [self.bit_generator],
+            'rng_state': [self.rng.bit_generator.state],
+            'cat_rng_states': [[r.bit_generator.state for r in self.cat_rngs]],
             # shared format vars for AntennaCAT set
             'M': [self.M], 
             'V': [self.V],
@@ -641,6 +2100,7 @@ class swarm:
         # These are retained because the dimensionality of M, F_pb, etc. are strict
         self.evaluate_threshold = bool(swarm_export['evaluate_threshold'][0]) 
         self.obj_threshold = np.array(swarm_export['obj_threshold'][0]) 
+        self.build_threshold_index_sets()
         self.targets = np.array(swarm_export['targets'][0]).reshape(-1, 1)   
 
         self.lbound = np.array(swarm_export['lbound'][0]) 
@@ -650,7 +2110,27 @@ class swarm:
         self.maxit = int(swarm_export['maxit'][0])                                              
         self.E_TOL = float(swarm_export['E_TOL'][0])                                               
         self.iter = int(swarm_export['iter'][0])     # NEED 'RESUME' and 'START OVER' options
+        if 'evaluations' in swarm_export:
+            self.evaluations = int(swarm_export['evaluations'][0])
+        if 'reused' in swarm_export:
+            self.reused = int(swarm_export['reused'][0])
+        if 'fidelity_evals' in swarm_export:
+            self.fidelity_evals = np.array(swarm_export['fidelity_evals'][0], dtype=int)
+            self.promotions = int(swarm_export['promotions'][0])
+        else: # exported before multi-fidelity screening was added. every evaluation was full fidelity
+            self.fidelity_evals = np.array([0, self.evaluations], dtype=int)
+        if 'incremental_evals' in swarm_export:
+            self.incremental_evals = int(swarm_export['incremental_evals'][0])
+        if 'component_reused' in swarm_export:
+            self.component_reused = int(swarm_export['component_reused'][0])
+        if 'respawns' in swarm_export:
+            self.respawns = int(swarm_export['respawns'][0])
         self.current_particle = int(swarm_export['current_particle'][0])         
+        self.ask_cursor = 0
+        if 'ask_cursor' in swarm_export:
+            self.ask_cursor = int(swarm_export['ask_cursor'][0])
+        if 'generation' in swarm_export:
+            self.generation = int(swarm_export['generation'][0])
         self.allow_update = int(swarm_export['allow_update'][0])    # BOOL as INT
 
         # optimizer specfic
@@ -660,35 +2140,109 @@ class swarm:
         self.CDC = int(swarm_export['CDC'][0]) 
         self.SPC = bool(swarm_export['SPC'][0]) 
         self.cat_mode = np.array(swarm_export['cat_mode'][0]) 
-        self.createCandidateSet = bool(swarm_export['create_candidate_set'][0]) 
-        self.candidateCtr = int(swarm_export['candidate_ctr'][0])              
-        self.candidate_positions = np.array(swarm_export['candidate_positions'][0]) 
-        self.candidate_probability = (swarm_export['candidate_probabiity'][0])    
-        self.fitness_values = np.array(swarm_export['fitness_values'][0]) 
-        self.doneCandidateIteration = bool(swarm_export['done_candidate_iter'][0])      
-        self.evaluateCandidate = bool(swarm_export['eval_candidate'][0])   
         self.number_of_particles = int(swarm_export['number_of_particles'][0]) 
+        self.cat_context = [None]*self.number_of_particles
+        if 'cat_state' in swarm_export:
+            self.cat_state = np.array(swarm_export['cat_state'][0], dtype=int)
+            self.cat_cycles = np.array(swarm_export['cat_cycles'][0], dtype=int)
+            self.cat_Flist = list(swarm_export['cat_Flist'][0])
+            self.pools = [None if pool is None else dict(pool) for pool in swarm_export['pools'][0]]
+            self.tickets = {}
+            for ticket, job in dict(swarm_export['tickets'][0]).items():
+                if len(job) < 3: # exported before multi-fidelity screening was added
+                    job = (job[0], job[1], self.FULL_FIDELITY)
+                self.tickets[ticket] = tuple(job)
+            self.next_ticket = int(swarm_export['next_ticket'][0])
+        else:
+            self.import_serial_state(swarm_export)
+        for pool in self.pools:
+            if (pool is not None) and not('norms' in pool): # exported before screening was added
+                pool.update({'norms': np.full(len(pool['unique']), np.inf),
+                             'exact': np.zeros(len(pool['unique']), dtype=bool),
+                             'promote': [], 'promote_sent': 0, 'promote_received': 0})
+        if 'mode_evals' in swarm_export: # exported before adaptive parameters were added
+            self.SMP_max = int(swarm_export['SMP_max'][0])
+            self.last_move_mode = np.array(swarm_export['last_move_mode'][0], dtype=int)
+            self.mode_evals = np.array(swarm_export['mode_evals'][0], dtype=float)
+            self.mode_moves = np.array(swarm_export['mode_moves'][0], dtype=float)
+            self.mode_successes = np.array(swarm_export['mode_successes'][0], dtype=float)
+
+        # random number streams. exports from before seeding was added
+        # keep the streams that were created at initialization
+        if 'rng_state' in swarm_export:
+            self.seed_entropy = swarm_export['seed_entropy'][0]
+            self.bit_generator = str(swarm_export['bit_generator'][0])
+            self.rng = restore_generator(swarm_export['rng_state'][0])
+            self.cat_rngs = [restore_generator(state) for state in swarm_export['cat_rng_states'][0]]
 
         # shared format vars for AntennaCAT set
 
         self.M = np.array(swarm_export['M'][0]) 
         self.V = np.array(swarm_export['V'][0])
         self.Active = np.array(swarm_export['Active'][0])                    
+        self.active_particles = np.flatnonzero(self.Active)
         self.Gb = np.array(swarm_export['Gb'][0]) 
         self.F_Gb = np.array(swarm_export['F_Gb'][0])
+        self.F_Gb_norm = np.linalg.norm(self.F_Gb)
         self.Pb = np.array(swarm_export['Pb'][0])              
         self.F_Pb = np.array(swarm_export['F_Pb'][0])  
+        self.rebuild_elite()
         self.weights = np.array(swarm_export['weights'][0])                
         self.Flist = np.array(swarm_export['Flist'][0])                                                 
         self.Fvals= np.array(swarm_export['Fvals'][0])                                               
         self.Mlast= np.array(swarm_export['Mlast'][0])    
+        if np.ndim(self.Mlast) < 2: # exported when Mlast was one position for all particles
+            self.Mlast = np.tile(self.Mlast, (len(self.M), 1))
         
 
+    def import_serial_state(self, swarm_export):
+        # per-cat state from an export made before evaluation tickets were added.
+        # these exports only come from step() and call_objective(), and are 
+        # read as if they were made after call_objective() (like at the end of a run)
+        N = self.number_of_particles
+        particle = self.current_particle
+        self.cat_state = self.CAT_EVALUATE*np.ones(N, dtype=int)
+        self.cat_cycles = self.generation*np.ones(N, dtype=int)
+        self.cat_cycles[:particle] = self.generation + 1
+        self.cat_Flist = [None]*N
+        self.pools = [None]*N
+        self.tickets = {}
+        self.next_ticket = 0
+
+        if bool(swarm_export['eval_candidate'][0]):
+            positions = np.array(swarm_export['candidate_positions'][0])
+            fitness = np.array(swarm_export['fitness_values'][0])
+            if 'candidate_unique' in swarm_export: 
+                unique = np.array(swarm_export['candidate_unique'][0]) 
+                inverse = np.array(swarm_export['candidate_inverse'][0]) 
+            else: # exported before duplicate candidates were collapsed. every candidate is unique
+                unique = np.arange(len(positions))
+                inverse = np.arange(len(positions))
+            if 'candidate_penalty' in swarm_export:
+                penalty = np.array(swarm_export['candidate_penalty'][0])
+            else:
+                penalty = np.zeros(len(positions))
+            # candidates up to the counter have been handed out. the last one
+            # has a result if its fitness was filled in
+            received = int(swarm_export['candidate_ctr'][0]) + 1
+            if np.all(fitness[inverse == received-1] == sys.maxsize):
+                received = received - 1
+            received = int(np.clip(received, 0, len(unique)))
+            self.pools[particle] = {'positions': positions, 'unique': unique, 'inverse': inverse, 
+                                    'penalty': penalty, 'fitness': fitness,
+                                    'sent': received, 'received': received}
+            self.cat_state[particle] = self.CAT_SEEKING
+            if received >= len(unique):
+                self.cat_state[particle] = self.CAT_SELECT
+        elif self.allow_update:
+            self.cat_Flist[particle] = np.array(swarm_export['Flist'][0])
+            self.cat_state[particle] = self.CAT_EVALUATED
+
     def get_obj_inputs(self):
         return np.vstack(self.M[self.current_particle])
         
     def get_convergence_data(self):
-        best_eval = np.linalg.norm(self.F_Gb)
+        best_eval = self.F_Gb_norm
         iteration = 1*self.iter
         return iteration, best_eval
         
@@ -713,3 +2267,10 @@ class swarm:
         else:
             self.parent.debug_message_printout(msg)
 
+
+
+if __name__ == "__main__":
+    # python -m cat_swarm
+    # the command line runner is only imported here so that 'import cat_swarm' stays light
+    from cat_swarm_cli import main
+    sys.exit(main())
@@ -0,0 +1,290 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   cat_swarm_python
+#   './cat_swarm_python/src/cat_swarm_cli.py'
+#   Command line runner for the 'swarm' class in cat_swarm.py.
+#       Runs every problem x seed x parameter combination, optionally
+#       across a process pool, and writes a results table (csv).
+#
+#   Usage (from the src directory):
+#       python -m cat_swarm list
+#       python -m cat_swarm run --problems himmelblau lundquist_3_var \
+#           --seeds 0 1 2 --param SMP=5,10 --param MR=0.02,0.1 \
+#           --workers 4 --output results.csv
+#
+#   Author(s): Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+
+import argparse
+import ast
+import csv
+import itertools
+import os
+import sys
+import time
+
+import problem_registry
+
+# default tuning parameters. same as main_test.py
+DEFAULT_PARAMS = {'NO_OF_PARTICLES': 8,
+                  'BOUNDARY': 1,
+                  'WEIGHTS': [2],
+                  'VLIM': 1.5,
+                  'MR': 0.02,
+                  'SMP': 5,
+                  'SRD': 0.45,
+                  'CDC': 2,
+                  'SPC': True}
+DEFAULT_TOL = 10 ** -8
+DEFAULT_MAXIT = 10000
+
+
+class quiet_parent:
+    # stand-in for the parent class. batch runs do not print the swarm messages
+    def debug_message_printout(self, msg):
+        pass
+
+    def record_params(self):
+        pass
+
+    def updateStatusText(self, msg):
+        pass
+
+
+def split_values(text):
+    # split 'a,b,[c,d]' on the commas that are not inside brackets
+    values = []
+    depth = 0
+    current = ''
+    for ch in text:
+        if ch in '[(':
+            depth = depth + 1
+        elif ch in '])':
+            depth = depth - 1
+        if (ch == ',') and (depth == 0):
+            values.append(current)
+            current = ''
+        else:
+            current = current + ch
+    values.append(current)
+    return [v.strip() for v in values if v.strip() != '']
+
+
+def parse_value(text):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def parse_param_grid(param_args):
+    # ['SMP=5,10', 'MR=0.02'] -> {'SMP': [5, 10], 'MR': [0.02]}
+    grid = {}
+    for arg in param_args:
+        if not('=' in arg):
+            raise ValueError("parameters must be given as NAME=VALUE[,VALUE...], got '" + arg + "'")
+        key, values = arg.split('=', 1)
+        key = key.strip()
+        if not(key in DEFAULT_PARAMS):
+            raise ValueError("unknown parameter '" + key + "'. Options are: " + \
+                             ", ".join(DEFAULT_PARAMS.keys()))
+        grid[key] = grid.get(key, []) + [parse_value(v) for v in split_values(values)]
+    return grid
+
+
+def build_jobs(problems, seeds, grid, tol, maxit, search_dirs, constraint_handling='resample',
+               adaptive=False, screening=False, component_cache=False, respawn=None,
+               incremental=False):
+    # one job per problem x seed x parameter combination
+    keys = sorted(grid.keys())
+    combos = list(itertools.product(*[grid[k] for k in keys]))
+    jobs = []
+    for problem, seed, combo in itertools.product(problems, seeds, combos):
+        params = dict(DEFAULT_PARAMS)
+        params.update(dict(zip(keys, combo)))
+        jobs.append({'problem': problem,
+                     'seed': seed,
+                     'params': params,
+                     'tol': tol,
+                     'maxit': maxit,
+                     'constraint_handling': constraint_handling,
+                     'adaptive': adaptive,
+                     'screening': screening,
+                     'component_cache': component_cache,
+                     'respawn': respawn,
+                     'incremental': incremental,
+                     'search_dirs': search_dirs})
+    return jobs
+
+
+def run_job(job):
+    # runs in the worker process. the problem is imported here, by name
+    from cat_swarm import swarm, swarm_config
+
+    func_configs = problem_registry.load_problem(job['problem'], job['search_dirs'])
+    config = swarm_config.from_params(job['params'])
+
+    objective = func_configs.OBJECTIVE_FUNC
+    if job['screening']:
+        objective = func_configs.MULTI_FIDELITY_FUNC
+    elif job['incremental']:
+        objective = func_configs.INCREMENTAL_FUNC
+
+    start = time.perf_counter()
+    mySwarm = swarm(func_configs.LB, func_configs.UB, func_configs.TARGETS,
+                    job['tol'], job['maxit'],
+                    objective, func_configs.CONSTR_FUNC,
+                    config,
+                    parent=quiet_parent(),
+                    seed=job['seed'],
+                    constr_violation=getattr(func_configs, 'CONSTR_VIOLATION', None),
+                    constraint_handling=job['constraint_handling'],
+                    adaptive=job['adaptive'],
+                    output_dependencies=func_configs.OUTPUT_DEPENDENCIES if job['component_cache'] else None,
+                    respawn=job['respawn'])
+    result = mySwarm.optimize()
+    elapsed = time.perf_counter() - start
+
+    row = {'problem': job['problem'], 'seed': job['seed']}
+    row.update(job['params'])
+    row.update({'TOL': job['tol'],
+                'MAXIT': job['maxit'],
+                'constraint_handling': job['constraint_handling'],
+                'adaptive': job['adaptive'],
+                'iterations': result.iterations,
+                'evaluations': result.evaluations,
+                'screening': job['screening'],
+                'low_fidelity_evaluations': int(mySwarm.fidelity_evals[0]),
+                'evaluation_cost': mySwarm.evaluation_cost(),
+                'incremental': job['incremental'],
+                'incremental_evaluations': mySwarm.incremental_evals,
+                'component_cache': job['component_cache'],
+                'component_reused': mySwarm.component_reused,
+                'respawn': job['respawn'],
+                'respawns': mySwarm.respawns,
+                'best_eval': result.best_eval,
+                'converged': result.converged,
+                'solution': ' '.join(str(v) for v in result.Gb),
+                'outputs': ' '.join(str(v) for v in result.F_Gb),
+                'time_s': round(elapsed, 4)})
+    return row
+
+
+def run_jobs(jobs, workers=1):
+    if workers <= 1:
+        return [run_job(job) for job in jobs]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run_job, jobs))
+
+
+def write_results(rows, filename):
+    if len(rows) < 1:
+        return
+    fieldnames = list(rows[0].keys())
+    if filename == '-':
+        writer = csv.DictWriter(sys.stdout, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+        return
+    with open(filename, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m cat_swarm',
+                                     description='Cat swarm optimization runner')
+    parser.add_argument('--problem-path', action='append', default=[],
+                        help='additional directory to search for problem packages (repeatable). ' + \
+                             'Directories in $' + problem_registry.PROBLEM_PATH_ENV + ' are also searched')
+    commands = parser.add_subparsers(dest='command')
+
+    commands.add_parser('list', help='list the available problems')
+
+    run = commands.add_parser('run', help='run problem x seed x parameter combinations')
+    run.add_argument('--problems', nargs='+', required=True,
+                     help='problem names (see list), or dotted package names')
+    run.add_argument('--seeds', nargs='+', type=int, default=[0],
+                     help='random seeds. one run per seed')
+    run.add_argument('--param', action='append', default=[],
+                     help='tuning parameter values, NAME=VALUE[,VALUE...] (repeatable). ' + \
+                          'Every combination is run. Ex: --param SMP=5,10 --param WEIGHTS=[2],[1.5]')
+    run.add_argument('--tol', type=float, default=DEFAULT_TOL, help='convergence tolerance')
+    run.add_argument('--maxit', type=int, default=DEFAULT_MAXIT, help='maximum iterations')
+    run.add_argument('--constraint-handling', default='resample',
+                     choices=['resample', 'project', 'penalty', 'bisect'],
+                     help="how positions that do not meet the constraints are handled. " + \
+                          "'project' and 'penalty' need a CONSTR_VIOLATION function in the problem configs")
+    run.add_argument('--adaptive', action='store_true',
+                     help='adapt MR, SMP, SRD, and CDC during each run. --param values are the starting values')
+    run.add_argument('--screening', action='store_true',
+                     help='screen seeking candidates at low fidelity. needs a MULTI_FIDELITY_FUNC ' + \
+                          'in the problem configs')
+    run.add_argument('--incremental', action='store_true',
+                     help='update seeking candidates from their cat\'s evaluation. needs an ' + \
+                          'INCREMENTAL_FUNC in the problem configs')
+    run.add_argument('--component-cache', action='store_true',
+                     help='cache each output by the inputs it depends on. needs OUTPUT_DEPENDENCIES ' + \
+                          'in the problem configs')
+    run.add_argument('--respawn', default=None, choices=['elite', 'random'],
+                     help='put cats that leave the search back in, instead of dropping them. ' + \
+                          'Only used with the invisible boundary (BOUNDARY=4)')
+    run.add_argument('--workers', type=int, default=1,
+                     help='number of worker processes. 0 uses one per CPU')
+    run.add_argument('--output', default='cat_swarm_results.csv',
+                     help="results table (csv). '-' writes to stdout")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        for name in problem_registry.discover_problems(args.problem_path):
+            print(name)
+        return 0
+
+    if args.command != 'run':
+        parser.print_help()
+        return 1
+
+    try:
+        grid = parse_param_grid(args.param)
+        if args.screening and args.incremental:
+            raise ValueError("--screening and --incremental use different objective functions. Use one")
+        for problem in args.problems: # fail before starting workers if a name is wrong
+            func_configs = problem_registry.load_problem(problem, args.problem_path)
+            if (args.constraint_handling in ('project', 'penalty')) \
+               and (getattr(func_configs, 'CONSTR_VIOLATION', None) is None):
+                raise ValueError("problem '" + problem + "' has no CONSTR_VIOLATION function for " + \
+                                 "--constraint-handling " + args.constraint_handling)
+            if args.screening and (getattr(func_configs, 'MULTI_FIDELITY_FUNC', None) is None):
+                raise ValueError("problem '" + problem + "' has no MULTI_FIDELITY_FUNC for --screening")
+            if args.incremental and (getattr(func_configs, 'INCREMENTAL_FUNC', None) is None):
+                raise ValueError("problem '" + problem + "' has no INCREMENTAL_FUNC for --incremental")
+            if args.component_cache and (getattr(func_configs, 'OUTPUT_DEPENDENCIES', None) is None):
+                raise ValueError("problem '" + problem + "' has no OUTPUT_DEPENDENCIES for --component-cache")
+    except ValueError as e:
+        parser.error(str(e))
+
+    workers = args.workers
+    if workers == 0:
+        workers = os.cpu_count() or 1
+
+    jobs = build_jobs(args.problems, args.seeds, grid, args.tol, args.maxit, args.problem_path,
+                      args.constraint_handling, args.adaptive, args.screening, args.component_cache,
+                      args.respawn, args.incremental)
+    start = time.perf_counter()
+    rows = run_jobs(jobs, workers)
+    write_results(rows, args.output)
+    if args.output != '-':
+        print(str(len(rows)) + " runs in " + str(round(time.perf_counter() - start, 2)) + \
+              " s. Results written to " + args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,577 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   cat_swarm_python
+#   './cat_swarm_python/src/eval_service.py'
+#   Objective function evaluation service for the 'swarm' class.
+#       The swarm process is the coordinator. It listens on a local TCP
+#       port (or a Unix socket) and worker processes connect to it, from
+#       this host or others (see eval_worker.py). Positions are sent to
+#       the workers as (ticket, position) jobs, and results come back by
+#       ticket. Worker connections are kept open for many jobs, and jobs
+#       held by a worker that disconnects or dies are sent to another.
+#
+#       The service can be used directly as the objective function of
+#       the swarm (see as_objective), which then evaluates each seeking
+#       memory pool in parallel across the workers. run_swarm drives the
+#       swarm with ask() and tell(), so every cat has its evaluations out
+#       at the same time and results are used in the order they arrive.
+#
+#       Optional per-evaluation timeouts fail a job (noError = False) so
+#       one hung simulation does not stall a generation, and speculative
+#       copies of the slowest jobs can be sent to idle workers. The first
+#       result for a ticket is kept. Job latencies are kept in a histogram
+#       (see latency_histogram and latency_stats) for tuning the timeout.
+#       Timeouts and latencies are measured from when a worker starts a job,
+#       so time queued behind a prefetched job does not count.
+#
+#       Jobs can carry a fidelity for multi-fidelity objective functions
+#       (see the multi-fidelity protocol in cat_swarm.py). Workers then use
+#       the problem's MULTI_FIDELITY_FUNC.
+#
+#   Messages are newline-delimited JSON:
+#       worker      -> coordinator : {"type": "hello", "name": str, "token": str}
+#       coordinator -> worker      : {"type": "job", "ticket": int, "X": [float, ...], "NO_OF_OUTS": int,
+#                                     "fidelity": int (multi-fidelity jobs only)}
+#       worker      -> coordinator : {"type": "started", "ticket": int}
+#       worker      -> coordinator : {"type": "result", "ticket": int, "F": [float, ...], "ok": bool}
+#       coordinator -> worker      : {"type": "shutdown"}
+#
+#   There is no encryption. The optional token only keeps stray
+#       connections out, so only use this on trusted networks.
+#
+#   Author(s): Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+
+import collections
+import json
+import os
+import selectors
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+
+def parse_address(text):
+    # 'host:port' -> (host, port) for TCP. anything else is a Unix socket path
+    if isinstance(text, (tuple, list)):
+        return (str(text[0]), int(text[1]))
+    host, sep, port = str(text).rpartition(':')
+    if sep and port.isdigit() and not('/' in text):
+        return (host, int(port))
+    return str(text)
+
+
+def format_address(address):
+    if isinstance(address, tuple):
+        return str(address[0]) + ':' + str(address[1])
+    return str(address)
+
+
+def send_message(sock, message):
+    sock.sendall((json.dumps(message) + '\n').encode('utf-8'))
+
+
+class worker_connection:
+    # coordinator side of one worker connection
+    def __init__(self, sock):
+        self.sock = sock
+        self.buffer = b''
+        self.name = None      # set by the worker's hello message
+        self.in_flight = set()
+
+
+class eval_service:
+    # latency histogram bin edges (seconds). 10 bins per decade, 0.1 ms to 10000 s
+    LATENCY_EDGES = np.logspace(-4, 4, 81)
+    # results needed before speculative copies are launched
+    SPECULATE_MIN_SAMPLES = 10
+
+    # eval_service(address=('127.0.0.1', 0))
+    # address: (host, port) or 'host:port' for TCP, or a path for a Unix socket.
+    #   port 0 picks a free port. Use ('0.0.0.0', port) to accept workers from
+    #   other hosts. The bound address is in self.address
+    # token: optional str. workers must send the same token
+    # max_retries: times a job is re-sent after the worker holding it is lost.
+    #   after that the job fails (noError = False)
+    # prefetch: jobs sent to each worker at a time, so workers are not idle
+    #   while the next job is in transit
+    # timeout: optional seconds. a job without a result this long after a worker
+    #   started it fails (noError = False). Late results are ignored. The jobs
+    #   still queued at that worker are sent to other workers
+    # speculative: bool. when a worker has room and no jobs are waiting, send a
+    #   copy of the oldest job that has run for more than speculate_factor times
+    #   the median latency to it
+    # max_copies: copies of one job that can run at the same time
+    #
+    # latency is measured from when a worker reports that it started a job until
+    # its result. time queued at the worker behind prefetched jobs is not included
+    def __init__(self, address=('127.0.0.1', 0), token=None, max_retries=3, prefetch=2,
+                 timeout=None, speculative=False, speculate_factor=3.0, max_copies=2):
+        address = parse_address(address)
+        self.token = token
+        self.max_retries = int(max_retries)
+        self.prefetch = max(int(prefetch), 1)
+        self.timeout = None if timeout is None else float(timeout)
+        self.speculative = bool(speculative)
+        self.speculate_factor = float(speculate_factor)
+        self.max_copies = max(int(max_copies), 1)
+
+        if isinstance(address, tuple):
+            self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        else:
+            if os.path.exists(address):
+                os.remove(address)
+            self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(address)
+        self.listener.listen()
+        self.address = self.listener.getsockname()
+
+        # shared with the service thread. protected by self.lock
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.next_ticket = 0
+        self.jobs = {}                      # ticket -> {'X', 'NO_OF_OUTS', 'retries', 'sent', 'started', 'copies', 'first'}
+        self.pending = collections.deque()  # tickets waiting for a worker
+        self.results = {}                   # ticket -> (F, ok)
+        self.workers = {}                   # socket -> worker_connection
+        self.workers_lost = 0
+        self.running = True
+
+        # latency statistics
+        self.latency_counts = np.zeros(len(self.LATENCY_EDGES) + 1, dtype=np.int64)
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.timeouts = 0
+        self.speculative_launches = 0
+        self.speculative_wins = 0     # results that came from a copy, not the first worker
+
+        # the service thread waits on the sockets. writing to wake_w
+        # wakes it up when new jobs are submitted
+        self.wake_r, self.wake_w = socket.socketpair()
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        self.selector.register(self.wake_r, selectors.EVENT_READ)
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    # ---- swarm side ----
+
+    def submit(self, X, NO_OF_OUTS=1, fidelity=None):
+        # queue one position. returns the ticket for the result.
+        # fidelity: None for single fidelity objective functions
+        with self.lock:
+            ticket = self.next_ticket
+            self.next_ticket = self.next_ticket + 1
+            self.jobs[ticket] = {'X': [float(x) for x in np.reshape(X, -1)],
+                                 'NO_OF_OUTS': int(NO_OF_OUTS),
+                                 'fidelity': None if fidelity is None else int(fidelity),
+                                 'retries': 0,
+                                 'sent': None,    # time first sent to a worker
+                                 'started': None, # time a worker first started it
+                                 'copies': 0,     # copies running on workers
+                                 'first': None}   # worker the job was first sent to
+            self.pending.append(ticket)
+        self.wake()
+        return ticket
+
+    def result(self, ticket, timeout=None):
+        # wait for a result. returns (F, ok). F is None if ok is False.
+        # raises TimeoutError if the result is not in after timeout seconds
+        with self.lock:
+            if not self.changed.wait_for(lambda: ticket in self.results, timeout):
+                raise TimeoutError("no result for ticket " + str(ticket) + " after " + str(timeout) + " s")
+            return self.results.pop(ticket)
+
+    def completed(self, tickets, timeout=None):
+        # wait until at least one of the tickets has a result. returns a list
+        # of (ticket, F, ok) for every one of them that is in, in any order.
+        # the list is empty if nothing came in within timeout seconds
+        tickets = list(tickets)
+        with self.lock:
+            self.changed.wait_for(lambda: any(t in self.results for t in tickets), timeout)
+            done = [t for t in tickets if t in self.results]
+            return [(t,) + self.results.pop(t) for t in done]
+
+    def evaluate(self, X, NO_OF_OUTS=1, fidelity=None):
+        # batch protocol. X (n, D) -> (F (n, NO_OF_OUTS), noErrors (n,)).
+        # a single point X (D,) -> (F (NO_OF_OUTS,), noError)
+        single = (np.ndim(X) < 2)
+        X = np.atleast_2d(X)
+        tickets = [self.submit(x, NO_OF_OUTS, fidelity) for x in X]
+        F = np.zeros((len(X), NO_OF_OUTS))
+        noErrors = np.zeros(len(X), dtype=bool)
+        for i, ticket in enumerate(tickets):
+            values, ok = self.result(ticket)
+            if ok:
+                F[i] = values
+                noErrors[i] = True
+        if single:
+            return F[0], bool(noErrors[0])
+        return F, noErrors
+
+    def as_objective(self, multi_fidelity=False, fidelity_costs=None):
+        # objective function for the swarm that evaluates on the workers.
+        # multi_fidelity: the workers' problem has a MULTI_FIDELITY_FUNC. 
+        #   fidelity_costs: its relative costs [low, full]
+        if multi_fidelity:
+            def objective(X, NO_OF_OUTS=1, fidelity=1):
+                return self.evaluate(X, NO_OF_OUTS, fidelity)
+            objective.multi_fidelity = True
+            if fidelity_costs is not None:
+                objective.fidelity_costs = tuple(fidelity_costs)
+        else:
+            def objective(X, NO_OF_OUTS=1):
+                return self.evaluate(X, NO_OF_OUTS)
+        objective.is_batch = True
+        objective.accepts_point = True
+        return objective
+
+    def num_workers(self):
+        with self.lock:
+            return len([w for w in self.workers.values() if w.name is not None])
+
+    def latency_histogram(self):
+        # returns (counts, edges). counts[0] is below edges[0], counts[i] is
+        # between edges[i-1] and edges[i], and counts[-1] is above edges[-1]
+        with self.lock:
+            return self.latency_counts.copy(), self.LATENCY_EDGES.copy()
+
+    def latency_percentile(self, q):
+        # approximate latency percentile (0-100) in seconds, from the histogram.
+        # interpolated within the bin it falls in, and never above the largest
+        # latency. None if there are no results yet
+        with self.lock:
+            return self.percentile_from_counts(q)
+
+    def percentile_from_counts(self, q):
+        total = np.sum(self.latency_counts)
+        if total == 0:
+            return None
+        cumulative = np.cumsum(self.latency_counts)
+        target = q/100.0*total
+        idx = min(int(np.searchsorted(cumulative, target)), len(cumulative) - 1)
+        # bin idx is between edges[idx-1] and edges[idx]. the first bin starts
+        # at 0, and the last one ends at the largest latency
+        low = self.LATENCY_EDGES[idx - 1] if idx > 0 else 0.0
+        high = self.LATENCY_EDGES[idx] if idx < len(self.LATENCY_EDGES) else self.latency_max
+        below = cumulative[idx] - self.latency_counts[idx]
+        fraction = min(max((target - below)/self.latency_counts[idx], 0.0), 1.0)
+        return float(min(low + fraction*(high - low), self.latency_max))
+
+    def latency_stats(self):
+        # summary for tuning the timeout. percentiles are approximate (see latency_percentile)
+        with self.lock:
+            count = int(np.sum(self.latency_counts))
+            return {'count': count,
+                    'mean': self.latency_total/count if count > 0 else None,
+                    'p50': self.percentile_from_counts(50),
+                    'p90': self.percentile_from_counts(90),
+                    'p99': self.percentile_from_counts(99),
+                    'max': self.latency_max if count > 0 else None,
+                    'timeouts': self.timeouts,
+                    'speculative_launches': self.speculative_launches,
+                    'speculative_wins': self.speculative_wins,
+                    'workers_lost': self.workers_lost}
+
+    def wait_for_workers(self, count=1, timeout=None):
+        # wait until at least count workers are connected. returns True if they are
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.num_workers() < count:
+            if (deadline is not None) and (time.monotonic() > deadline):
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self):
+        # tell the workers to stop, and shut down the service
+        with self.lock:
+            self.running = False
+            for conn in list(self.workers.values()):
+                try:
+                    send_message(conn.sock, {'type': 'shutdown'})
+                except OSError:
+                    pass
+        self.wake()
+        self.thread.join(timeout=5.0)
+        for conn in list(self.workers.values()):
+            conn.sock.close()
+        self.selector.close()
+        self.listener.close()
+        self.wake_r.close()
+        self.wake_w.close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.remove(self.address)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # ---- service thread ----
+
+    def wake(self):
+        try:
+            self.wake_w.send(b'x')
+        except OSError:
+            pass
+
+    def serve(self):
+        while self.running:
+            # check timeouts and stragglers often while jobs are out
+            wait = 0.5
+            if ((self.timeout is not None) or self.speculative) and (len(self.jobs) > 0):
+                wait = 0.01
+            for key, mask in self.selector.select(timeout=wait):
+                if key.fileobj is self.listener:
+                    sock, _ = self.listener.accept()
+                    if sock.family != socket.AF_UNIX: # small messages. send them right away
+                        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    conn = worker_connection(sock)
+                    with self.lock:
+                        self.workers[sock] = conn
+                    self.selector.register(sock, selectors.EVENT_READ)
+                elif key.fileobj is self.wake_r:
+                    self.wake_r.recv(4096)
+                elif key.fileobj in self.workers:
+                    self.read_worker(self.workers[key.fileobj])
+            if self.timeout is not None:
+                self.expire_jobs()
+            self.dispatch()
+
+    def read_worker(self, conn):
+        try:
+            data = conn.sock.recv(65536)
+        except OSError:
+            data = b''
+        if not data: # closed, or the worker process died
+            self.worker_lost(conn)
+            return
+
+        conn.buffer = conn.buffer + data
+        lines = conn.buffer.split(b'\n')
+        conn.buffer = lines[-1]
+        for line in lines[:-1]:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if message.get('type') == 'hello':
+                if (self.token is not None) and (message.get('token') != self.token):
+                    self.worker_lost(conn)
+                    return
+                with self.lock:
+                    conn.name = str(message.get('name'))
+            elif message.get('type') == 'started':
+                self.job_started(conn, message.get('ticket'))
+            elif message.get('type') == 'result':
+                self.store_result(conn, message)
+
+    def job_started(self, conn, ticket):
+        # the timeout and latency clocks start when the first copy starts
+        with self.lock:
+            if (ticket in conn.in_flight) and (ticket in self.jobs) \
+               and (self.jobs[ticket]['started'] is None):
+                self.jobs[ticket]['started'] = time.monotonic()
+
+    def store_result(self, conn, message):
+        ticket = message.get('ticket')
+        with self.lock:
+            # False for a requeued job answered by the worker it was taken from
+            held = ticket in conn.in_flight
+            conn.in_flight.discard(ticket)
+            if not(ticket in self.jobs): # already answered, or timed out
+                return
+            job = self.jobs.pop(ticket)
+            # a worker that did not report the start (older eval_worker.py) is
+            # timed from the send. results from a worker that no longer held 
+            # the job are not timed
+            start = job['sent'] if job['started'] is None else job['started']
+            if held and (start is not None):
+                latency = time.monotonic() - start
+                self.latency_counts[np.searchsorted(self.LATENCY_EDGES, latency)] += 1
+                self.latency_total = self.latency_total + latency
+                self.latency_max = max(self.latency_max, latency)
+            if held and (conn is not job['first']):
+                self.speculative_wins = self.speculative_wins + 1
+            ok = bool(message.get('ok', False))
+            F = None
+            if ok:
+                F = np.asarray(message.get('F'), dtype=float)
+            self.results[ticket] = (F, ok)
+            self.changed.notify_all()
+
+    def worker_lost(self, conn):
+        # requeue the jobs the worker was holding
+        try:
+            self.selector.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        conn.sock.close()
+        with self.lock:
+            self.workers.pop(conn.sock, None)
+            self.workers_lost = self.workers_lost + 1
+            for ticket in conn.in_flight:
+                if not(ticket in self.jobs):
+                    continue
+                job = self.jobs[ticket]
+                job['copies'] = job['copies'] - 1
+                if job['copies'] > 0: # a copy is still running on another worker
+                    continue
+                job['retries'] = job['retries'] + 1
+                job['sent'] = None
+                job['started'] = None
+                job['first'] = None
+                if job['retries'] > self.max_retries:
+                    del self.jobs[ticket]
+                    self.results[ticket] = (None, False)
+                else:
+                    self.pending.appendleft(ticket)
+            conn.in_flight = set()
+            self.changed.notify_all()
+
+    def expire_jobs(self):
+        # fail jobs that have run longer than the timeout. the worker is still
+        # busy with the expired job, so the jobs queued behind it are requeued
+        now = time.monotonic()
+        with self.lock:
+            expired = [t for t, job in self.jobs.items()
+                       if (job['started'] is not None) and (now - job['started'] > self.timeout)]
+            for ticket in expired:
+                del self.jobs[ticket]
+                self.results[ticket] = (None, False)
+                self.timeouts = self.timeouts + 1
+                for conn in self.workers.values():
+                    if ticket in conn.in_flight:
+                        self.requeue_waiting(conn)
+            if len(expired) > 0:
+                self.changed.notify_all()
+
+    def requeue_waiting(self, conn):
+        # called with the lock held. jobs sent to conn that have not started
+        # go back to the front of the queue. if conn reaches them later, the
+        # first result is still kept
+        for ticket in list(conn.in_flight):
+            job = self.jobs.get(ticket)
+            if (job is None) or (job['started'] is not None):
+                continue
+            conn.in_flight.discard(ticket)
+            job['copies'] = job['copies'] - 1
+            if job['copies'] > 0:
+                continue
+            job['sent'] = None
+            job['first'] = None
+            self.pending.appendleft(ticket)
+
+    def straggler(self, conn, now):
+        # oldest running job that is slow enough for a speculative copy on conn
+        median = self.percentile_from_counts(50)
+        if (median is None) or (np.sum(self.latency_counts) < self.SPECULATE_MIN_SAMPLES):
+            return None
+        oldest = None
+        for ticket, job in self.jobs.items():
+            if (job['started'] is None) or (job['copies'] >= self.max_copies) or (ticket in conn.in_flight):
+                continue
+            if now - job['started'] < self.speculate_factor*median:
+                continue
+            if (oldest is None) or (job['started'] < self.jobs[oldest]['started']):
+                oldest = ticket
+        return oldest
+
+    def send_job(self, conn, ticket):
+        # called with the lock held. returns False if the worker is gone
+        job = self.jobs[ticket]
+        conn.in_flight.add(ticket)
+        job['copies'] = job['copies'] + 1
+        if job['sent'] is None:
+            job['sent'] = time.monotonic()
+            job['first'] = conn
+        message = {'type': 'job', 'ticket': ticket, 'X': job['X'], 'NO_OF_OUTS': job['NO_OF_OUTS']}
+        if job['fidelity'] is not None:
+            message['fidelity'] = job['fidelity']
+        try:
+            send_message(conn.sock, message)
+        except OSError:
+            return False
+        return True
+
+    def dispatch(self):
+        # send pending jobs to workers with room. then, if speculative, copies
+        # of the slowest running jobs to workers that still have room
+        lost = []
+        with self.lock:
+            now = time.monotonic()
+            for conn in self.workers.values():
+                if conn.name is None: # no hello yet
+                    continue
+                if any(not(ticket in self.jobs) for ticket in conn.in_flight):
+                    # still running a job that timed out (or that a copy answered).
+                    # new jobs would wait behind it, so it gets them when it is done
+                    continue
+                while (len(self.pending) > 0) and (len(conn.in_flight) < self.prefetch):
+                    ticket = self.pending.popleft()
+                    if not(ticket in self.jobs):
+                        continue
+                    if not self.send_job(conn, ticket):
+                        lost.append(conn)
+                        break
+                if self.speculative and (len(self.pending) == 0) and (len(conn.in_flight) == 0) \
+                   and not(conn in lost):
+                    # only idle workers take copies, so the copy starts right away
+                    ticket = self.straggler(conn, now)
+                    if ticket is not None:
+                        self.speculative_launches = self.speculative_launches + 1
+                        if not self.send_job(conn, ticket):
+                            lost.append(conn)
+        for conn in lost:
+            self.worker_lost(conn)
+
+
+def run_swarm(swarm, service, progress=None):
+    # run the swarm with ask() and tell(), so that each cat moves as soon as
+    # its own results are in instead of waiting for the cats before it.
+    # progress: optional progress.progress_monitor. the run stops if its 
+    #   callback returns True. objective_share is 0, the workers do the evaluations.
+    #   the monitor is detached when run_swarm() returns
+    # returns the swarm
+    outs = swarm.output_size
+    waiting = {} # service ticket -> swarm ticket
+    try:
+        while not swarm.complete():
+            for swarm_ticket, X in swarm.ask():
+                fidelity = swarm.fidelity_of(swarm_ticket) if swarm.multi_fidelity else None
+                waiting[service.submit(X, outs, fidelity)] = swarm_ticket
+            if len(waiting) < 1: # every cat is out of the search
+                break
+            for ticket, F, ok in service.completed(waiting.keys()):
+                swarm.tell(waiting.pop(ticket), F, ok)
+            if (progress is not None) and (progress.update(swarm) == True):
+                break
+    finally:
+        if progress is not None:
+            progress.detach(swarm)
+    return swarm
+
+
+def start_local_workers(service, problem, count=1, problem_path=None, delay=0.0, jitter=0.0):
+    # start count eval_worker.py processes on this host, connected to service.
+    # returns the subprocess.Popen objects. They exit when the service closes.
+    # delay, jitter: simulated evaluation time (see eval_worker.run_worker)
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'eval_worker.py')
+    command = [sys.executable, script, '--connect', format_address(service.address),
+               '--problem', str(problem)]
+    if service.token is not None:
+        command = command + ['--token', service.token]
+    for d in (problem_path or []):
+        command = command + ['--problem-path', d]
+    if delay > 0:
+        command = command + ['--delay', str(delay), '--jitter', str(jitter)]
+    return [subprocess.Popen(command) for i in range(int(count))]
@@ -0,0 +1,161 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   cat_swarm_python
+#   './cat_swarm_python/src/eval_worker.py'
+#   Evaluation worker for eval_service.py. Connects to the coordinator,
+#       evaluates the jobs it is sent with a problem from the problem
+#       registry, and sends back the results. This is a stand-in for
+#       simulation workers, and for testing on one host.
+#
+#   Usage (from the src directory):
+#       python eval_worker.py --connect 127.0.0.1:5000 --problem himmelblau
+#       python eval_worker.py --connect 127.0.0.1:5000 --problem himmelblau --processes 4
+#       python eval_worker.py --connect /tmp/cat_swarm.sock --problem lundquist_3_var
+#       python eval_worker.py --connect 127.0.0.1:5000 --problem himmelblau --delay 0.05 --jitter 0.5
+#
+#   Author(s): Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+
+import numpy as np
+
+import problem_registry
+from cat_swarm import as_point_objective
+from eval_service import parse_address, send_message
+
+
+def connect(address, timeout=30.0):
+    # keep trying until the coordinator is up, or timeout seconds pass
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if isinstance(address, tuple):
+                sock = socket.create_connection(address)
+                # the started and result messages are small. send them right away
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                return sock
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(address)
+            return sock
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+def evaluate_job(func, job, delay=0.0, multi_fidelity_func=None):
+    # returns a result message. errors in the function are reported as ok=False.
+    # delay: seconds added to each evaluation, to stand in for a simulation
+    # jobs with a fidelity are evaluated with multi_fidelity_func
+    if delay > 0:
+        time.sleep(delay)
+    try:
+        X = np.asarray(job['X'], dtype=float)
+        if job.get('fidelity') is None:
+            F, noError = func(X, int(job['NO_OF_OUTS']))
+        else:
+            F, noError = multi_fidelity_func(X, int(job['NO_OF_OUTS']), int(job['fidelity']))
+        F = [float(f) for f in np.reshape(np.hstack(F), -1)]
+        return {'type': 'result', 'ticket': job['ticket'], 'F': F, 'ok': bool(noError)}
+    except Exception:
+        return {'type': 'result', 'ticket': job['ticket'], 'F': None, 'ok': False}
+
+
+def run_worker(address, func, name=None, token=None, connect_timeout=30.0, delay=0.0, jitter=0.0,
+               multi_fidelity_func=None):
+    # evaluate jobs until the coordinator sends shutdown or closes the connection.
+    # returns the number of jobs evaluated.
+    # delay, jitter: simulated evaluation time. each evaluation takes an extra
+    #   delay*(1 + jitter*e) seconds, where e is exponentially distributed.
+    #   jitter > 0 makes some evaluations much slower than others (stragglers)
+    # multi_fidelity_func: used for jobs with a fidelity. Without it they fail
+    func = as_point_objective(func)
+    if multi_fidelity_func is not None:
+        multi_fidelity_func = as_point_objective(multi_fidelity_func)
+    if name is None:
+        name = socket.gethostname() + ':' + str(os.getpid())
+    sock = connect(parse_address(address), connect_timeout)
+    send_message(sock, {'type': 'hello', 'name': name, 'token': token})
+
+    rng = np.random.default_rng()
+    done = 0
+    buffer = b''
+    with sock:
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                return done
+            buffer = buffer + data
+            lines = buffer.split(b'\n')
+            buffer = lines[-1]
+            for line in lines[:-1]:
+                message = json.loads(line)
+                if message.get('type') == 'shutdown':
+                    return done
+                if message.get('type') == 'job':
+                    job_delay = delay*(1 + jitter*rng.exponential()) if delay > 0 else 0.0
+                    try:
+                        # the coordinator's timeout and latency clocks start here
+                        send_message(sock, {'type': 'started', 'ticket': message['ticket']})
+                        send_message(sock, evaluate_job(func, message, job_delay, multi_fidelity_func))
+                    except OSError: # the coordinator closed while this job was running
+                        return done
+                    done = done + 1
+
+
+def worker_main(address, problem, problem_path, token, connect_timeout, delay=0.0, jitter=0.0):
+    func_configs = problem_registry.load_problem(problem, problem_path)
+    run_worker(address, func_configs.OBJECTIVE_FUNC, token=token, connect_timeout=connect_timeout,
+               delay=delay, jitter=jitter,
+               multi_fidelity_func=getattr(func_configs, 'MULTI_FIDELITY_FUNC', None))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Evaluation worker for eval_service.py')
+    parser.add_argument('--connect', required=True,
+                        help='coordinator address. host:port, or a Unix socket path')
+    parser.add_argument('--problem', required=True, help='problem name (see python -m cat_swarm list)')
+    parser.add_argument('--problem-path', action='append', default=[],
+                        help='additional directory to search for problem packages (repeatable)')
+    parser.add_argument('--processes', type=int, default=1, help='number of worker processes to start')
+    parser.add_argument('--token', default=None, help='token expected by the coordinator')
+    parser.add_argument('--connect-timeout', type=float, default=30.0,
+                        help='seconds to keep trying to reach the coordinator')
+    parser.add_argument('--delay', type=float, default=0.0,
+                        help='simulated evaluation time in seconds, added to each evaluation')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='random extra delay (exponential, scaled by delay*jitter) to simulate stragglers')
+    args = parser.parse_args(argv)
+
+    try: # fail here, not in every worker process, if the name is wrong
+        problem_registry.load_problem(args.problem, args.problem_path)
+    except ValueError as e:
+        parser.error(str(e))
+
+    worker_args = (args.connect, args.problem, args.problem_path, args.token, args.connect_timeout,
+                   args.delay, args.jitter)
+    if args.processes <= 1:
+        worker_main(*worker_args)
+        return 0
+
+    processes = [multiprocessing.Process(target=worker_main, args=worker_args)
+                 for i in range(args.processes)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
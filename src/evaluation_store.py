@@ -0,0 +1,67 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   cat_swarm_python
+#   './cat_swarm_python/src/evaluation_store.py'
+#   Archive of objective function evaluations for the 'swarm' class in
+#       cat_swarm.py. A swarm given an evaluation_store adds every
+#       evaluation it makes, and reuses the stored values instead of
+#       calling the objective function again. Stores can be saved and
+#       loaded, so a later run can be warm started from an earlier one.
+#
+#       Only the objective function outputs (Fvals) are stored. The
+#       swarm computes Flist from them with its own targets.
+#
+#   Author(s): Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+
+import numpy as np
+
+
+class evaluation_store:
+    # evaluation_store() or evaluation_store.load(filename)
+    # positions: (n, D) evaluated positions. values: (n, NO_OF_OUTS) objective outputs
+    def __init__(self, positions=None, values=None):
+        self.positions = []
+        self.values = []
+        if positions is not None:
+            self.extend(positions, values)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def add(self, X, F):
+        # one evaluation. X: (D,), F: (NO_OF_OUTS,)
+        self.positions.append(np.array(X, dtype=float).reshape(-1))
+        self.values.append(np.array(F, dtype=float).reshape(-1))
+
+    def extend(self, X, F):
+        # a batch of evaluations. X: (n, D), F: (n, NO_OF_OUTS)
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        F = np.reshape(np.asarray(F, dtype=float), (len(X), -1))
+        if len(X) != len(F):
+            raise ValueError("positions and values must have the same number of rows")
+        for i in range(len(X)):
+            self.add(X[i], F[i])
+
+    def arrays(self):
+        # (positions (n, D), values (n, NO_OF_OUTS)). empty arrays if nothing is stored
+        if len(self.positions) < 1:
+            return np.zeros((0, 0)), np.zeros((0, 0))
+        return np.vstack(self.positions), np.vstack(self.values)
+
+    def save(self, filename):
+        positions, values = self.arrays()
+        np.savez(filename, positions=positions, values=values)
+
+    @classmethod
+    def load(cls, filename):
+        with np.load(filename) as data:
+            positions = data['positions']
+            values = data['values']
+        store = cls()
+        if len(positions) > 0:
+            store.extend(positions, values)
+        return store
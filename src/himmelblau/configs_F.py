@@ -6,23 +6,22 @@
 #   configurations for function compatable with project optimizers
 #
 #   Author(s): Lauren Linkous (LINKOUSLC@vcu.edu)
-#   Last update: May 25, 2024
+#   Last update: October 19, 2026
 ##-------------------------------------------------------------------------------\
 
 
-import sys
-try: # for outside func calls
-    sys.path.insert(0, './cat_swarm_python/src/')
-    from himmelblau.func_F import func_F
-    from himmelblau.constr_F import constr_F
-except: # for local
-    from func_F import func_F
+try: # imported as part of the package (python -m cat_swarm, main_test.py, problem registry)
+    from .func_F import func_F, func_F_multi_fidelity
+    from .constr_F import constr_F
+except ImportError: # for local (running graph.py from this directory)
+    from func_F import func_F, func_F_multi_fidelity
     from constr_F import constr_F
 
 OBJECTIVE_FUNC = func_F
 CONSTR_FUNC = constr_F
 OBJECTIVE_FUNC_NAME = "himmelblau.func_F"
 CONSTR_FUNC_NAME = "himmelblau.constr_F"
+MULTI_FIDELITY_FUNC = func_F_multi_fidelity # optional. see cat_swarm's multi-fidelity protocol
 
 # problem dependent variables
 LB = [[-5, -5]]             # Lower boundaries
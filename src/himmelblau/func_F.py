@@ -6,19 +6,58 @@
 #   objective function for function compatable with project optimizers
 #
 #   Author(s): Lauren Linkous (LINKOUSLC@vcu.edu)
-#   Last update: May 28, 2024
+#   Last update: October 19, 2026
 ##-------------------------------------------------------------------------------\
 
 import numpy as np
 
+def himmelblau(x, y):
+    return (x**2 + y - 11)**2 + (x + y**2 - 7)**2
+
 def func_F(X, NO_OF_OUTS=1):
+    # X is a single point (D,) or a batch of points (n, D).
+    # for a batch, F has the shape (n, NO_OF_OUTS) and noErrors is a (n,) bool array
+    X = np.asarray(X, dtype=float)
+    if X.ndim > 1:
+        return func_F_batch(X, NO_OF_OUTS)
+
     F = np.zeros((NO_OF_OUTS))
     noErrors = True
     try:
-        x = X[0]
-        y = X[1]   
-        F[0] = (x**2 + y - 11)**2 + (x + y**2 - 7)**2
+        F[0] = himmelblau(X[0], X[1])
     except:
         noErrors = False
 
     return F, noErrors
+
+def func_F_batch(X, NO_OF_OUTS=1):
+    F = np.zeros((len(X), NO_OF_OUTS))
+    noErrors = np.ones(len(X), dtype=bool)
+    try:
+        with np.errstate(all='ignore'): # flag bad points instead of failing the batch
+            F[:, 0] = himmelblau(X[:, 0], X[:, 1])
+        noErrors = np.all(np.isfinite(F), axis=1)
+    except:
+        noErrors[:] = False
+
+    return F, noErrors
+
+# batch protocol. see cat_swarm.is_batch_function
+func_F.is_batch = True
+func_F.accepts_point = True # single (D,) points return the scalar form
+
+# multi-fidelity version. see cat_swarm's multi-fidelity protocol.
+# fidelity 0 stands in for a coarse mesh: a cheap value with a smooth,
+# position dependent error of up to 10%. fidelity 1 is func_F
+def func_F_multi_fidelity(X, NO_OF_OUTS=1, fidelity=1):
+    F, noErrors = func_F(X, NO_OF_OUTS)
+    if fidelity == 0:
+        X = np.asarray(X, dtype=float)
+        error = 0.1*np.sin(3*X[..., 0] + 2*X[..., 1])
+        F = F*(1 + np.reshape(error, np.shape(error) + (1,)))
+    return F, noErrors
+
+func_F_multi_fidelity.is_batch = True
+func_F_multi_fidelity.accepts_point = True
+func_F_multi_fidelity.multi_fidelity = True
+func_F_multi_fidelity.fidelity_costs = (0.05, 1.0) # the coarse mesh is 20x cheaper
@@ -10,10 +10,14 @@
 ##-------------------------------------------------------------------------------\
 
 
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
 import configs_F as f_c
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # src, for landscape.py
+from landscape import load_landscape
 # problem constraints - pulled from the function configs for the optimizers
 LOWER_BOUNDS = f_c.LB[0]
 UPPER_BOUNDS = f_c.UB[0]
@@ -22,6 +26,7 @@ LB_y = LOWER_BOUNDS[1]
 UB_x = UPPER_BOUNDS[0]
 UB_y = UPPER_BOUNDS[1]
 FUNC_F = f_c.OBJECTIVE_FUNC
+FUNC_NAME = f_c.OBJECTIVE_FUNC_NAME
 GLOBAL_MIN = f_c.GLOBAL_MIN
 
 
@@ -29,31 +34,14 @@ GLOBAL_MIN = f_c.GLOBAL_MIN
 plotname = "himmelblau_plots.png"
 
 
-# Define range and step size
-x = np.linspace(LB_x, UB_x, 600)
-y = np.linspace(LB_y, UB_y, 600)
+# Evaluate function on a 600x600 grid
+# evaluated in vectorized chunks, and cached to .landscape_cache/ for re-plotting
+land = load_landscape(FUNC_F, LOWER_BOUNDS, UPPER_BOUNDS, 600, FUNC_NAME)
+x, y = land['axes']
 X, Y = np.meshgrid(x, y)
 
-# Reshape X and Y to 1D arrays
-X_flat = X.flatten()
-Y_flat = Y.flatten()
-
-# Stack X and Y to create coords as a 2D array
-coords = np.stack((X_flat, Y_flat), axis=-1)
-
-# Evaluate function
-
-Z = []
-for c in coords:
-    z, noErr = FUNC_F(c)
-    if noErr == True:
-        Z.append(z)
-
-# Convert Z to a NumPy array
-Z = np.array(Z)
-
-# Reshape Z to ensure it's 2-dimensional
-Z = Z.reshape(X.shape)
+# landscape is indexed [x, y]. meshgrid(x, y) is indexed [y, x]
+Z = land['F'][:, :, 0].T
 
 # Create figure and subplots
 fig = plt.figure(figsize=(14, 7))
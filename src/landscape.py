@@ -0,0 +1,133 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   cat_swarm_python
+#   './cat_swarm_python/src/landscape.py'
+#   Objective function landscape rasters for the graphing scripts.
+#       The function is evaluated over a regular grid in chunks using the
+#       batch protocol (scalar functions are wrapped), and the result is
+#       cached to an .npz file keyed by the bounds, resolution, and
+#       function name. Re-plotting a cached landscape only loads the file.
+#
+#   Author(s): Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from cat_swarm import as_batch_objective, as_batch_constraint
+
+DEFAULT_CACHE_DIR = '.landscape_cache'
+DEFAULT_CHUNK_SIZE = 65536 # points per objective function call
+
+
+def grid_axes(lbound, ubound, resolution):
+    # one np.linspace per input variable.
+    # resolution is an int (same for every variable) or a list with one int per variable
+    lbound = np.reshape(np.asarray(lbound, dtype=float), -1)
+    ubound = np.reshape(np.asarray(ubound, dtype=float), -1)
+    resolution = np.broadcast_to(np.asarray(resolution, dtype=int), np.shape(lbound))
+    return [np.linspace(lb, ub, int(res)) for lb, ub, res in zip(lbound, ubound, resolution)]
+
+
+def landscape_key(lbound, ubound, resolution, func_name, NO_OF_OUTS=1, constr_name=None):
+    # cache key for a landscape. change the function name (or clear the cache)
+    # if the function itself changes
+    lbound = np.reshape(np.asarray(lbound, dtype=float), -1)
+    settings = {'lbound': lbound.tolist(),
+                'ubound': np.reshape(np.asarray(ubound, dtype=float), -1).tolist(),
+                'resolution': np.broadcast_to(np.asarray(resolution, dtype=int), np.shape(lbound)).tolist(),
+                'func_name': str(func_name),
+                'NO_OF_OUTS': int(NO_OF_OUTS),
+                'constr_name': None if constr_name is None else str(constr_name)}
+    text = json.dumps(settings, sort_keys=True)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def compute_landscape(func, lbound, ubound, resolution, NO_OF_OUTS=1,
+                      constr_func=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    # evaluate func over the grid. The grid points are built one chunk at a time,
+    # so the full coordinate array is never held in memory.
+    # returns a dict:
+    #   'axes'  : list of 1D grid axes, one per input variable
+    #   'F'     : (n_0, n_1, ..., NO_OF_OUTS) function values. nan where the
+    #             evaluation failed or the point is outside the constraints
+    #   'valid' : (n_0, n_1, ...) bool. True where F was evaluated without errors
+    #             and the point meets the constraints
+    # Grid arrays use 'ij' indexing (axis k is input variable k). For matplotlib
+    # 2D plots with np.meshgrid(x, y), use the transpose: F[:, :, 0].T
+    axes = grid_axes(lbound, ubound, resolution)
+    shape = tuple(len(a) for a in axes)
+    num_points = int(np.prod(shape))
+
+    batch_func = as_batch_objective(func)
+    batch_constr = None
+    if constr_func is not None:
+        batch_constr = as_batch_constraint(constr_func)
+
+    F = np.full((num_points, NO_OF_OUTS), np.nan)
+    valid = np.zeros(num_points, dtype=bool)
+
+    for start in range(0, num_points, int(chunk_size)):
+        stop = min(start + int(chunk_size), num_points)
+        idx = np.unravel_index(np.arange(start, stop), shape)
+        X = np.stack([axes[k][idx[k]] for k in range(len(axes))], axis=-1)
+
+        ok = np.ones(len(X), dtype=bool)
+        if batch_constr is not None:
+            ok = np.reshape(np.asarray(batch_constr(X), dtype=bool), -1)
+        if np.any(ok):
+            chunkF, noErrors = batch_func(X[ok], NO_OF_OUTS)
+            chunkF = np.reshape(np.asarray(chunkF, dtype=float), (-1, NO_OF_OUTS))
+            noErrors = np.reshape(np.asarray(noErrors, dtype=bool), -1)
+            rows = start + np.flatnonzero(ok)
+            F[rows[noErrors]] = chunkF[noErrors]
+            valid[rows[noErrors]] = True
+
+    return {'axes': axes,
+            'F': F.reshape(shape + (NO_OF_OUTS,)),
+            'valid': valid.reshape(shape)}
+
+
+def load_landscape(func, lbound, ubound, resolution, func_name, NO_OF_OUTS=1,
+                   constr_func=None, constr_name=None,
+                   cache_dir=DEFAULT_CACHE_DIR, chunk_size=DEFAULT_CHUNK_SIZE, refresh=False):
+    # compute_landscape with an .npz cache.
+    # cache_dir=None turns the cache off. refresh=True recomputes and overwrites the cache
+    if cache_dir is None:
+        return compute_landscape(func, lbound, ubound, resolution, NO_OF_OUTS,
+                                 constr_func, chunk_size)
+
+    if (constr_func is not None) and (constr_name is None):
+        constr_name = getattr(constr_func, '__module__', '') + '.' + getattr(constr_func, '__name__', 'constr')
+    key = landscape_key(lbound, ubound, resolution, func_name, NO_OF_OUTS, constr_name)
+    filename = os.path.join(cache_dir, str(func_name).replace(os.sep, '_') + '_' + key + '.npz')
+
+    if os.path.isfile(filename) and not refresh:
+        with np.load(filename) as data:
+            num_axes = int(data['num_axes'])
+            return {'axes': [data['axis_' + str(k)] for k in range(num_axes)],
+                    'F': data['F'],
+                    'valid': data['valid']}
+
+    land = compute_landscape(func, lbound, ubound, resolution, NO_OF_OUTS,
+                             constr_func, chunk_size)
+    os.makedirs(cache_dir, exist_ok=True)
+    axes = {'axis_' + str(k): a for k, a in enumerate(land['axes'])}
+    np.savez(filename, F=land['F'], valid=land['valid'], num_axes=len(land['axes']), **axes)
+    return land
+
+
+def overlay_positions(ax, positions, artist=None, **scatter_kwargs):
+    # draw swarm positions (n, 2) over a 2D landscape plot. Pass the returned
+    # artist back in to move the points without redrawing the landscape
+    positions = np.atleast_2d(positions)
+    if artist is None:
+        return ax.scatter(positions[:, 0], positions[:, 1], **scatter_kwargs)
+    artist.set_offsets(positions[:, :2])
+    return artist
@@ -0,0 +1,217 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   cat_swarm_python
+#   './cat_swarm_python/src/live_plot.py'
+#   Real-time plot of the swarm that runs in a separate process.
+#       The optimizer pushes position and fitness snapshots into a small
+#       bounded queue. The renderer process draws at a fixed frame rate
+#       by updating the existing artists (no ax.clear()), and only draws
+#       the newest snapshot. Snapshots are dropped when the renderer is
+#       behind, so plotting never slows down the optimizer.
+#
+#   Author(s): Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+
+import multiprocessing
+import queue
+import time
+
+import numpy as np
+
+
+class live_plot:
+    # live_plot(lbound, ubound, targets)
+    # lbound, ubound: [[float, ...]] problem bounds, used for fixed axis limits
+    # targets: [float, ...] target values, drawn on the fitness plot
+    # fps: frames per second drawn by the renderer
+    # queue_size: max snapshots waiting for the renderer
+    # landscape: optional dict from landscape.load_landscape, drawn behind 2D positions
+    def __init__(self, lbound, ubound, targets, fps=10, queue_size=2, landscape=None):
+        self.fps = float(fps)
+        self.min_interval = 1.0/self.fps  # don't send snapshots faster than they're drawn
+        self.last_push = 0.0
+        self.pushed = 0
+        self.dropped = 0
+
+        # spawn, so the renderer does not inherit GUI state from this process.
+        # matplotlib is only imported in the renderer process
+        ctx = multiprocessing.get_context('spawn')
+        self.queue = ctx.Queue(maxsize=int(queue_size))
+        settings = {'lbound': np.array(lbound, dtype=float).reshape(-1),
+                    'ubound': np.array(ubound, dtype=float).reshape(-1),
+                    'targets': np.array(targets, dtype=float).reshape(-1),
+                    'fps': self.fps,
+                    'landscape': landscape}
+        self.process = ctx.Process(target=render_loop, args=(self.queue, settings), daemon=True)
+        self.process.start()
+
+    def push(self, iteration, positions, fitness):
+        # send a snapshot to the renderer. Returns True if it was queued.
+        # positions: (n, D). fitness: outputs of one or more points, such as
+        #   swarm.F_Gb (1, OUT, 1). it is reshaped to (n, OUT) by the renderer
+        # snapshots are skipped if they arrive faster than the frame rate,
+        # and dropped if the queue is full or the plot window was closed.
+        # raises RuntimeError if the renderer process failed
+        now = time.perf_counter()
+        if (now - self.last_push) < self.min_interval:
+            return False
+        self.last_push = now
+
+        if not self.process.is_alive():
+            # exit code 0 is a closed window. anything else is a renderer error
+            if self.process.exitcode not in (0, None):
+                raise RuntimeError("live_plot renderer exited with code " + str(self.process.exitcode))
+            return False
+        try:
+            self.queue.put_nowait((int(iteration), np.array(positions, dtype=float),
+                                   np.array(fitness, dtype=float)))
+            self.pushed = self.pushed + 1
+            return True
+        except queue.Full:
+            self.dropped = self.dropped + 1
+            return False
+
+    def close(self, hold=0):
+        # stop the renderer. hold: seconds to keep the window open after the
+        # last snapshot is drawn
+        if self.process.is_alive():
+            try:
+                self.queue.put(('close', float(hold)), timeout=1.0)
+            except queue.Full:
+                pass
+            self.process.join(timeout=float(hold) + 5.0)
+        if self.process.is_alive():
+            self.process.terminate()
+
+
+def render_loop(snapshot_queue, settings):
+    # runs in the renderer process
+    import matplotlib.pyplot as plt
+
+    lbound = settings['lbound']
+    ubound = settings['ubound']
+    targets = settings['targets']
+    frame_time = 1.0/settings['fps']
+    num_dims = len(lbound)
+    num_outs = len(targets)
+
+    fig = plt.figure(figsize=(10, 5))
+    # position plot. 3D axes only for 3+ input variables
+    if num_dims >= 3:
+        ax1 = fig.add_subplot(121, projection='3d')
+        ax1.set_zlim(lbound[2], ubound[2])
+        ax1.set_zlabel("$x_3$")
+    else:
+        ax1 = fig.add_subplot(121)
+    ax1.set_xlim(lbound[0], ubound[0])
+    ax1.set_xlabel("$x_1$")
+    if num_dims >= 2:
+        ax1.set_ylim(lbound[1], ubound[1])
+        ax1.set_ylabel("$x_2$")
+    else:
+        ax1.set_ylim(-1, 1)
+        ax1.set_ylabel("filler coords")
+
+    land = settings['landscape']
+    if (land is not None) and (num_dims == 2):
+        x, y = land['axes']
+        ax1.contourf(x, y, land['F'][:, :, 0].T, cmap='viridis', alpha=0.6)
+
+    # fitness plot
+    if num_outs >= 3:
+        ax2 = fig.add_subplot(122, projection='3d')
+        ax2.set_zlabel("$F_{3}$")
+    else:
+        ax2 = fig.add_subplot(122)
+    ax2.set_title("Global Best Fitness Relation to Target")
+    ax2.set_xlabel("$F_{1}$")
+    ax2.set_ylabel("$F_{2}$" if num_outs >= 2 else "filler coords")
+
+    # target point
+    target_coords = np.zeros(3)
+    target_coords[:min(num_outs, 3)] = targets[:3]
+    if num_outs >= 3:
+        ax2.scatter(target_coords[0], target_coords[1], target_coords[2], marker='*', color='r')
+    else:
+        ax2.scatter(target_coords[0], target_coords[1], marker='*', color='r')
+
+    positions_artist = None
+    fitness_artist = None
+    plt.tight_layout()
+    plt.show(block=False)
+
+    hold = 0
+    running = True
+    while running and plt.fignum_exists(fig.number):
+        frame_start = time.perf_counter()
+
+        # only draw the newest snapshot. older ones are dropped
+        snapshot = None
+        try:
+            snapshot = snapshot_queue.get(timeout=frame_time)
+            while True:
+                snapshot = snapshot_queue.get_nowait()
+        except queue.Empty:
+            pass
+        if (snapshot is not None) and (snapshot[0] == 'close'):
+            hold = snapshot[1]
+            running = False
+            snapshot = None
+
+        if snapshot is not None:
+            iteration, positions, fitness = snapshot
+            positions = np.atleast_2d(positions)
+            fitness = np.reshape(fitness, (-1, num_outs)) # one row per point
+
+            # positions. pad missing dimensions with zeros
+            P = np.zeros((len(positions), 3))
+            P[:, :min(num_dims, 3)] = positions[:, :3]
+            if positions_artist is None:
+                if num_dims >= 3:
+                    positions_artist = ax1.scatter(P[:, 0], P[:, 1], P[:, 2], edgecolors='b')
+                else:
+                    positions_artist = ax1.scatter(P[:, 0], P[:, 1], edgecolors='b')
+            elif num_dims >= 3:
+                positions_artist._offsets3d = (P[:, 0], P[:, 1], P[:, 2])
+            else:
+                positions_artist.set_offsets(P[:, :2])
+            ax1.set_title("Search Locations, Iteration: " + str(iteration))
+
+            # fitness
+            Fp = np.zeros((len(fitness), 3))
+            Fp[:, :min(num_outs, 3)] = fitness[:, :3]
+            if fitness_artist is None:
+                if num_outs >= 3:
+                    fitness_artist = ax2.scatter(Fp[:, 0], Fp[:, 1], Fp[:, 2], marker='o', s=40,
+                                                 facecolor="none", edgecolors="k")
+                else:
+                    fitness_artist = ax2.scatter(Fp[:, 0], Fp[:, 1], marker='o', s=40,
+                                                 facecolor="none", edgecolors="k")
+            elif num_outs >= 3:
+                fitness_artist._offsets3d = (Fp[:, 0], Fp[:, 1], Fp[:, 2])
+            else:
+                fitness_artist.set_offsets(Fp[:, :2])
+            # fitness limits follow the data and the target
+            both = np.vstack([Fp, target_coords])
+            low = np.min(both, axis=0)
+            high = np.max(both, axis=0)
+            pad = 0.1*np.maximum(high - low, 1e-12)
+            ax2.set_xlim(low[0] - pad[0], high[0] + pad[0])
+            ax2.set_ylim(low[1] - pad[1], high[1] + pad[1])
+            if num_outs >= 3:
+                ax2.set_zlim(low[2] - pad[2], high[2] + pad[2])
+
+            fig.canvas.draw_idle()
+
+        fig.canvas.flush_events()
+        # keep a fixed frame rate
+        remaining = frame_time - (time.perf_counter() - frame_start)
+        if remaining > 0:
+            time.sleep(remaining)
+
+    if hold > 0 and plt.fignum_exists(fig.number):
+        plt.pause(hold)
+    plt.close(fig)
@@ -8,21 +8,21 @@
 #
 #
 #   Author(s): Lauren Linkous, Jonathan Lundquist
-#   Last update: May 25, 2024
+#   Last update: October 19, 2026
 ##--------------------------------------------------------------------\
-import sys
-try: # for outside func calls
-    sys.path.insert(0, './cat_swarm_python/src/')
-    from lundquist_3_var.func_F import func_F
-    from lundquist_3_var.constr_F import constr_F
-except: # for local
-    from func_F import func_F
-    from constr_F import constr_F
+try: # imported as part of the package (python -m cat_swarm, main_test.py, problem registry)
+    from .func_F import func_F, func_F_incremental
+    from .constr_F import constr_F, constr_violation
+except ImportError: # for local (running graph.py from this directory)
+    from func_F import func_F, func_F_incremental
+    from constr_F import constr_F, constr_violation
 
 OBJECTIVE_FUNC = func_F
 CONSTR_FUNC = constr_F
+CONSTR_VIOLATION = constr_violation # optional. amount each constraint is violated by
 OBJECTIVE_FUNC_NAME = "lundquist_3_var.func_F"
 CONSTR_FUNC_NAME = "lundquist_3_var.constr_F"
+INCREMENTAL_FUNC = func_F_incremental # optional. see cat_swarm's incremental protocol
 
 # problem dependent variables
 LB = [[0.21, 0, 0.1]]       # Lower boundaries for input
@@ -30,4 +30,5 @@ UB = [[1, 1, 0.5]]          # Upper boundaries for input
 IN_VARS = 3                 # Number of input variables (x-values)
 OUT_VARS = 2                # Number of output variables (y-values)
 TARGETS = [0, 0]            # Target values for output
+OUTPUT_DEPENDENCIES = [[0, 1], [2]] # optional. input variables each output depends on
 GLOBAL_MIN = None           # Global minima, if they exist
\ No newline at end of file
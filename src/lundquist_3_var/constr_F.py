@@ -6,16 +6,42 @@
 #   Function for objective function constraints.
 #   Has 2 checks: 1 for the function limitations, 1 for float size
 #   Returns True if x array passes constraints check, False otherwise   
+#   constr_violation() returns how far x is from meeting each constraint
 #
 #   Author(s): Jonathan Lundquist, Lauren Linkous
-#   Last update: May 28, 2024
+#   Last update: October 19, 2026
 ##--------------------------------------------------------------------\
 
 
+import numpy as np
+
 def constr_F(X):
+    # X is a single point (D,) or a batch of points (n, D).
+    # a batch returns a (n,) bool array
+    X = np.asarray(X)
+    if X.ndim > 1:
+        return ~((X[:, 2] > X[:, 0]/2) | (X[:, 2] < 0.1))
+
     F = True
     # objective function/problem constraints
     if (X[2] > X[0]/2) or (X[2] < 0.1):
         F = False
 
-    return F
\ No newline at end of file
+    return F
+
+# batch protocol. see cat_swarm.is_batch_function
+constr_F.is_batch = True
+constr_F.accepts_point = True # single (D,) points return a bool
+
+
+def constr_violation(X):
+    # amount each constraint is violated by. 0 where it is met.
+    # X is a single point (D,) -> (2,), or a batch of points (n, D) -> (n, 2)
+    X = np.asarray(X, dtype=float)
+    V = np.stack([X[..., 2] - X[..., 0]/2,   # X[2] <= X[0]/2
+                  0.1 - X[..., 2]],          # X[2] >= 0.1
+                 axis=-1)
+    return np.maximum(V, 0)
+
+constr_violation.is_batch = True
+constr_violation.accepts_point = True
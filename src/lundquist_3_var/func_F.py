@@ -8,20 +8,91 @@
 #       if constraints have been properly applied.
 #
 #   Author(s): Lauren Linkous, Jonathan Lundquist
-#   Last update: May 28, 2024
+#   Last update: October 19, 2026
 ##-------------------------------------------------------------------------------\
 
 import numpy as np
 
+# X can be a point or the transpose of a batch (D, n)
+def f1(X):
+    return (X[0]-0.5) ** 2 + (X[1]-0.1) ** 2
+
+def f2(X):
+    return (X[2]-0.2) ** 4
+
 def func_F(X, NO_OF_OUTS=2):
+    # X is a single point (D,) or a batch of points (n, D).
+    # for a batch, F has the shape (n, NO_OF_OUTS) and noErrors is a (n,) bool array
+    X = np.asarray(X, dtype=float)
+    if X.ndim > 1:
+        return func_F_batch(X, NO_OF_OUTS)
+
     F = np.zeros((NO_OF_OUTS))
     noErrors = True
     try:
-        F[0] = (X[0]-0.5) ** 2 + (X[1]-0.1) ** 2
-        F[1] = (X[2]-0.2) ** 4
-        
+        F[0] = f1(X)
+        F[1] = f2(X)
     except:
         noErrors = False
-    
+
+    return F, noErrors
+
+def func_F_batch(X, NO_OF_OUTS=2):
+    F = np.zeros((len(X), NO_OF_OUTS))
+    noErrors = np.ones(len(X), dtype=bool)
+    try:
+        with np.errstate(all='ignore'): # flag bad points instead of failing the batch
+            F[:, 0] = f1(X.T)
+            F[:, 1] = f2(X.T)
+        noErrors = np.all(np.isfinite(F), axis=1)
+    except:
+        noErrors[:] = False
+
     return F, noErrors
 
+# batch protocol. see cat_swarm.is_batch_function
+func_F.is_batch = True
+func_F.accepts_point = True # single (D,) points return the scalar form
+
+# incremental protocol. see cat_swarm's incremental protocol.
+# each input variable has its own term: F[0] = term 0 + term 1, F[1] = term 2.
+# a change to a few inputs only recomputes their terms
+TERMS = [lambda x: (x-0.5) ** 2,
+         lambda x: (x-0.1) ** 2,
+         lambda x: (x-0.2) ** 4]
+
+def outputs_from_terms(terms, NO_OF_OUTS=2):
+    F = np.zeros((NO_OF_OUTS))
+    F[0] = terms[0] + terms[1]
+    F[1] = terms[2]
+    return F
+
+def func_F_context(X, NO_OF_OUTS=2):
+    X = np.array(X, dtype=float)
+    try:
+        terms = np.array([TERMS[i](X[i]) for i in range(len(TERMS))])
+        F = outputs_from_terms(terms, NO_OF_OUTS)
+    except:
+        return np.zeros((NO_OF_OUTS)), False, None
+    return F, True, {'X': X, 'terms': terms}
+
+def func_F_delta(context, dims, values, NO_OF_OUTS=2):
+    terms = 1*context['terms']
+    try:
+        for i, x in zip(dims, values):
+            terms[i] = TERMS[i](x)
+        F = outputs_from_terms(terms, NO_OF_OUTS)
+    except:
+        return np.zeros((NO_OF_OUTS)), False
+    return F, True
+
+# incremental version. the same values as func_F, but seeking candidates are
+# updated from their cat's terms. opt in with INCREMENTAL_FUNC in configs_F.py
+def func_F_incremental(X, NO_OF_OUTS=2):
+    return func_F(X, NO_OF_OUTS)
+
+func_F_incremental.is_batch = True
+func_F_incremental.accepts_point = True
+func_F_incremental.incremental = True
+func_F_incremental.context = func_F_context
+func_F_incremental.delta = func_F_delta
@@ -10,11 +10,15 @@
 #   Last update: May 25, 2024
 ##-------------------------------------------------------------------------------\
 
+import os
+import sys
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
 import configs_F as f_c
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # src, for landscape.py
+from landscape import load_landscape
 # problem constraints - pulled from the function configs for the optimizers
 LOWER_BOUNDS = f_c.LB[0]
 UPPER_BOUNDS = f_c.UB[0]
@@ -27,6 +31,9 @@ UB_z = UPPER_BOUNDS[2]
 IN_VARS = f_c.IN_VARS
 FUNC_F = f_c.OBJECTIVE_FUNC
 CONSTR_F = f_c.CONSTR_FUNC
+FUNC_NAME = f_c.OBJECTIVE_FUNC_NAME
+CONSTR_NAME = f_c.CONSTR_FUNC_NAME
+OUT_VARS = f_c.OUT_VARS
 
 # for exporting df to csv
 filename = 'lundquist_3var_pareto_coords_output.csv'
@@ -56,37 +63,21 @@ def pareto_front(X, Y, minimize=True):
     return pareto_front_X, pareto_front_Y
 
 
-# Define range and step size
-x = np.linspace(LB_x, UB_x, 100)
-y = np.linspace(LB_y, UB_y, 100)
-z = np.linspace(LB_z, UB_z, 100)
-
-x_grid = np.array(np.meshgrid(x, y, z)).T.reshape(-1, IN_VARS) 
-
-# Evaluate function + apply constraints
+# Evaluate function + apply constraints on a 100x100x100 grid
 # this is the same function used by the optimizers, so the format reflects that
-validCoords = [] # the valid x,y coordinates
-paretoCoords = [] #col1: f1, col2: f2
-for c in x_grid:
-    # check if point is in the constraints.
-    point_is_valid = CONSTR_F(c)
-    if point_is_valid == True:
-        # add point to validCoords
-        validCoords.append(c)
-        # pass point to the function to get the minimized F set
-        objective_space, noErr = FUNC_F(c)
-        if noErr == True:
-            paretoCoords.append(objective_space)
-
-
-# Convert validCoords to a NumPy array
-validCoords = np.array(validCoords)
-valid_x = validCoords[:,0]
-valid_y = validCoords[:,1]
-valid_z = validCoords[:,2]
-
-# Convert paretoCoords to a NumPy array
-paretoCoords = np.array(paretoCoords)
+# evaluated in vectorized chunks, and cached to .landscape_cache/ for re-plotting
+land = load_landscape(FUNC_F, LOWER_BOUNDS, UPPER_BOUNDS, 100, FUNC_NAME, NO_OF_OUTS=OUT_VARS,
+                      constr_func=CONSTR_F, constr_name=CONSTR_NAME)
+valid = land['valid']
+
+# the valid x,y,z coordinates
+grid_x, grid_y, grid_z = np.meshgrid(*land['axes'], indexing='ij')
+valid_x = grid_x[valid]
+valid_y = grid_y[valid]
+valid_z = grid_z[valid]
+
+# col1: f1, col2: f2
+paretoCoords = land['F'][valid]
 
 # Get the feasible objective space
 objective_x = paretoCoords[:,0]
@@ -14,7 +14,6 @@
 ##--------------------------------------------------------------------\
 
 
-import pandas as pd
 import numpy as np
 
 from cat_swarm import swarm
@@ -74,21 +73,20 @@ if __name__ == "__main__":
     allow_update = True       # Allow objective call to update state 
 
     # Constant variables
-    opt_params = {'NO_OF_PARTICLES': [NO_OF_PARTICLES],     # Number of particles in swarm
-                'BOUNDARY': [BOUNDARY],                     # int boundary 1 = random,      2 = reflecting
+    opt_params = {'NO_OF_PARTICLES': NO_OF_PARTICLES,       # Number of particles in swarm
+                'BOUNDARY': BOUNDARY,                       # int boundary 1 = random,      2 = reflecting
                                                             #              3 = absorbing,   4 = invisible
-                'WEIGHTS': [WEIGHTS],                       # Update vector weights
-                'VLIM':  [VLIM],                            # Initial velocity limit
-                'MR': [MR],                                 # Mixture Ratio (MR). Small value for tracing population %.
-                'SMP': [SMP],                               # Seeking memory pool. Num copies of cats made.
-                'SRD': [SRD],                               # Seeking range of the selected dimension. 
-                'CDC': [CDC],                               # Counts of dimension to change. mutation.
-                'SPC': [SPC]}                                # self-position consideration. boolean.
-
-    opt_df = pd.DataFrame(opt_params)
+                'WEIGHTS': WEIGHTS,                         # Update vector weights
+                'VLIM':  VLIM,                              # Initial velocity limit
+                'MR': MR,                                   # Mixture Ratio (MR). Small value for tracing population %.
+                'SMP': SMP,                                 # Seeking memory pool. Num copies of cats made.
+                'SRD': SRD,                                 # Seeking range of the selected dimension. 
+                'CDC': CDC,                                 # Counts of dimension to change. mutation.
+                'SPC': SPC}                                  # self-position consideration. boolean.
+
     mySwarm = swarm(LB, UB, TARGETS, TOL, MAXIT,
                             func_F, constr_F,
-                            opt_df,
+                            opt_params,
                             parent=parent, 
                             evaluate_threshold=evaluate_threshold, obj_threshold=THRESHOLD)       
 
@@ -9,18 +9,18 @@
 #       error messages directly from the 'swarm' class. Format updates are 
 #       for integration in the AntennaCAT GUI.
 #       This version builds from 'main_test_details.py' to include a 
-#       matplotlib plot of particle location
+#       matplotlib plot of particle location. The plot runs in a separate
+#       process (see live_plot.py)
 #
 #   Author(s): Lauren Linkous, Jonathan Lundquist
 #   Last update: March 13, 2025
 ##--------------------------------------------------------------------\
 
 
-import numpy as np
-import pandas as pd
 import time
-import matplotlib.pyplot as plt
+import numpy as np
 from cat_swarm import swarm
+from live_plot import live_plot
 
 # OBJECTIVE FUNCTION SELECTION
 #import one_dim_x_test.configs_F as func_configs     # single objective, 1D input
@@ -31,8 +31,6 @@ import himmelblau.configs_F as func_configs         # single objective, 2D input
 
 class TestGraph():
     def __init__(self):
-        self.ctr = 0
-
         # swarm variables
         NO_OF_PARTICLES = 8          # Number of particles in swarm
         WEIGHTS = 2                  # Update vector weights. Used as C1 constant in tracing mode.
@@ -82,41 +80,28 @@ class TestGraph():
 
 
         # Constant variables
-        opt_params = {'NO_OF_PARTICLES': [NO_OF_PARTICLES],     # Number of particles in swarm
-                    'BOUNDARY': [BOUNDARY],                     # int boundary 1 = random,      2 = reflecting
+        opt_params = {'NO_OF_PARTICLES': NO_OF_PARTICLES,       # Number of particles in swarm
+                    'BOUNDARY': BOUNDARY,                       # int boundary 1 = random,      2 = reflecting
                                                                 #              3 = absorbing,   4 = invisible
-                    'WEIGHTS': [WEIGHTS],                       # Update vector weights
-                    'VLIM':  [VLIM],                            # Initial velocity limit
-                    'MR': [MR],                                 # Mixture Ratio (MR). Small value for tracing population %.
-                    'SMP': [SMP],                               # Seeking memory pool. Num copies of cats made.
-                    'SRD': [SRD],                               # Seeking range of the selected dimension. 
-                    'CDC': [CDC],                               # Counts of dimension to change. mutation.
-                    'SPC': [SPC]}                                # self-position consideration. boolean.
-
-        opt_df = pd.DataFrame(opt_params)
+                    'WEIGHTS': WEIGHTS,                         # Update vector weights
+                    'VLIM':  VLIM,                              # Initial velocity limit
+                    'MR': MR,                                   # Mixture Ratio (MR). Small value for tracing population %.
+                    'SMP': SMP,                                 # Seeking memory pool. Num copies of cats made.
+                    'SRD': SRD,                                 # Seeking range of the selected dimension. 
+                    'CDC': CDC,                                 # Counts of dimension to change. mutation.
+                    'SPC': SPC}                                  # self-position consideration. boolean.
+
         self.mySwarm = swarm(LB, UB, TARGETS, TOL, MAXIT,
                                 func_F, constr_F,
-                                opt_df,
+                                opt_params,
                                 parent=parent)   
 
 
-        # Matplotlib setup
-        self.targets = TARGETS
-        self.fig = plt.figure(figsize=(10, 5))#(figsize=(14, 7))
-        # position
-        self.ax1 = self.fig.add_subplot(121, projection='3d')
-        self.ax1.set_title("Particle Location, Iteration: " + str(self.ctr))
-        self.ax1.set_xlabel('x_1')
-        self.ax1.set_ylabel('x_2')
-        self.ax1.set_zlabel('x_3')
-        self.scatter1 = None
-        # fitness
-        self.ax2 = self.fig.add_subplot(122, projection='3d')
-        self.ax2.set_title("Fitness Relation to Target")
-        self.ax2.set_xlabel('x_1')
-        self.ax2.set_ylabel('x_2')
-        self.ax2.set_zlabel('x_3')
-        self.scatter2 = None
+        # Realtime plot setup
+        # the plot is drawn in a separate process at a fixed frame rate.
+        # snapshots are dropped if the plot falls behind, so the optimizer
+        # is not slowed down by drawing
+        self.plot = live_plot(LB, UB, TARGETS, fps=10)
 
     def debug_message_printout(self, txt):
         if txt is None:
@@ -133,81 +118,6 @@ class TestGraph():
         pass
          
 
-    def update_plot(self, x_coords, y_coords, targets, showTarget=True, clearAx=True):
-        
-        # check if any points. first call might not have anythign set yet.
-        if len(x_coords) < 1:
-            return 
-
-
-        if clearAx == True:
-            self.ax1.clear() #use this to git rid of the 'ant tunnel' trails
-            self.ax2.clear()
-
-        # MOVEMENT PLOT
-        if np.shape(x_coords)[1]==1: # 1 dim function
-            x_plot_coords = np.array(x_coords[:,0])*0.0
-            self.ax1.set_title("Search Locations, Iteration: " + str(self.ctr))
-            self.ax1.set_xlabel("$x_1$")
-            self.ax1.set_ylabel("filler coords")
-            self.ax1.set_zlabel("filler coords")
-            self.scatter = self.ax1.scatter(x_coords, x_plot_coords, edgecolors='b')   
-        
-        elif np.shape(x_coords)[1] == 2: #2-dim func
-            self.ax1.set_title("Search Locations, Iteration: " + str(self.ctr))
-            self.ax1.set_xlabel("$x_1$")
-            self.ax1.set_ylabel("$x_2$")
-            self.ax1.set_zlabel("filler coords")
-            self.scatter = self.ax1.scatter(x_coords[:,0], x_coords[:,1], edgecolors='b')
-
-        elif np.shape(x_coords)[1] == 3: #3-dim func
-            self.ax1.set_title("Search Locations, Iteration: " + str(self.ctr))
-            self.ax1.set_xlabel("$x_1$")
-            self.ax1.set_ylabel("$x_2$")
-            self.ax1.set_zlabel("$x_3$")
-            self.scatter = self.ax1.scatter(x_coords[:,0], x_coords[:,1], x_coords[:,2], edgecolors='b')
-
-
-        # FITNESS PLOT
-        if np.shape(y_coords)[1] == 1: #1-dim obj func
-            y_plot_filler = np.array(y_coords[:,0])*0.0
-            self.ax2.set_title("Global Best Fitness Relation to Target")
-            self.ax2.set_xlabel("$F_{1}(x_1,x_2)$")
-            self.ax2.set_ylabel("filler coords")
-            self.ax2.set_zlabel("filler coords")
-            self.scatter = self.ax2.scatter(y_coords, y_plot_filler,  marker='o', s=40, facecolor="none", edgecolors="k")
-
-        elif np.shape(y_coords)[1] == 2: #2-dim obj func
-            self.ax2.set_title("Global Best Fitness Relation to Target")
-            self.ax2.set_xlabel("$F_{1}(x_1,x_2)$")
-            self.ax2.set_ylabel("$F_{2}(x_1,x_2)$")
-            self.ax2.set_zlabel("filler coords")
-            self.scatter = self.ax2.scatter(y_coords[:,0], y_coords[:,1], marker='o', s=40, facecolor="none", edgecolors="k")
-
-        elif np.shape(y_coords)[1] == 3: #3-dim obj fun
-            self.ax2.set_title("Global Best Fitness Relation to Target")
-            self.ax2.set_xlabel("$F_{1}(x_1,x_2)$")
-            self.ax2.set_ylabel("$F_{2}(x_1,x_2)$")
-            self.ax2.set_zlabel("$F_{3}(x_1,x_2)$")
-            self.scatter = self.ax2.scatter(y_coords[:,0], y_coords[:,1], y_coords[:,2], marker='o', s=40, facecolor="none", edgecolors="k")
-
-
-        if showTarget == True: # plot the target point
-            if len(targets) == 1:
-                self.scatter = self.ax2.scatter(targets[0], 0, marker='*', edgecolors='r')
-            if len(targets) == 2:
-                self.scatter = self.ax2.scatter(targets[0], targets[1], marker='*', edgecolors='r')
-            elif len(targets) == 3:
-                self.scatter = self.ax2.scatter(targets[0], targets[1], targets[2], marker='*', edgecolors='r')
-
-
-        plt.pause(0.0001)  # Pause to update the plot
-        if self.ctr == 0:
-            time.sleep(2)
-            
-        self.ctr = self.ctr + 1
-
-
     def run(self):
         # instantiation of particle swarm optimizer 
         while not self.mySwarm.complete():
@@ -229,15 +139,15 @@ class TestGraph():
                     print("Best Eval")
                     print(self.best_eval)
             m_coords = self.mySwarm.M  #get x,y,z coordinate locations
-            f_coords = self.mySwarm.F_Gb # global best of set
-            self.update_plot(m_coords, f_coords, self.targets, showTarget=True, clearAx=True) #update matplot
+            f_coords = np.reshape(self.mySwarm.F_Gb, (1, -1)) # global best of set, (1, OUT)
+            self.plot.push(iter, m_coords, f_coords) # send snapshot to the plot process
 
         print("Optimized Solution")
         print(self.mySwarm.get_optimized_soln())
         print("Optimized Outputs")
         print(self.mySwarm.get_optimized_outs())
 
-        time.sleep(15) #keep the window open for 15 seconds before ending program
+        self.plot.close(hold=15) #keep the window open for 15 seconds before ending program
 
 if __name__ == "__main__":
     pso = TestGraph()
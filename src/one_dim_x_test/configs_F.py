@@ -10,13 +10,10 @@
 ##-------------------------------------------------------------------------------\
 
 
-import sys
-
-try: # for outside func calls
-    sys.path.insert(0, './cat_swarm_python/src/')
-    from one_dim_x_test.func_F import func_F
-    from one_dim_x_test.constr_F import constr_F
-except: # for local
+try: # imported as part of the package (python -m cat_swarm, main_test.py, problem registry)
+    from .func_F import func_F
+    from .constr_F import constr_F
+except ImportError: # for local (running graph.py from this directory)
     from func_F import func_F
     from constr_F import constr_F
 
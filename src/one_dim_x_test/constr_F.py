@@ -6,9 +6,21 @@
 #   constraints function for function compatable with project optimizers
 #
 #   Author(s): Lauren Linkous (LINKOUSLC@vcu.edu)
-#   Last update: March 30, 2024
+#   Last update: October 19, 2026
 ##-------------------------------------------------------------------------------\
 
-def constr_F(x):
+import numpy as np
+
+def constr_F(X):
+    # X is a single point (D,) or a batch of points (n, D).
+    # a batch returns a (n,) bool array
+    X = np.asarray(X)
+    if X.ndim > 1:
+        return np.ones(len(X), dtype=bool)
+
     F = True
-    return F
\ No newline at end of file
+    return F
+
+# batch protocol. see cat_swarm.is_batch_function
+constr_F.is_batch = True
+constr_F.accepts_point = True # single (D,) points return a bool
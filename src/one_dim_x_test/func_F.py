@@ -6,22 +6,43 @@
 #   objective function for function compatable with project optimizers
 #
 #   Author(s): Lauren Linkous (LINKOUSLC@vcu.edu)
-#   Last update: May 28, 2024
+#   Last update: October 19, 2026
 ##-------------------------------------------------------------------------------\
 
 import numpy as np
-import time
+
+def one_dim(x):
+    return np.sin(5 * x**3) + np.cos(5 * x) * (1 - np.tanh(x ** 2))
 
 def func_F(X, NO_OF_OUTS=1):
+    # X is a single point (D,) or a batch of points (n, D).
+    # for a batch, F has the shape (n, NO_OF_OUTS) and noErrors is a (n,) bool array
+    X = np.asarray(X, dtype=float)
+    if X.ndim > 1:
+        return func_F_batch(X, NO_OF_OUTS)
+
     F = np.zeros((NO_OF_OUTS))
     noErrors = True
     try:
-        x = X[0]
-        F = np.sin(5 * x**3) + np.cos(5 * x) * (1 - np.tanh(x ** 2))
+        F[0] = one_dim(X[0])
     except Exception as e:
         print(e)
-        # print("X!")
-        # print(X)
         noErrors = False
 
-    return [F], noErrors
+    return F, noErrors
+
+def func_F_batch(X, NO_OF_OUTS=1):
+    F = np.zeros((len(X), NO_OF_OUTS))
+    noErrors = np.ones(len(X), dtype=bool)
+    try:
+        with np.errstate(all='ignore'): # flag bad points instead of failing the batch
+            F[:, 0] = one_dim(X[:, 0])
+        noErrors = np.all(np.isfinite(F), axis=1)
+    except Exception:
+        noErrors[:] = False
+
+    return F, noErrors
+
+# batch protocol. see cat_swarm.is_batch_function
+func_F.is_batch = True
+func_F.accepts_point = True # single (D,) points return the scalar form
@@ -10,33 +10,32 @@
 ##-------------------------------------------------------------------------------\
 
 
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
 import configs_F as f_c
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # src, for landscape.py
+from landscape import load_landscape
 # problem constraints - pulled from the function configs for the optimizers
 LOWER_BOUNDS = f_c.LB[0]
 UPPER_BOUNDS = f_c.UB[0]
 LB_x = LOWER_BOUNDS[0] 
 UB_x = UPPER_BOUNDS[0]
 FUNC_F = f_c.OBJECTIVE_FUNC
+FUNC_NAME = f_c.OBJECTIVE_FUNC_NAME
 GLOBAL_MIN = f_c.GLOBAL_MIN
 
 #write out plot
 plotname = "1D_test_plots.png"
 
-# Define range and step size
-X = np.vstack(np.linspace(LB_x, UB_x, 1000))
-# Reshape X to 1D array
-X_flat = X.flatten()
-
-# Evaluate function
-
-Y = []
-for c in X:
-    y, noErr = FUNC_F(c)
-    if noErr == True:
-        Y.append(y)
+# Evaluate function at 1000 points
+# evaluated in vectorized chunks, and cached to .landscape_cache/ for re-plotting
+land = load_landscape(FUNC_F, LOWER_BOUNDS, UPPER_BOUNDS, 1000, FUNC_NAME)
+valid = land['valid']
+X = land['axes'][0][valid]
+Y = land['F'][valid, 0]
 
 
 # Create figure and subplots
@@ -0,0 +1,89 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   cat_swarm_python
+#   './cat_swarm_python/src/problem_registry.py'
+#   Registry of objective function problems by name. A problem is a
+#       directory (package) with a configs_F.py, constr_F.py, and
+#       func_F.py, such as 'himmelblau'. Problems are found by scanning
+#       search directories, but are only imported when they are loaded.
+#
+#   Author(s): Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+
+import importlib
+import os
+import sys
+
+# directory with the bundled problems (himmelblau, lundquist_3_var, one_dim_x_test)
+BUNDLED_PROBLEM_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# additional search directories, separated by os.pathsep
+PROBLEM_PATH_ENV = 'CAT_SWARM_PROBLEM_PATH'
+
+# name -> (directory containing the problem package, configs module name)
+_problems = {}
+_searched_dirs = []
+
+
+def register_problem(name, configs_module, search_dir=None):
+    # register a problem by name without importing it.
+    # configs_module is the importable name of the problem configs,
+    # ex: 'my_problems.antenna.configs_F'. search_dir is added to sys.path
+    # when the problem is loaded, if the module is not already importable
+    _problems[name] = (search_dir, configs_module)
+
+
+def discover_problems(search_dirs=None):
+    # scan the bundled problem directory, the directories in
+    # CAT_SWARM_PROBLEM_PATH, and search_dirs for problem packages.
+    # a problem package is a directory that contains configs_F.py
+    dirs = [BUNDLED_PROBLEM_DIR]
+    env_dirs = os.environ.get(PROBLEM_PATH_ENV, '')
+    dirs = dirs + [d for d in env_dirs.split(os.pathsep) if d != '']
+    if search_dirs is not None:
+        dirs = dirs + list(search_dirs)
+
+    for d in dirs:
+        d = os.path.abspath(d)
+        if (d in _searched_dirs) or not os.path.isdir(d):
+            continue
+        _searched_dirs.append(d)
+        for name in sorted(os.listdir(d)):
+            if os.path.isfile(os.path.join(d, name, 'configs_F.py')) \
+               and not(name in _problems):
+                register_problem(name, name + '.configs_F', search_dir=d)
+
+    return list_problems()
+
+
+def list_problems():
+    return sorted(_problems.keys())
+
+
+def load_problem(name, search_dirs=None):
+    # import and return the configs_F module for a problem.
+    # names that are not registered are tried as a dotted package name
+    # ex: 'my_problems.antenna' -> 'my_problems.antenna.configs_F'
+    if not(name in _problems):
+        discover_problems(search_dirs)
+
+    if name in _problems:
+        search_dir, configs_module = _problems[name]
+    else:
+        search_dir, configs_module = None, name + '.configs_F'
+
+    if (search_dir is not None) and not(search_dir in sys.path):
+        sys.path.insert(0, search_dir)
+
+    try:
+        return importlib.import_module(configs_module)
+    except ModuleNotFoundError as e:
+        # only report an unknown problem if the problem itself is missing,
+        # not one of its imports
+        if (e.name is not None) and configs_module.startswith(e.name):
+            raise ValueError("unknown problem '" + str(name) + "'. Available problems: " + \
+                             ", ".join(list_problems())) from e
+        raise
@@ -0,0 +1,186 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   cat_swarm_python
+#   './cat_swarm_python/src/progress.py'
+#   Progress monitor for the 'swarm' class in cat_swarm.py.
+#       Calls a callback every k evaluations and/or t seconds with a
+#       progress_stats: throughput, share of the time spent in the
+#       objective function, best evaluation, improvement rate, and ETA.
+#       Nothing is timed or checked unless a monitor is used.
+#
+#   Author(s): Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+
+import sys
+import time
+
+import numpy as np
+
+
+class progress_stats:
+    # passed to the progress_monitor callback
+    # elapsed: seconds since the monitor was attached. iterations: swarm.iter
+    # evaluations: objective function evaluations since the monitor was attached
+    # evals_per_s: evaluations per second since the last report
+    # objective_time: seconds spent in the objective function since the monitor
+    #   was attached. objective_share: objective_time/elapsed. Only calls the
+    #   swarm makes itself are timed (not ask/tell evaluations made elsewhere)
+    # best_eval: L2 norm of F_Gb
+    # improvement_rate: decrease in best_eval per evaluation since the last report
+    # eta: estimated seconds until maxit (or the evaluation limit, if it comes
+    #   first). None until there is a rate to estimate from
+    __slots__ = ('elapsed', 'iterations', 'evaluations', 'evals_per_s', 'objective_time',
+                 'objective_share', 'best_eval', 'improvement_rate', 'eta')
+
+    def __init__(self, **values):
+        for key in self.__slots__:
+            setattr(self, key, values[key])
+
+    def __repr__(self):
+        return "progress_stats(" + ", ".join(key + "=" + repr(getattr(self, key))
+                                             for key in self.__slots__) + ")"
+
+
+class progress_monitor:
+    # progress_monitor(callback, every_evals=None, every_s=1.0)
+    # callback(swarm, stats) is called when every_evals evaluations or every_s
+    #   seconds have passed since the last report (whichever comes first).
+    #   swarm.optimize() stops if it returns True
+    # max_evals: optional evaluation budget for the ETA, counted from when the
+    #   monitor is attached. optimize(max_evals=...) sets eval_limit for that call
+    #
+    # Call update(swarm) once per step in a driver loop, or pass the monitor to
+    # swarm.optimize(progress=monitor). The monitor is attached to the swarm on
+    # the first update. Attaching wraps the swarm's objective function calls
+    # with a timer. detach(swarm) removes the timer. optimize() and
+    # eval_service.run_swarm() detach the monitor when they return
+    OBJECTIVE_CALLS = ('obj_func', 'obj_func_batch', 'obj_func_context', 'obj_func_delta')
+
+    def __init__(self, callback, every_evals=None, every_s=1.0, max_evals=None):
+        if (every_evals is None) and (every_s is None):
+            raise ValueError("every_evals or every_s must be given")
+        self.callback = callback
+        self.every_evals = None if every_evals is None else max(int(every_evals), 1)
+        self.every_s = None if every_s is None else float(every_s)
+        self.max_evals = max_evals
+        self.swarm = None
+        self.objective_time = 0.0
+        self.wrapped = {}
+        self.reports = 0
+
+    def attach(self, swarm):
+        if self.swarm is swarm:
+            return
+        if self.swarm is not None:
+            self.detach(self.swarm)
+        self.swarm = swarm
+        for name in self.OBJECTIVE_CALLS:
+            func = getattr(swarm, name, None)
+            if func is not None:
+                self.wrapped[name] = func
+                setattr(swarm, name, self.timed(func))
+
+        self.start = time.perf_counter()
+        self.start_evals = swarm.evaluations
+        # swarm.evaluations at the end of the budget
+        self.eval_limit = None if self.max_evals is None else swarm.evaluations + int(self.max_evals)
+        self.objective_time = 0.0
+        self.last_time = self.start
+        self.last_evals = swarm.evaluations
+        self.last_iter = swarm.iter
+        self.last_best = float(swarm.F_Gb_norm)
+        self.next_evals = None if self.every_evals is None else swarm.evaluations + self.every_evals
+        self.next_time = None if self.every_s is None else self.start + self.every_s
+
+    def detach(self, swarm):
+        for name, func in self.wrapped.items():
+            setattr(swarm, name, func)
+        self.wrapped = {}
+        if self.swarm is swarm:
+            self.swarm = None
+
+    def timed(self, func):
+        def timed_func(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.objective_time = self.objective_time + (time.perf_counter() - start)
+        return timed_func
+
+    def update(self, swarm, force=False):
+        # report if it is time to. Returns the callback's return value (None if
+        # there was no report)
+        if self.swarm is not swarm:
+            self.attach(swarm)
+            return None
+        if not force:
+            due = (self.next_evals is not None) and (swarm.evaluations >= self.next_evals)
+            if not due:
+                if self.next_time is None:
+                    return None
+                if time.perf_counter() < self.next_time:
+                    return None
+        return self.report(swarm)
+
+    def report(self, swarm):
+        now = time.perf_counter()
+        stats = self.stats(swarm, now)
+        self.last_time = now
+        self.last_evals = swarm.evaluations
+        self.last_iter = swarm.iter
+        self.last_best = stats.best_eval
+        if self.every_evals is not None:
+            self.next_evals = swarm.evaluations + self.every_evals
+        if self.every_s is not None:
+            self.next_time = now + self.every_s
+        self.reports = self.reports + 1
+        return self.callback(swarm, stats)
+
+    def stats(self, swarm, now=None):
+        if now is None:
+            now = time.perf_counter()
+        elapsed = now - self.start
+        window = now - self.last_time
+        window_evals = swarm.evaluations - self.last_evals
+        window_iter = swarm.iter - self.last_iter
+        evals_per_s = window_evals/window if window > 0 else 0.0
+
+        best_eval = float(swarm.F_Gb_norm)
+        improvement_rate = 0.0
+        # no improvement is counted from the unset best (sys.maxsize outputs)
+        if (window_evals > 0) and (self.last_best < sys.maxsize):
+            improvement_rate = (self.last_best - best_eval)/window_evals
+
+        # time left at the current rates. maxit counts swarm.iter
+        eta = None
+        if (window > 0) and (window_iter > 0):
+            eta = max(swarm.maxit - swarm.iter, 0)*window/window_iter
+        if (self.eval_limit is not None) and (window_evals > 0):
+            evals_left = max(self.eval_limit - swarm.evaluations, 0)
+            eta_evals = evals_left*window/window_evals
+            eta = eta_evals if eta is None else min(eta, eta_evals)
+
+        return progress_stats(elapsed=elapsed,
+                              iterations=swarm.iter,
+                              evaluations=swarm.evaluations - self.start_evals,
+                              evals_per_s=evals_per_s,
+                              objective_time=self.objective_time,
+                              objective_share=self.objective_time/elapsed if elapsed > 0 else 0.0,
+                              best_eval=best_eval,
+                              improvement_rate=improvement_rate,
+                              eta=eta)
+
+
+def print_progress(swarm, stats):
+    # a callback for progress_monitor that prints one line per report
+    eta = '-' if stats.eta is None else str(round(stats.eta, 1)) + ' s'
+    print("iter " + str(stats.iterations) +
+          "  evals " + str(stats.evaluations) +
+          "  " + str(round(stats.evals_per_s, 1)) + " evals/s" +
+          "  objective " + str(round(100*stats.objective_share, 1)) + "%" +
+          "  best " + str(np.round(stats.best_eval, 8)) +
+          "  ETA " + eta)
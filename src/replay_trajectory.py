@@ -0,0 +1,147 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   cat_swarm_python
+#   './cat_swarm_python/src/replay_trajectory.py'
+#   Offline statistics and replay for trajectories recorded with
+#       trajectory.trajectory_recorder.
+#
+#   Usage (from the src directory):
+#       python replay_trajectory.py run.traj --stats
+#       python replay_trajectory.py run.traj --stats --csv run_stats.csv
+#       python replay_trajectory.py run.traj --animate --fps 20
+#       python replay_trajectory.py run.traj --animate --save run.gif
+#
+#   Author(s): Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+
+import argparse
+import csv
+import sys
+
+import numpy as np
+
+from trajectory import load_trajectory, trajectory_statistics
+
+STAT_FIELDS = ['generation', 'iter', 'best_eval', 'active', 'seeking', 'tracing', 'abs_mean_deviation']
+
+
+def print_statistics(stats, every=1):
+    print("  ".join(f.rjust(12) for f in STAT_FIELDS))
+    for i in range(0, len(stats['generation']), max(int(every), 1)):
+        print("  ".join(str(np.round(stats[f][i], 8)).rjust(12) for f in STAT_FIELDS))
+
+
+def write_statistics(stats, filename):
+    with open(filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(STAT_FIELDS)
+        for i in range(len(stats['generation'])):
+            writer.writerow([stats[f][i] for f in STAT_FIELDS])
+
+
+def animate(records, fps=10, save=None, every=1):
+    # replay the recorded positions. the first 2 (or 3) input variables are drawn.
+    # every: draw every n-th generation
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+
+    M = records['M']
+    num_dims = M.shape[2]
+    low = np.min(M, axis=(0, 1))
+    high = np.max(M, axis=(0, 1))
+    pad = 0.05*np.maximum(high - low, 1e-12)
+    low = low - pad
+    high = high + pad
+    best = np.linalg.norm(records['F_Gb'], axis=1)
+
+    fig = plt.figure(figsize=(10, 5))
+    if num_dims >= 3:
+        ax1 = fig.add_subplot(121, projection='3d')
+        ax1.set_zlim(low[2], high[2])
+        ax1.set_zlabel("$x_3$")
+    else:
+        ax1 = fig.add_subplot(121)
+    ax1.set_xlim(low[0], high[0])
+    ax1.set_xlabel("$x_1$")
+    if num_dims >= 2:
+        ax1.set_ylim(low[1], high[1])
+        ax1.set_ylabel("$x_2$")
+    else:
+        ax1.set_ylim(-1, 1)
+        ax1.set_ylabel("filler coords")
+
+    ax2 = fig.add_subplot(122)
+    ax2.set_title("Global Best Fitness")
+    ax2.set_xlabel("Position evaluations (iter)")
+    ax2.set_ylabel("$|F_{Gb}|$")
+    ax2.plot(records['iter'], best, color='0.8')
+    best_artist, = ax2.plot([], [], color='k')
+
+    def frame_positions(i):
+        P = np.zeros((M.shape[1], 3))
+        P[:, :min(num_dims, 3)] = M[i][:, :3]
+        return P
+
+    # seeking cats (1) in blue, tracing cats (0) in orange
+    colors = np.array(['tab:orange', 'tab:blue'])
+    P = frame_positions(0)
+    if num_dims >= 3:
+        positions_artist = ax1.scatter(P[:, 0], P[:, 1], P[:, 2])
+    else:
+        positions_artist = ax1.scatter(P[:, 0], P[:, 1])
+
+    def update(i):
+        P = frame_positions(i)
+        if num_dims >= 3:
+            positions_artist._offsets3d = (P[:, 0], P[:, 1], P[:, 2])
+        else:
+            positions_artist.set_offsets(P[:, :2])
+        positions_artist.set_color(colors[np.clip(records['cat_mode'][i], 0, 1)])
+        ax1.set_title("Search Locations, Generation: " + str(records['generation'][i]))
+        best_artist.set_data(records['iter'][:i + 1], best[:i + 1])
+        return positions_artist, best_artist
+
+    plt.tight_layout()
+    frames = range(0, len(records), max(int(every), 1))
+    anim = FuncAnimation(fig, update, frames=frames, interval=1000.0/fps, blit=False)
+    if save is not None:
+        anim.save(save, fps=fps)
+        plt.close(fig)
+    else:
+        plt.show()
+    return anim
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Statistics and replay for recorded swarm trajectories')
+    parser.add_argument('filename', help='trajectory file written by trajectory_recorder')
+    parser.add_argument('--stats', action='store_true', help='print per generation statistics')
+    parser.add_argument('--every', type=int, default=1, help='print (or replay) every n-th generation')
+    parser.add_argument('--csv', default=None, help='write the statistics to a csv file')
+    parser.add_argument('--animate', action='store_true', help='replay the cat positions')
+    parser.add_argument('--fps', type=float, default=10, help='replay frames per second')
+    parser.add_argument('--save', default=None, help='save the replay (ex: run.gif, run.mp4) instead of showing it')
+    args = parser.parse_args(argv)
+
+    records = load_trajectory(args.filename)
+    if len(records) < 1:
+        print("no complete records in " + args.filename)
+        return 1
+
+    if args.stats or (args.csv is not None) or not args.animate:
+        stats = trajectory_statistics(records)
+        if args.stats or (args.csv is None and not args.animate):
+            print_statistics(stats, args.every)
+        if args.csv is not None:
+            write_statistics(stats, args.csv)
+
+    if args.animate:
+        animate(records, args.fps, args.save, args.every)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   cat_swarm_python
+#   './cat_swarm_python/src/trajectory.py'
+#   Trajectory recorder for the 'swarm' class in cat_swarm.py.
+#       Appends M, cat_mode, Active, and F_Gb once per generation to a
+#       growable memory-mapped file, so long runs can be inspected or
+#       replayed offline (see replay_trajectory.py) without slowing them.
+#
+#       Files:
+#           <filename>        : fixed-size binary records (numpy memmap)
+#           <filename>.json   : record layout and number of records
+#
+#   Author(s): Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+
+import json
+import os
+
+import numpy as np
+
+
+def trajectory_dtype(num_particles, num_dims, num_outs):
+    # one record per generation
+    return np.dtype([('written', np.uint8),       # 1 once the record has been filled in
+                     ('generation', np.int64),
+                     ('iter', np.int64),          # position evaluations at the record (swarm.iter)
+                     ('M', np.float64, (num_particles, num_dims)),
+                     ('cat_mode', np.int8, (num_particles,)),
+                     ('Active', np.int8, (num_particles,)),
+                     ('F_Gb', np.float64, (num_outs,))])
+
+
+class trajectory_recorder:
+    # trajectory_recorder(filename, num_particles, num_dims, num_outs)
+    # or trajectory_recorder.for_swarm(filename, mySwarm)
+    #
+    # initial_capacity: number of records allocated up front. The file doubles
+    #   in size when it is full.
+    def __init__(self, filename, num_particles, num_dims, num_outs, initial_capacity=1024):
+        self.filename = filename
+        self.header_filename = filename + '.json'
+        self.shape = (int(num_particles), int(num_dims), int(num_outs))
+        self.dtype = trajectory_dtype(*self.shape)
+        self.capacity = max(int(initial_capacity), 1)
+        self.count = 0
+        self.last_generation = -1
+
+        self.records = np.memmap(self.filename, dtype=self.dtype, mode='w+', shape=(self.capacity,))
+        self.write_header()
+
+    @classmethod
+    def for_swarm(cls, filename, swarm, initial_capacity=1024):
+        num_particles, num_dims = np.shape(swarm.M)
+        return cls(filename, num_particles, num_dims, swarm.output_size, initial_capacity)
+
+    def write_header(self):
+        header = {'num_particles': self.shape[0],
+                  'num_dims': self.shape[1],
+                  'num_outs': self.shape[2],
+                  'count': self.count,
+                  'capacity': self.capacity}
+        with open(self.header_filename, 'w') as f:
+            json.dump(header, f)
+
+    def grow(self):
+        # double the file and re-map it
+        self.records.flush()
+        del self.records
+        self.capacity = self.capacity*2
+        with open(self.filename, 'r+b') as f:
+            f.truncate(self.capacity*self.dtype.itemsize)
+        self.records = np.memmap(self.filename, dtype=self.dtype, mode='r+', shape=(self.capacity,))
+        self.write_header()
+
+    def record(self, swarm, force=False):
+        # append the swarm state. Only the first call in each generation is
+        # written, unless force=True. Returns True if a record was written
+        if (swarm.generation == self.last_generation) and not force:
+            return False
+        if self.count >= self.capacity:
+            self.grow()
+
+        i = self.count
+        rec = self.records
+        rec['generation'][i] = swarm.generation
+        rec['iter'][i] = swarm.iter
+        rec['M'][i] = swarm.M
+        # cat_mode can hold one extra entry for swarms of more than one cat
+        rec['cat_mode'][i] = np.reshape(swarm.cat_mode, -1)[:self.shape[0]]
+        rec['Active'][i] = swarm.Active
+        rec['F_Gb'][i] = np.reshape(swarm.F_Gb, -1)
+        rec['written'][i] = 1
+
+        self.count = self.count + 1
+        self.last_generation = swarm.generation
+        return True
+
+    def flush(self):
+        self.records.flush()
+        self.write_header()
+
+    def close(self):
+        self.flush()
+        del self.records
+
+
+def load_trajectory(filename):
+    # open a recorded trajectory read-only. Returns a structured memmap with
+    # one record per generation (fields: generation, iter, M, cat_mode, Active, F_Gb).
+    # Records after the last flush of an interrupted run are included if they
+    # were completely written
+    with open(filename + '.json', 'r') as f:
+        header = json.load(f)
+    dtype = trajectory_dtype(header['num_particles'], header['num_dims'], header['num_outs'])
+    num_records = os.path.getsize(filename)//dtype.itemsize
+    records = np.memmap(filename, dtype=dtype, mode='r', shape=(num_records,))
+
+    written = records['written'] == 1
+    count = num_records if np.all(written) else int(np.argmin(written))
+    return records[:count]
+
+
+def trajectory_statistics(records):
+    # per generation statistics for a loaded trajectory. Returns a dict of arrays
+    M = records['M']
+    mean_position = np.mean(M, axis=1, keepdims=True)
+    return {'generation': np.array(records['generation']),
+            'iter': np.array(records['iter']),
+            'best_eval': np.linalg.norm(records['F_Gb'], axis=1),
+            'active': np.sum(records['Active'], axis=1),
+            'seeking': np.sum(records['cat_mode'] == 1, axis=1),
+            'tracing': np.sum(records['cat_mode'] == 0, axis=1),
+            # same measure as swarm.absolute_mean_deviation_of_particles()
+            'abs_mean_deviation': np.linalg.norm(np.mean(np.abs(M - mean_position), axis=1), axis=1)}